@@ -0,0 +1,181 @@
+"""
+자산 배분 계산 모듈.
+
+투자 성향(0~100)과 선택한 자산군으로부터 포트폴리오 비율, 채권 유형별 가중치,
+ETF 성향(안정형/성장형)별 가중치를 NumPy 벡터 연산으로 계산합니다.
+투자 성향은 스칼라뿐 아니라 배열로도 받을 수 있어, 슬라이더의 모든 값이나
+여러 사용자 프로필의 배분을 한 번의 호출로 구할 수 있습니다.
+
+슬라이더가 가질 수 있는 모든 투자 성향(0~100)과 자산 선택 조합에 대한 결과는
+모듈을 불러올 때 표(ALLOCATION_TABLES)로 한 번만 계산해 두고, allocate /
+bond_type_split / etf_item_split은 이 표에서 바로 값을 찾습니다.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# 자산군 순서 (모든 배열의 마지막 축이 이 순서를 따름)
+ASSET_CLASSES = ["금", "채권", "CMA/파킹통장 (현금)", "적금", "ETF", "주식", "원자재"]
+# 투자 성향 50 기준의 기본 비중 (%)
+BASE_ALLOCATIONS = np.array([10, 30, 15, 15, 20, 5, 5], dtype=float)
+# 투자 성향에 따른 조정 방향: 안정 자산은 -1, 위험 자산은 +1, 금은 0
+RISK_DIRECTIONS = np.array([0, -1, -1, -1, 1, 1, 1], dtype=float)
+# 투자 성향 1단위당 비중 조정 폭 (%p)
+RISK_SENSITIVITY = 0.4
+
+BOND_TYPES = ["단기채 (안정적, 낮은 수익률)", "중장기채 (중간 위험, 중간 수익률)", "장기채 (공격적, 높은 변동성)"]
+BOND_RISK_DIRECTIONS = np.array([-1, 0, 1], dtype=float)
+BOND_SENSITIVITY = 0.04
+
+ETF_STYLES = ["안정형", "성장형"]
+ETF_RISK_DIRECTIONS = np.array([-1, 1], dtype=float)
+ETF_SENSITIVITY = 0.05
+
+# 채권 유형/ETF 성향 가중치의 최솟값
+MIN_SUB_WEIGHT = 0.1
+
+# 미리 계산하는 표의 범위 (슬라이더 값, 성향별 ETF 최대 선택 개수)
+RISK_LEVELS = np.arange(101)
+MAX_ETF_ITEMS = 5
+
+AllocationTables = namedtuple("AllocationTables", ["assets", "bond_types", "etf_items"])
+
+
+def _risk_column(risk_tolerance):
+    """스칼라 또는 (n,) 배열의 투자 성향을 마지막 축 브로드캐스팅이 가능한 형태로 변환"""
+    return np.asarray(risk_tolerance, dtype=float)[..., None]
+
+
+def asset_mask(selected_assets):
+    """
+    선택한 자산군 목록을 ASSET_CLASSES 순서의 bool 마스크로 변환.
+    목록의 목록(여러 프로필)을 넘기면 (프로필 수, 7) 형태의 마스크를 반환합니다.
+    """
+    if selected_assets and not isinstance(selected_assets[0], str):
+        return np.array([asset_mask(assets) for assets in selected_assets], dtype=bool).reshape(-1, len(ASSET_CLASSES))
+    selected = set(selected_assets)
+    return np.array([asset in selected for asset in ASSET_CLASSES], dtype=bool)
+
+
+def compute_allocations(risk_tolerance, selected):
+    """
+    투자 성향과 자산 선택 마스크로부터 자산군별 비율(%)을 계산.
+
+    risk_tolerance: 스칼라 또는 (n,) 배열
+    selected: (7,) 또는 (n, 7) bool 마스크 (asset_mask 참고)
+    반환값: (..., 7) 배열. 선택하지 않은 자산과 음수가 된 자산은 0이며,
+    나머지는 합계가 100이 되도록 정규화됩니다 (모두 0이면 전부 0).
+    """
+    raw = BASE_ALLOCATIONS + (_risk_column(risk_tolerance) - 50) * RISK_SENSITIVITY * RISK_DIRECTIONS
+    raw = np.where(selected, np.clip(raw, 0, None), 0.0)
+    total = raw.sum(axis=-1, keepdims=True)
+    safe_total = np.where(total > 0, total, 1.0)
+    return np.where(total > 0, raw / safe_total * 100, 0.0)
+
+
+def _sub_weights(risk_tolerance, directions, sensitivity):
+    """투자 성향에 따라 한쪽은 늘리고 반대쪽은 줄이는 하위 가중치 (최솟값 MIN_SUB_WEIGHT)"""
+    weights = 1 + (_risk_column(risk_tolerance) - 50) * sensitivity * directions
+    return np.maximum(MIN_SUB_WEIGHT, weights)
+
+
+def bond_type_weights(risk_tolerance):
+    """BOND_TYPES 순서의 (단기, 중장기, 장기) 가중치. 반환 형태는 (..., 3)"""
+    return _sub_weights(risk_tolerance, BOND_RISK_DIRECTIONS, BOND_SENSITIVITY)
+
+
+def etf_style_weights(risk_tolerance):
+    """ETF_STYLES 순서의 (안정형, 성장형) 가중치. 반환 형태는 (..., 2)"""
+    return _sub_weights(risk_tolerance, ETF_RISK_DIRECTIONS, ETF_SENSITIVITY)
+
+
+def _normalize(weights):
+    total = weights.sum(axis=-1, keepdims=True)
+    return np.where(total > 0, weights / np.where(total > 0, total, 1.0), 0.0)
+
+
+def _subset_masks(size):
+    """0 ~ 2^size-1 비트마스크를 (2^size, size) bool 배열로 변환 (i번째 비트 = i번째 항목 선택)"""
+    return ((np.arange(2 ** size)[:, None] >> np.arange(size)) & 1).astype(bool)
+
+
+def subset_index(mask):
+    """bool 마스크를 _subset_masks의 행 번호(비트마스크 정수)로 변환"""
+    return int(np.dot(np.asarray(mask, dtype=int), 1 << np.arange(len(mask))))
+
+
+def build_allocation_tables():
+    """
+    모든 투자 성향(0~100)에 대한 배분 결과를 미리 계산한 표를 생성.
+
+    - assets: (101, 128, 7) 자산 선택 조합(비트마스크)별 자산군 비율(%)
+    - bond_types: (101, 8, 3) 채권 유형 선택 조합별 유형 비중 (0~1)
+    - etf_items: (101, 6, 6, 6, 3) 안정형/성장형/기타 ETF 선택 개수별 (안정형, 성장형, 기타) ETF 1개당 비중
+    """
+    risk = RISK_LEVELS[:, None]
+    assets = compute_allocations(risk, _subset_masks(len(ASSET_CLASSES)))
+
+    bond_masks = _subset_masks(len(BOND_TYPES))
+    bond_types = _normalize(np.where(bond_masks, bond_type_weights(risk), 0.0))
+
+    counts = np.arange(MAX_ETF_ITEMS + 1)
+    stable, growth, other = np.meshgrid(counts, counts, counts, indexing="ij")
+    style_weights = etf_style_weights(RISK_LEVELS)  # (101, 2)
+    item_weights = np.concatenate([style_weights, np.ones((len(RISK_LEVELS), 1))], axis=1)  # (101, 3)
+    total = (stable * item_weights[:, 0, None, None, None]
+             + growth * item_weights[:, 1, None, None, None]
+             + other * item_weights[:, 2, None, None, None])
+    safe_total = np.where(total > 0, total, 1.0)[..., None]
+    etf_items = np.where(total[..., None] > 0, item_weights[:, None, None, None, :] / safe_total, 0.0)
+
+    return AllocationTables(assets, bond_types, etf_items)
+
+
+# 모듈을 불러올 때 한 번만 계산 (약 1.3MB)
+ALLOCATION_TABLES = build_allocation_tables()
+
+
+def _table_risk(risk_tolerance):
+    """표에서 바로 찾을 수 있는 투자 성향(0~100의 정수)이면 정수로, 아니면 None을 반환"""
+    if np.ndim(risk_tolerance) == 0 and float(risk_tolerance).is_integer() and 0 <= risk_tolerance <= 100:
+        return int(risk_tolerance)
+    return None
+
+
+def allocate(risk_tolerance, selected_assets):
+    """한 사용자의 포트폴리오 비율을 {자산군: 비율(%)} dict로 반환 (선택하지 않은 자산군은 0)"""
+    mask = asset_mask(selected_assets)
+    risk = _table_risk(risk_tolerance)
+    if risk is not None:
+        percentages = ALLOCATION_TABLES.assets[risk, subset_index(mask)]
+    else:
+        percentages = compute_allocations(risk_tolerance, mask)
+    return dict(zip(ASSET_CLASSES, percentages.reshape(-1).tolist()))
+
+
+def bond_type_split(risk_tolerance, selected_bond_types):
+    """선택한 채권 유형별 투자 비중을 {채권 유형: 비중(0~1)} dict로 반환 (BOND_TYPES 순서)"""
+    mask = np.array([bond_type in selected_bond_types for bond_type in BOND_TYPES])
+    risk = _table_risk(risk_tolerance)
+    if risk is not None:
+        fractions = ALLOCATION_TABLES.bond_types[risk, subset_index(mask)]
+    else:
+        fractions = _normalize(np.where(mask, bond_type_weights(risk_tolerance).reshape(-1), 0.0))
+    return {bond_type: float(fraction) for bond_type, fraction, chosen in zip(BOND_TYPES, fractions, mask) if chosen}
+
+
+def etf_item_split(risk_tolerance, etf_styles):
+    """
+    선택한 ETF별 투자 비중을 {ETF 이름: 비중(0~1)} dict로 반환.
+    etf_styles는 {ETF 이름: '안정형'/'성장형'} 형태이며, 그 외 성향은 가중치 1로 계산합니다.
+    """
+    style_index = [ETF_STYLES.index(style) if style in ETF_STYLES else len(ETF_STYLES) for style in etf_styles.values()]
+    counts = np.bincount(style_index, minlength=len(ETF_STYLES) + 1)
+    risk = _table_risk(risk_tolerance)
+    if risk is not None and counts.max() <= MAX_ETF_ITEMS:
+        per_item = ALLOCATION_TABLES.etf_items[(risk, *counts)]
+        return {name: float(per_item[index]) for name, index in zip(etf_styles, style_index)}
+
+    style_weights = dict(zip(ETF_STYLES, etf_style_weights(risk_tolerance).reshape(-1)))
+    weights = np.array([style_weights.get(style, 1.0) for style in etf_styles.values()], dtype=float)
+    return dict(zip(etf_styles, _normalize(weights).tolist()))
@@ -0,0 +1,200 @@
+"""
+롤링 분석 모듈.
+
+차트 페이지의 가격 행렬(날짜 × 티커)로부터 N일 롤링 수익률, 연환산 롤링 변동성,
+티커 간 수익률 상관계수 행렬, 낙폭(최대 낙폭)을 계산합니다.
+모든 계산은 티커 축을 한 번에 처리하는 NumPy 배열 연산이며, 롤링 변동성은
+누적합(cumsum)의 차이로 구간 합을 구하므로 창 크기와 관계없이 O(날짜 수 × 티커 수)입니다.
+
+가격 행렬에서 티커가 거래하지 않은 날(한 시장만 휴장한 날)은 NaN으로 두어야 합니다. 직전 종가로 채운
+값을 넘기면 휴장일마다 0% 수익률이 생겨 변동성과 상관계수가 왜곡되므로, 일별 수익률은 실제로 거래한
+날에만 직전 거래일 종가 대비로 계산하고, 롤링 수익률과 낙폭은 직전 종가로 채운 가격으로 계산합니다.
+
+결과는 (가격 데이터 버전, 창 크기)별로 캐싱되어, 창 크기 슬라이더를 이전 값으로 되돌리거나
+다른 설정만 바꿔 다시 실행될 때는 계산을 반복하지 않습니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+TRADING_DAYS_PER_YEAR = 252
+# 캐싱할 최대 분석 결과 수 (가격 데이터 × 창 크기 조합)
+DEFAULT_MAX_RESULTS = 32
+
+RollingAnalytics = namedtuple(
+    "RollingAnalytics", ["returns", "volatility", "correlation", "drawdown", "max_drawdown"]
+)
+
+
+def forward_fill(prices):
+    """(날짜 수, 티커 수) 가격 배열의 NaN을 열마다 직전 값으로 채움 (첫 값 이전은 NaN으로 남김)"""
+    prices = np.asarray(prices, dtype=float)
+    last_valid_row = np.where(np.isnan(prices), -1, np.arange(len(prices))[:, None])
+    np.maximum.accumulate(last_valid_row, axis=0, out=last_valid_row)
+    filled = prices[np.maximum(last_valid_row, 0), np.arange(prices.shape[1])]
+    filled[last_valid_row < 0] = np.nan
+    return filled
+
+
+def rolling_returns(prices, window):
+    """
+    (날짜 수, 티커 수) 가격 배열의 window일 수익률 (거래하지 않은 날은 직전 종가 기준).
+    앞쪽 window개 행과 첫 가격 이전 구간은 NaN
+    """
+    prices = forward_fill(prices)
+    result = np.full_like(prices, np.nan)
+    if window < len(prices):
+        result[window:] = prices[window:] / prices[:-window] - 1
+    return result
+
+
+def log_returns(prices):
+    """
+    일별 로그 수익률. 가격이 있는 날에만 직전 거래일 종가 대비로 계산하며,
+    거래하지 않은 날(NaN)과 첫 가격까지는 NaN입니다.
+    """
+    prices = np.asarray(prices, dtype=float)
+    result = np.full_like(prices, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[1:] = np.log(prices[1:] / forward_fill(prices)[:-1])
+    return result
+
+
+def rolling_volatility(prices, window, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """
+    window일 로그 수익률의 연환산 표준편차.
+    구간 합은 누적합의 차이로 구하고, 거래하지 않은 날의 수익률은 제외합니다.
+    구간이 첫 수익률 이전(상장 전 등)에 걸치거나 구간 안의 수익률이 2개 미만이면 NaN입니다.
+    """
+    returns = log_returns(prices)
+    valid = np.isfinite(returns)
+    values = np.where(valid, returns, 0.0)
+
+    def window_sum(array):
+        cumulative = np.cumsum(np.vstack([np.zeros((1, array.shape[1])), array]), axis=0)
+        return cumulative[window:] - cumulative[:-window]
+
+    result = np.full_like(returns, np.nan)
+    if window < 2 or window > len(returns):
+        return result
+    count = window_sum(valid.astype(float))
+    total = window_sum(values)
+    total_sq = window_sum(values ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (total_sq - total ** 2 / count) / (count - 1)
+    first = np.where(valid.any(axis=0), np.argmax(valid, axis=0), len(returns))
+    window_start = np.arange(len(count))[:, None]
+    full = (window_start >= first) & (count >= 2)
+    result[window - 1:] = np.where(full, np.sqrt(np.clip(variance, 0, None) * periods_per_year), np.nan)
+    return result
+
+
+def correlation_matrix(prices, min_periods=20):
+    """
+    티커 간 일별 수익률 상관계수 행렬.
+    티커 쌍마다 두 티커 모두 수익률이 있는 날만 사용하며, 그런 날이 min_periods일 미만이면 NaN입니다.
+    """
+    returns = log_returns(prices)[1:]
+    valid = np.isfinite(returns).astype(float)
+    values = np.where(valid > 0, returns, 0.0)
+
+    # 쌍별 공통 관측치에 대한 합계를 행렬곱으로 한 번에 계산
+    count = valid.T @ valid
+    sum_x = values.T @ valid  # [i, j] = j도 관측된 날의 i 수익률 합
+    sum_xx = (values ** 2).T @ valid
+    sum_xy = values.T @ values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = sum_xy - sum_x * sum_x.T / count
+        variance_x = sum_xx - sum_x ** 2 / count
+        correlation = covariance / np.sqrt(variance_x * variance_x.T)
+    correlation[count < min_periods] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def drawdowns(prices):
+    """각 시점의 직전 최고가 대비 하락률 (0 이하). 가격이 없는 구간은 NaN"""
+    prices = np.asarray(prices, dtype=float)
+    running_max = np.fmax.accumulate(prices, axis=0)  # NaN은 건너뛰고 최고가를 유지
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices / running_max - 1
+
+
+def max_drawdowns(prices):
+    """티커별 최대 낙폭 (가격이 없는 티커는 NaN)"""
+    result = drawdowns(prices)
+    valid = np.isfinite(result).any(axis=0)
+    return np.where(valid, np.nanmin(np.where(np.isfinite(result), result, np.inf), axis=0), np.nan)
+
+
+def compute_rolling_analytics(prices, window):
+    """
+    가격 DataFrame(날짜 × 티커, 거래하지 않은 날은 NaN)으로부터 RollingAnalytics를 계산
+    (각 항목은 DataFrame 또는 Series)
+    """
+    values = prices.to_numpy(dtype=float)
+    filled = forward_fill(values)
+    index, columns = prices.index, prices.columns
+    return RollingAnalytics(
+        returns=pd.DataFrame(rolling_returns(values, window), index=index, columns=columns),
+        volatility=pd.DataFrame(rolling_volatility(values, window), index=index, columns=columns),
+        correlation=pd.DataFrame(correlation_matrix(values, min_periods=window), index=columns, columns=columns),
+        drawdown=pd.DataFrame(drawdowns(filled), index=index, columns=columns),
+        max_drawdown=pd.Series(max_drawdowns(filled), index=columns, name="최대 낙폭"),
+    )
+
+
+def frame_version(frame):
+    """
+    DataFrame의 내용(날짜 인덱스, 컬럼, 값)이 바뀌었는지 판단하기 위한 버전 키.
+    창 크기만 바꾸는 재실행에서도 매번 계산되므로, 원시 바이트를 한 번에 해시하여 가볍게 유지합니다.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame.index.asi8).tobytes())
+    digest.update(np.ascontiguousarray(frame.to_numpy(dtype=float)).tobytes())
+    return frame.shape, tuple(frame.columns), digest.hexdigest()
+
+
+class AnalyticsCache:
+    """(가격 데이터 버전, 창 크기)를 키로 RollingAnalytics를 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_RESULTS, name="analytics"):
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, prices, window):
+        key = (frame_version(prices), window)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                instrumentation.increment("cache_hits_total", cache=self.name)
+                return result
+        instrumentation.increment("cache_misses_total", cache=self.name)
+        result = compute_rolling_analytics(prices, window)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                instrumentation.increment("cache_evictions_total", cache=self.name)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 모든 세션이 함께 사용하는 분석 결과 캐시
+analytics_cache = AnalyticsCache()
+
+
+def rolling_analytics(prices, window, cache=None):
+    """캐시를 거쳐 가격 DataFrame의 RollingAnalytics를 반환"""
+    cache = cache if cache is not None else analytics_cache
+    return cache.get_or_compute(prices, window)
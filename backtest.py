@@ -0,0 +1,132 @@
+"""
+적립식(DCA) 투자 백테스트 모듈.
+
+월별 투자 가이드의 포트폴리오 비중대로 매달 첫 거래일에 정수 주식 수만큼 매수하고,
+1주 미만으로 남은 금액은 다음 달 투자금에 더하는 방식으로 과거 가격을 재생합니다.
+여러 비중(예: 투자 성향 0~100 전체)을 한 번에 넘기면 전략 축으로 벡터화하여 함께 계산합니다.
+투자금은 원화이므로 해외(달러) 종목의 가격은 to_krw로 원/달러 환율을 곱해 원화로 바꾼 뒤 넘겨야 합니다.
+"""
+import numpy as np
+import pandas as pd
+
+import allocation
+
+TRADING_DAYS_PER_YEAR = 252
+
+# 원화로 거래되는 국내 종목의 티커 접미사 (그 외 종목은 달러 가격으로 봄)
+KRW_TICKER_SUFFIXES = (".KS", ".KQ")
+# 1달러당 원화 환율 티커
+USD_KRW_TICKER = "KRW=X"
+
+
+def is_krw_ticker(ticker):
+    return ticker.upper().endswith(KRW_TICKER_SUFFIXES)
+
+
+def to_krw(prices, usd_krw):
+    """
+    달러로 거래되는 종목 컬럼에 원/달러 환율을 곱해 원화 가격으로 변환.
+    환율은 각 날짜 이전의 마지막 값을 사용하며(앞 방향 채우기), 첫 환율 이전 날짜는 NaN(매수 불가)이 됩니다.
+    """
+    foreign = [ticker for ticker in prices.columns if not is_krw_ticker(ticker)]
+    if not foreign:
+        return prices
+    usd_krw = usd_krw.dropna().sort_index()
+    rate = usd_krw.reindex(usd_krw.index.union(prices.index)).ffill().reindex(prices.index)
+    converted = prices.copy()
+    converted[foreign] = prices[foreign].mul(rate, axis=0)
+    return converted
+
+
+def monthly_purchase_positions(index):
+    """날짜 인덱스에서 매월 첫 거래일의 위치(정수 배열)를 반환"""
+    months = pd.DatetimeIndex(index).to_period("M")
+    return np.flatnonzero(~months.duplicated())
+
+
+def asset_ticker_matrix(items_by_asset, tickers):
+    """
+    자산군 비율을 티커 비중으로 바꾸는 (자산군 수, 티커 수) 행렬을 생성.
+    items_by_asset는 {자산군: {티커: 자산군 내 비중}} 형태이며, (비율(%) / 100) @ 행렬 = 티커별 비중입니다.
+    """
+    column = {ticker: i for i, ticker in enumerate(tickers)}
+    matrix = np.zeros((len(allocation.ASSET_CLASSES), len(tickers)))
+    for asset, items in items_by_asset.items():
+        row = allocation.ASSET_CLASSES.index(asset)
+        for ticker, fraction in items.items():
+            matrix[row, column[ticker]] += fraction
+    return matrix
+
+
+def run_dca_backtest(prices, weights, monthly_investment):
+    """
+    적립식 투자 백테스트를 실행.
+
+    prices: 날짜 × 티커 원화 가격 DataFrame (상장 전 구간은 NaN 허용, 해외 종목은 to_krw로 변환)
+    weights: (티커 수,) 또는 (전략 수, 티커 수) 배열. 월 투자금 중 각 티커에 배분할 비율이며,
+             합계가 1보다 작으면 나머지는 현금(CMA/적금 등)으로 쌓이는 것으로 봅니다.
+    monthly_investment: 월 투자 금액 (원)
+
+    반환값: (평가액 DataFrame(날짜 × 전략), 누적 투자금 Series, 성과 지표 DataFrame(전략 × 지표))
+    """
+    prices = prices.sort_index()
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    positions = monthly_purchase_positions(prices.index)
+    if len(positions) == 0:
+        raise ValueError("백테스트할 가격 데이터가 없습니다.")
+
+    # 첫 매수일 이전 구간은 평가에서 제외
+    prices = prices.iloc[positions[0]:]
+    positions = positions - positions[0]
+    buy_prices = prices.to_numpy(dtype=float)[positions]  # (월 수, 티커 수), 상장 전이면 NaN
+    valuation = np.nan_to_num(prices.ffill().to_numpy(dtype=float))  # (일 수, 티커 수)
+
+    n_strategies = weights.shape[0]
+    weight_sum = weights.sum(axis=1)
+    ticker_share = np.divide(weights, weight_sum[:, None], out=np.zeros_like(weights), where=weight_sum[:, None] > 0)
+    can_buy = np.isfinite(buy_prices) & (buy_prices > 0)
+    safe_buy_prices = np.where(can_buy, buy_prices, np.inf)
+
+    holdings = np.zeros_like(weights)
+    carry = np.zeros(n_strategies)  # 1주 미만으로 남아 다음 달로 넘기는 금액
+    reserve = np.zeros(n_strategies)  # 티커가 없는 자산군(현금성 자산)에 쌓인 금액
+    equity = np.empty((len(prices), n_strategies))
+    boundaries = np.append(positions, len(prices))
+
+    for month, (begin, end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        investable = monthly_investment * weight_sum + carry
+        shares = np.floor(investable[:, None] * ticker_share / safe_buy_prices[month])
+        carry = investable - (shares * np.where(can_buy[month], buy_prices[month], 0)).sum(axis=1)
+        reserve += monthly_investment * (1 - weight_sum)
+        holdings += shares
+        equity[begin:end] = valuation[begin:end] @ holdings.T + carry + reserve
+
+    index = prices.index
+    contributions = np.zeros(len(prices))
+    contributions[positions] = monthly_investment
+    invested = pd.Series(np.cumsum(contributions), index=index, name="누적 투자금")
+    equity_df = pd.DataFrame(equity, index=index)
+    return equity_df, invested, performance_metrics(equity, contributions, index)
+
+
+def performance_metrics(equity, contributions, index):
+    """
+    투자금 유입을 제외한 시간가중수익률(TWR)로 전략별 CAGR, 최대 낙폭, 연 변동성을 계산.
+    equity: (일 수, 전략 수) 평가액, contributions: (일 수,) 일별 투자금 유입액
+    """
+    previous = equity[:-1]
+    daily_returns = np.divide(
+        equity[1:] - contributions[1:, None], previous,
+        out=np.zeros_like(previous), where=previous > 0,
+    ) - np.where(previous > 0, 1.0, 0.0)
+    growth = np.vstack([np.ones((1, equity.shape[1])), np.cumprod(1 + daily_returns, axis=0)])
+
+    years = max((index[-1] - index[0]).days / 365.25, 1 / 365.25)
+    drawdown = growth / np.maximum.accumulate(growth, axis=0) - 1
+    return pd.DataFrame({
+        "최종 평가액": equity[-1],
+        "총 투자금": contributions.sum(),
+        "CAGR": growth[-1] ** (1 / years) - 1,
+        "최대 낙폭": drawdown.min(axis=0),
+        "연 변동성": daily_returns.std(axis=0) * np.sqrt(TRADING_DAYS_PER_YEAR),
+    })
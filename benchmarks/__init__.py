@@ -0,0 +1 @@
+"""성능 벤치마크 모음 (사용법은 benchmarks/run.py 참고)"""
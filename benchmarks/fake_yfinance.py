@@ -0,0 +1,71 @@
+"""
+네트워크 없이 벤치마크를 실행하기 위한 yfinance 대체 함수.
+
+yf.download / yf.Ticker.history와 같은 형태의 결과(컬럼이 (필드, 티커)인 MultiIndex,
+단일 티커는 거래소 시간대가 붙은 인덱스)를 티커 이름으로 고정된 난수 시드로 생성하므로
+같은 요청에는 항상 같은 가격이 반환됩니다.
+"""
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import yfinance
+
+# period 인자로 요청했을 때 생성할 달력 일수
+PERIOD_DAYS = 400
+
+# 지금까지 받은 요청 기록 ((티커, ...), start, end, period)
+calls = []
+
+
+def _window(start, end, period):
+    if period is not None:
+        end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        return end - pd.Timedelta(days=PERIOD_DAYS), end
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def _ticker_prices(ticker, index):
+    """티커별로 고정된 시드의 로그 정규 랜덤워크 가격"""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode("utf-8")))
+    steps = rng.normal(0.0003, 0.015, len(index))
+    return 20 + rng.random() * 480 * np.exp(np.cumsum(steps))
+
+
+def download(tickers, start=None, end=None, period=None, **kwargs):
+    """yf.download와 같은 형태의 가짜 다운로드 (end는 미포함)"""
+    tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+    calls.append((tuple(tickers), start, end, period))
+    start, end = _window(start, end, period)
+    index = pd.bdate_range(start, end - pd.Timedelta(days=1))
+    columns = pd.MultiIndex.from_product([["Close", "Volume"], tickers], names=["Price", "Ticker"])
+    data = np.empty((len(index), len(columns)))
+    for position, ticker in enumerate(tickers):
+        data[:, position] = _ticker_prices(ticker, index)
+        data[:, len(tickers) + position] = 1_000_000
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+class Ticker:
+    """yf.Ticker 대체 (history만 지원)"""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, start=None, end=None, period=None, timeout=None, **kwargs):
+        frame = download([self.ticker], start=start, end=end, period=period)
+        result = frame.xs(self.ticker, axis=1, level="Ticker")
+        result.index = result.index.tz_localize("America/New_York")
+        return result
+
+
+@contextmanager
+def patched():
+    """with 블록 안에서 yfinance.download / yfinance.Ticker를 가짜로 교체"""
+    original = yfinance.download, yfinance.Ticker
+    yfinance.download, yfinance.Ticker = download, Ticker
+    try:
+        yield
+    finally:
+        yfinance.download, yfinance.Ticker = original
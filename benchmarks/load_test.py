@@ -0,0 +1,97 @@
+"""
+주식 페이지 부하 테스트 스크립트.
+
+기록된 시세 픽스처(market_source의 replay 모드)로 네트워크 없이 두 주식 페이지를
+여러 세션에서 동시에 실행하고, 처리량(초당 실행 수)과 실행 시간 분포(p50/p95/p99)를 측정합니다.
+지연 시간과 실패율은 MARKET_DATA_LATENCY / MARKET_DATA_FAILURE_RATE로 주입할 수 있습니다.
+
+사용법 (저장소 루트에서):
+    # 1) 네트워크가 되는 환경에서 한 번 기록
+    MARKET_DATA_MODE=record python -m benchmarks.load_test --sessions 1 --runs 1
+    # 2) 기록된 픽스처로 부하 테스트 (기본 모드는 replay)
+    MARKET_DATA_LATENCY=0.05-0.3 python -m benchmarks.load_test --sessions 8 --runs 20 --clear-cache
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# market_data를 불러오기 전에 설정해야 함
+os.environ.setdefault("MARKET_DATA_MODE", "replay")
+_TEMP_DIR = tempfile.TemporaryDirectory(prefix="loadtest-")
+os.environ.setdefault("PRICE_STORE_PATH", os.path.join(_TEMP_DIR.name, "prices.sqlite"))
+# 측정 중에 백그라운드 미리 받기가 끼어들지 않도록 끔
+os.environ.setdefault("PREFETCH_ENABLED", "0")
+
+import numpy as np
+
+PAGES = {
+    "chart_page": os.path.join(ROOT, "pages", "00_주식데이터시각화.py"),
+    "portfolio_page": os.path.join(ROOT, "pages", "01_성향에_따른_자산_포트폴리오_구성.py"),
+}
+
+_compile_lock = threading.Lock()
+
+
+def run_session(path, runs, clear_cache):
+    """한 세션(AppTest)에서 페이지를 runs번 실행하여 (실행 시간 목록, 오류 수)를 반환"""
+    import market_data
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(path, default_timeout=120)
+    # 첫 실행(스크립트 컴파일)은 측정에서 제외하고 한 세션씩 실행
+    # (Python 3.11의 ast.parse는 여러 스레드에서 동시에 호출하면 실패할 수 있음)
+    with _compile_lock:
+        app.run()
+    timings, errors = [], 0
+    for _ in range(runs):
+        if clear_cache:
+            market_data.price_cache.clear()
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+        errors += len(app.exception) + len(app.error)
+    return timings, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주식 페이지 부하 테스트 (replay 모드)")
+    parser.add_argument("--sessions", type=int, default=4, help="동시에 실행할 세션 수")
+    parser.add_argument("--runs", type=int, default=10, help="세션당 실행 횟수")
+    parser.add_argument("--pages", default=",".join(PAGES), help=f"대상 페이지 (쉼표 구분: {', '.join(PAGES)})")
+    parser.add_argument("--clear-cache", action="store_true", help="실행마다 메모리 가격 캐시를 비워 데이터 경로까지 측정")
+    args = parser.parse_args(argv)
+
+    print(f"모드: {os.environ['MARKET_DATA_MODE']}, 지연: {os.environ.get('MARKET_DATA_LATENCY', '0')}, "
+          f"실패율: {os.environ.get('MARKET_DATA_FAILURE_RATE', '0')}")
+    lock = threading.Lock()
+    for page in (page.strip() for page in args.pages.split(",") if page.strip()):
+        timings, errors = [], 0
+
+        def session(_):
+            nonlocal errors
+            session_timings, session_errors = run_session(PAGES[page], args.runs, args.clear_cache)
+            with lock:
+                timings.extend(session_timings)
+                errors += session_errors
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            list(executor.map(session, range(args.sessions)))
+        elapsed = time.perf_counter() - start
+
+        p50, p95, p99 = np.percentile(timings, [50, 95, 99]) * 1000
+        print(f"{page:<16} 실행 {len(timings):4d}회  처리량 {len(timings) / elapsed:7.2f}회/초  "
+              f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  p99 {p99:8.1f} ms  오류 {errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+성능 벤치마크 실행 스크립트.
+
+배포 전에 주요 경로의 성능 저하를 확인하기 위해 다음 항목의 실행 시간을 측정합니다.
+yfinance는 benchmarks/fake_yfinance.py의 가짜 함수로 교체되므로 네트워크 없이 실행됩니다.
+
+- 데이터 로딩: 차트 페이지(load_stock_data)와 포트폴리오 페이지(get_stock_data)가 사용하는
+  market_data.get_price_history / get_price_series (빈 저장소에서 시작 / 메모리 캐시 적중)
+- 배분 계산: 배분 표 생성, 자산 배분, 채권/ETF 비중, 정수 주식 수 배분, 적립식 백테스트, 롤링 분석
+- 페이지 실행: Streamlit AppTest로 각 페이지를 화면 없이 실행했을 때의 첫 실행 / 재실행 시간
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run                          # 전체 실행
+    python -m benchmarks.run --tickers 50 --years 10  # 데이터 크기 조정
+    python -m benchmarks.run --only data,allocation   # 일부 그룹만 실행
+    python -m benchmarks.run --save bench.json        # 결과 저장
+    python -m benchmarks.run --baseline bench.json    # 저장한 결과와 비교 (기준보다 느려지면 종료 코드 1)
+
+tests/test_benchmarks.py가 pytest 실행 때 데이터/배분 그룹을 작은 크기로 한 번씩 돌려 벤치마크 코드가
+깨지지 않았는지 확인합니다. 실행 시간 비교는 측정 환경에 따라 달라지므로 --baseline으로 따로 실행합니다.
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 디스크 가격 저장소는 벤치마크마다 임시 경로를 사용 (price_store를 불러오기 전에 설정해야 함)
+_TEMP_DIR = tempfile.TemporaryDirectory(prefix="bench-")
+os.environ.setdefault("PRICE_STORE_PATH", os.path.join(_TEMP_DIR.name, "prices.sqlite"))
+# 측정 중에 백그라운드 미리 받기가 끼어들지 않도록 끔
+os.environ.setdefault("PREFETCH_ENABLED", "0")
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import fake_yfinance
+
+GROUPS = ("data", "allocation", "pages")
+PAGES = {
+    "chart_page": os.path.join(ROOT, "pages", "00_주식데이터시각화.py"),
+    "portfolio_page": os.path.join(ROOT, "pages", "01_성향에_따른_자산_포트폴리오_구성.py"),
+    "guam_trip": os.path.join(ROOT, "guam_trip.py"),
+}
+# 기준 결과 대비 이 비율 이상 느려지면 성능 저하로 판단
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(func, repeat, setup=None):
+    """func를 repeat번 실행하여 각 실행 시간(초) 목록을 반환 (setup은 매 실행 전에 호출되며 시간에서 제외)"""
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(argument) if setup is not None else func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def data_benchmarks(n_tickers, years, repeat):
+    import market_data
+    from price_store import PriceStore
+
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    end = pd.Timestamp("today").normalize()
+    start = end - pd.DateOffset(years=years)
+
+    store_paths = (os.path.join(_TEMP_DIR.name, f"data-{i}.sqlite") for i in itertools.count())
+
+    def fresh_sources():
+        return market_data.PriceCache(), PriceStore(next(store_paths))
+
+    def cold_history(sources):
+        cache, store = sources
+        market_data.get_price_history(tickers, start, end, cache=cache, store=store, download=fake_yfinance.download)
+
+    warm_cache, warm_store = fresh_sources()
+    market_data.get_price_history(tickers, start, end, cache=warm_cache, store=warm_store, download=fake_yfinance.download)
+
+    def warm_history():
+        market_data.get_price_history(tickers, start, end, cache=warm_cache, store=warm_store)
+
+    def disk_history():
+        # 메모리 캐시는 비어 있고 디스크 저장소에는 데이터가 있는 경우 (프로세스 재시작 직후)
+        market_data.get_price_history(tickers, start, end, cache=market_data.PriceCache(), store=warm_store)
+
+    def cold_series(sources):
+        cache, store = sources
+        for ticker in tickers[:10]:
+            market_data.get_price_series(ticker, "1y", cache=cache, store=store, download=fake_yfinance.download)
+
+    return {
+        "load_stock_data_cold": measure(cold_history, repeat, setup=fresh_sources),
+        "load_stock_data_disk": measure(disk_history, repeat),
+        "load_stock_data_cached": measure(warm_history, repeat),
+        "get_stock_data_cold_x10": measure(cold_series, repeat, setup=fresh_sources),
+    }
+
+
+def allocation_benchmarks(n_tickers, years, repeat):
+    import allocation
+    import analytics
+    import backtest
+    import share_optimizer
+
+    rng = np.random.default_rng(0)
+    profiles = [allocation.ASSET_CLASSES[:k] for k in range(1, len(allocation.ASSET_CLASSES) + 1)]
+    etf_styles = {"ETF A": "안정형", "ETF B": "성장형", "ETF C": "안정형", "ETF D": "기타"}
+    budget = 1_000_000
+    # 월별 투자 가이드처럼 종목별 목표 금액의 합계가 예산과 같도록 설정
+    targets = rng.dirichlet(np.ones(n_tickers)) * budget
+    share_prices = rng.uniform(5, 500, n_tickers)
+
+    index = pd.bdate_range(end=pd.Timestamp("today").normalize(), periods=252 * years)
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (len(index), n_tickers)), axis=0)),
+        index=index, columns=[f"SYN{i:04d}" for i in range(n_tickers)],
+    )
+    weights = rng.random((len(allocation.RISK_LEVELS), n_tickers))
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    def allocate_all():
+        for risk in allocation.RISK_LEVELS:
+            for assets in profiles:
+                allocation.allocate(int(risk), assets)
+
+    def splits_all():
+        for risk in allocation.RISK_LEVELS:
+            allocation.bond_type_split(int(risk), allocation.BOND_TYPES)
+            allocation.etf_item_split(int(risk), etf_styles)
+
+    return {
+        "build_allocation_tables": measure(allocation.build_allocation_tables, repeat),
+        "allocate_101x7": measure(allocate_all, repeat),
+        "bond_etf_split_101": measure(splits_all, repeat),
+        "optimize_shares": measure(lambda: share_optimizer.optimize_shares(budget, targets, share_prices), repeat),
+        "dca_backtest_101": measure(lambda: backtest.run_dca_backtest(prices, weights, budget), repeat),
+        "rolling_analytics": measure(lambda: analytics.compute_rolling_analytics(prices, 20), repeat),
+    }
+
+
+def page_benchmarks(n_tickers, years, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for name, path in PAGES.items():
+        app = AppTest.from_file(path, default_timeout=120)
+        start = time.perf_counter()
+        app.run()
+        first = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f"{name} 실행 중 오류: {[error.value for error in app.exception]}")
+        results[f"{name}_first_run"] = [first]
+        results[f"{name}_rerun"] = measure(app.run, repeat)
+    return results
+
+
+BENCHMARK_GROUPS = {
+    "data": data_benchmarks,
+    "allocation": allocation_benchmarks,
+    "pages": page_benchmarks,
+}
+
+
+def summarize(timings):
+    return {"median": statistics.median(timings), "min": min(timings), "runs": len(timings)}
+
+
+def compare(results, baseline, tolerance):
+    """기준 결과보다 tolerance 비율 이상 느려진 항목의 (이름, 기준, 현재) 목록"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference and result["median"] > reference["median"] * (1 + tolerance):
+            regressions.append((name, reference["median"], result["median"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주요 경로 성능 벤치마크")
+    parser.add_argument("--tickers", type=int, default=20, help="데이터/백테스트 벤치마크의 티커 수")
+    parser.add_argument("--years", type=int, default=3, help="가격 이력 길이 (년)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"실행할 그룹 (쉼표 구분: {', '.join(GROUPS)})")
+    parser.add_argument("--save", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용하는 성능 저하 비율")
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(sorted(unknown))}")
+
+    results = {}
+    with fake_yfinance.patched():
+        for group in groups:
+            for name, timings in BENCHMARK_GROUPS[group](args.tickers, args.years, args.repeat).items():
+                results[name] = summarize(timings)
+                print(f"{name:<32} median {results[name]['median'] * 1000:9.2f} ms   min {results[name]['min'] * 1000:9.2f} ms")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"params": vars(args), "results": results}, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, reference, current in regressions:
+            print(f"성능 저하: {name} {reference * 1000:.2f} ms -> {current * 1000:.2f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
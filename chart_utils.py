@@ -0,0 +1,158 @@
+"""
+Plotly 차트 생성 공용 모듈.
+
+Streamlit은 위젯이 바뀔 때마다 스크립트 전체를 다시 실행하므로, 매번 go.Scatter를 새로 만들면
+티커 선택만 바꿔도 모든 trace의 생성/검증 비용을 다시 치르게 됩니다.
+여기서는 티커별 trace를 데이터 버전(내용 해시) 기준으로 캐싱해 두고, Figure는 캐싱된
+trace를 골라 조립만 하므로 티커를 추가/제거해도 바뀐 trace만 새로 만듭니다.
+
+긴 가격 이력은 차트 가로 해상도에 맞춘 포인트 수로 다운샘플링(LTTB 또는 구간별 최소/최대)하여
+브라우저로 보내는 데이터 양을 제한하며, 다운샘플링 결과도 (데이터, 포인트 수, 방식)별로 캐싱됩니다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import instrumentation
+
+# 캐싱할 최대 trace 수 (티커 수 × 차트 종류 × 해상도보다 넉넉하게)
+DEFAULT_MAX_TRACES = 256
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def series_version(series):
+    """Series의 내용(인덱스와 값)이 바뀌었는지 판단하기 위한 버전 키"""
+    return len(series), int(pd.util.hash_pandas_object(series, index=True).sum())
+
+
+class TraceCache:
+    """(차트 종류, 이름, 데이터 버전)을 키로 go.Scatter를 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_TRACES, name="trace"):
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, create):
+        with self._lock:
+            trace = self._entries.get(key)
+            if trace is not None:
+                self._entries.move_to_end(key)
+                instrumentation.increment("cache_hits_total", cache=self.name)
+                return trace
+        instrumentation.increment("cache_misses_total", cache=self.name)
+        trace = create()
+        with self._lock:
+            self._entries[key] = trace
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                instrumentation.increment("cache_evictions_total", cache=self.name)
+        return trace
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 모든 세션이 함께 사용하는 trace 캐시
+trace_cache = TraceCache()
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 알고리즘으로 남길 포인트의 위치를 반환.
+    첫/마지막 포인트는 항상 남기고, 나머지 구간마다 이전 선택점과 다음 구간 평균점이 만드는
+    삼각형의 넓이가 가장 큰 포인트를 골라 선의 모양을 최대한 유지합니다.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    첫/마지막 포인트를 남기고, 전체를 (n_out - 2)/2개 구간으로 나눠 각 구간의 최솟값과 최댓값 위치를 남김
+    (급등락을 놓치지 않으면서 결과가 n_out개를 넘지 않음)
+    """
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n:
+        return np.arange(n)
+    if n_buckets < 1:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    bucket_ids = np.repeat(np.arange(n_buckets), np.diff(np.linspace(0, n, n_buckets + 1).astype(np.int64)))
+    order = np.lexsort((y, bucket_ids))  # 구간별로 값 오름차순 정렬
+    first = np.flatnonzero(np.r_[True, bucket_ids[order][1:] != bucket_ids[order][:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    return np.unique(np.concatenate([order[first], order[last], [0, n - 1]]))
+
+
+def downsample(series, max_points, method="lttb"):
+    """Series를 최대 max_points개 포인트로 줄여 반환 (포인트 수가 이미 적으면 그대로 반환)"""
+    if max_points is None or len(series) <= max_points:
+        return series
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    y = series.to_numpy(dtype=float)
+    if method == "minmax":
+        positions = minmax_indices(y, max_points)
+    elif method == "lttb":
+        positions = lttb_indices(series.index.asi8.astype(float), y, max_points)
+    else:
+        raise ValueError(f"지원하지 않는 다운샘플링 방식입니다: {method}")
+    return series.iloc[positions]
+
+
+def line_trace(kind, name, series, max_points=None, method="lttb", cache=None):
+    """
+    이름이 name인 선 그래프 trace를 반환 (같은 데이터로 이미 만든 trace가 있으면 재사용).
+    max_points를 지정하면 해당 포인트 수 이하로 다운샘플링한 데이터를 사용합니다.
+    """
+    cache = cache if cache is not None else trace_cache
+    key = (kind, name, series_version(series), max_points, method)
+
+    def create():
+        sampled = downsample(series, max_points, method)
+        return go.Scatter(x=sampled.index, y=sampled.values, mode='lines', name=name)
+
+    return cache.get_or_create(key, create)
+
+
+def build_line_figure(frame, kind, layout, max_points=None, method="lttb", cache=None):
+    """
+    DataFrame의 각 컬럼을 선 그래프로 그린 Figure를 생성.
+    kind는 같은 데이터라도 다른 차트(원본/정규화 등)의 trace를 구분하기 위한 이름이며,
+    max_points를 지정하면 컬럼마다 해당 포인트 수 이하로 다운샘플링합니다.
+    """
+    traces = [
+        line_trace(kind, column, frame[column], max_points=max_points, method=method, cache=cache)
+        for column in frame.columns
+    ]
+    return go.Figure(data=traces, layout=layout)
@@ -0,0 +1,172 @@
+"""
+성능 계측 모듈.
+
+페이지의 주요 단계(데이터 조회 / 변환 / 렌더링)에 타이밍 구간(span)을 두고,
+캐시 적중/실패/제거 횟수 같은 카운터를 프로세스 전체에서 집계합니다.
+
+- span(name): with 블록의 실행 시간을 구간 이름별 (횟수, 합계, 최대, 마지막) 통계로 누적
+- increment(name, **labels): 레이블이 붙은 카운터 증가 (예: cache_hits_total{cache="price"})
+- to_prometheus() / snapshot(): Prometheus 텍스트 / JSON 형식으로 내보내기
+- render_debug_sidebar(): 주소에 ?debug=1이 있을 때만 사이드바에 계측 패널을 표시하며,
+  환경 변수 METRICS_EXPORT_PATH가 있으면 페이지가 실행될 때마다 해당 파일(.json이면 JSON,
+  그 외에는 Prometheus 텍스트)로 내보냅니다.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_EXPORT_PATH = os.environ.get("METRICS_EXPORT_PATH")
+
+
+class Metrics:
+    """스레드 안전한 카운터와 구간 시간 통계 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # (이름, ((레이블, 값), ...)) -> 값
+        self._spans = {}  # 구간 이름 -> [횟수, 합계(초), 최대(초), 마지막(초)]
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            stats = self._spans.setdefault(name, [0, 0.0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] = seconds
+
+    @contextmanager
+    def span(self, name):
+        """with 블록의 실행 시간을 name 구간으로 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self):
+        """현재 값을 JSON으로 직렬화할 수 있는 dict로 반환"""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            spans = {
+                name: {"count": count, "total_seconds": total, "max_seconds": longest, "last_seconds": last}
+                for name, (count, total, longest, last) in sorted(self._spans.items())
+            }
+        return {"timestamp": time.time(), "counters": counters, "spans": spans}
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식으로 변환 (구간은 span_duration_seconds 요약 지표)"""
+        snapshot = self.snapshot()
+        lines = []
+        for name in dict.fromkeys(counter["name"] for counter in snapshot["counters"]):
+            lines.append(f"# TYPE {name} counter")
+            for counter in snapshot["counters"]:
+                if counter["name"] == name:
+                    lines.append(f"{name}{_format_labels(counter['labels'])} {counter['value']}")
+        if snapshot["spans"]:
+            lines.append("# TYPE span_duration_seconds summary")
+            for name, stats in snapshot["spans"].items():
+                labels = _format_labels({"span": name})
+                lines.append(f"span_duration_seconds_count{labels} {stats['count']}")
+                lines.append(f"span_duration_seconds_sum{labels} {stats['total_seconds']:.6f}")
+            lines.append("# TYPE span_duration_seconds_max gauge")
+            for name, stats in snapshot["spans"].items():
+                lines.append(f"span_duration_seconds_max{_format_labels({'span': name})} {stats['max_seconds']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        path로 내보내기 (.json이면 JSON, 그 외에는 Prometheus 텍스트).
+        다른 프로세스가 읽는 중에도 안전하도록 교체 방식으로 기록하며, 여러 세션이 동시에 내보내도
+        서로의 임시 파일을 덮어쓰지 않도록 호출마다 고유한 임시 파일을 사용합니다.
+        """
+        content = json.dumps(self.snapshot(), ensure_ascii=False, indent=2) if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+
+# 모든 페이지와 세션이 함께 사용하는 계측 저장소
+metrics = Metrics()
+span = metrics.span
+increment = metrics.increment
+
+
+def cache_ratio(cache):
+    """cache 레이블의 적중률 (요청이 없으면 None)"""
+    hits = metrics.counter("cache_hits_total", cache=cache)
+    total = hits + metrics.counter("cache_misses_total", cache=cache)
+    return hits / total if total else None
+
+
+def render_debug_sidebar():
+    """
+    페이지 끝에서 호출. METRICS_EXPORT_PATH가 있으면 파일로 내보내고,
+    주소에 ?debug=1이 있으면 사이드바에 구간별 시간과 카운터를 표시합니다.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    if METRICS_EXPORT_PATH:
+        metrics.export(METRICS_EXPORT_PATH)
+    if st.query_params.get("debug") != "1":
+        return
+
+    snapshot = metrics.snapshot()
+    with st.sidebar.expander("🛠️ 성능 계측 (debug)", expanded=True):
+        if snapshot["spans"]:
+            st.write("**구간별 실행 시간 (ms)**")
+            st.dataframe(pd.DataFrame({
+                name: {
+                    "횟수": stats["count"],
+                    "평균": stats["total_seconds"] / stats["count"] * 1000,
+                    "최대": stats["max_seconds"] * 1000,
+                    "마지막": stats["last_seconds"] * 1000,
+                }
+                for name, stats in snapshot["spans"].items()
+            }).T.round(2))
+        if snapshot["counters"]:
+            st.write("**카운터**")
+            st.dataframe(pd.DataFrame([
+                {"이름": counter["name"], "레이블": _format_labels(counter["labels"]), "값": counter["value"]}
+                for counter in snapshot["counters"]
+            ]), hide_index=True)
+        for cache in sorted({counter["labels"].get("cache") for counter in snapshot["counters"]} - {None}):
+            ratio = cache_ratio(cache)
+            if ratio is not None:
+                st.write(f"- {cache} 캐시 적중률: **{ratio:.1%}**")
+        st.download_button("JSON 내보내기", json.dumps(snapshot, ensure_ascii=False, indent=2), "metrics.json", "application/json")
+        st.download_button("Prometheus 텍스트 내보내기", metrics.to_prometheus(), "metrics.prom", "text/plain")
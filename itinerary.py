@@ -0,0 +1,163 @@
+"""
+여행 일정 모듈.
+
+data/itineraries/*.json 파일 하나가 여행 하나이며, 모든 파일을 한 번만 읽고 검증하여
+여행 ID와 일차로 바로 찾을 수 있는 색인(Itineraries)을 만듭니다.
+프로세스 안에서 캐싱되며, 파일이 추가/수정/삭제되면(파일 목록이나 수정 시각 변경) 다시 읽습니다.
+
+파일 형식:
+    {
+      "id": "guam",
+      "title": "🌴 괌 6박 7일 가족여행 가이드",
+      "days": [
+        {
+          "schedule": {"오전": "...", "점심": "...", "오후": "...", "저녁": "..."},
+          "locations": [{"name": "타무닝 해변", "icon": "🏖️", "lat": 13.4961, "lon": 144.7782}]
+        }
+      ]
+    }
+days의 순서가 일차(1일차, 2일차, ...)이며, locations의 icon은 생략하면 기본 핀(📍)을 사용합니다.
+"""
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+ITINERARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "itineraries")
+DEFAULT_ICON = "📍"
+
+Location = namedtuple("Location", ["name", "icon", "latitude", "longitude"])
+Day = namedtuple("Day", ["number", "schedule", "locations"])
+
+
+class ItineraryError(ValueError):
+    """일정 파일의 형식이 잘못되었을 때 발생 (파일 경로와 잘못된 위치를 메시지에 포함)"""
+
+
+def day_label(number):
+    return f"{number}일차"
+
+
+def location_label(location):
+    """지도와 경로에 표시할 이름 (예: '🏖️ 타무닝 해변')"""
+    return f"{location.icon} {location.name}"
+
+
+class Trip:
+    """여행 하나의 일정 (일차 번호는 1부터)"""
+
+    def __init__(self, trip_id, title, days):
+        self.id = trip_id
+        self.title = title
+        self.days = tuple(days)
+
+    def __len__(self):
+        return len(self.days)
+
+    def day(self, number):
+        """number일차의 Day (일정이 없는 날이면 None)"""
+        return self.days[number - 1] if 1 <= number <= len(self.days) else None
+
+
+class Itineraries:
+    """여행 ID별 Trip 색인"""
+
+    def __init__(self, trips):
+        self.trips = {}
+        for trip in trips:
+            self.trips[trip.id] = trip
+
+    def __len__(self):
+        return len(self.trips)
+
+    def __contains__(self, trip_id):
+        return trip_id in self.trips
+
+    def ids(self):
+        return list(self.trips)
+
+    def get(self, trip_id):
+        return self.trips.get(trip_id)
+
+
+def _require(condition, path, where, message):
+    if not condition:
+        raise ItineraryError(f"{os.path.basename(path)} {where}: {message}")
+
+
+def _parse_location(raw, path, where):
+    _require(isinstance(raw, dict), path, where, "장소는 객체여야 합니다.")
+    name = raw.get("name")
+    _require(isinstance(name, str) and name.strip(), path, where, "name(장소 이름)이 필요합니다.")
+    icon = raw.get("icon", DEFAULT_ICON)
+    _require(isinstance(icon, str) and icon.strip() and " " not in icon.strip(), path, where,
+             "icon은 공백 없는 문자열(이모지)이어야 합니다.")
+    try:
+        lat, lon = float(raw["lat"]), float(raw["lon"])
+    except (KeyError, TypeError, ValueError):
+        raise ItineraryError(f"{os.path.basename(path)} {where}: lat/lon(위도/경도) 숫자가 필요합니다.") from None
+    _require(-90 <= lat <= 90 and -180 <= lon <= 180, path, where, f"위경도 범위를 벗어났습니다: ({lat}, {lon})")
+    return Location(name.strip(), icon.strip(), lat, lon)
+
+
+def _parse_day(raw, number, path):
+    where = f"days[{number - 1}]"
+    _require(isinstance(raw, dict), path, where, "일차는 객체여야 합니다.")
+    schedule = raw.get("schedule", {})
+    _require(isinstance(schedule, dict) and all(isinstance(key, str) and isinstance(value, str)
+                                                for key, value in schedule.items()),
+             path, f"{where}.schedule", "시간대(문자열)별 일정(문자열) 객체여야 합니다.")
+    raw_locations = raw.get("locations", [])
+    _require(isinstance(raw_locations, list), path, f"{where}.locations", "장소 목록(배열)이어야 합니다.")
+    locations = tuple(
+        _parse_location(location, path, f"{where}.locations[{index}]")
+        for index, location in enumerate(raw_locations)
+    )
+    return Day(number, dict(schedule), locations)
+
+
+def parse_trip(raw, path="<memory>"):
+    """JSON에서 읽은 dict를 검증하여 Trip으로 변환 (잘못되면 ItineraryError)"""
+    _require(isinstance(raw, dict), path, "최상위", "여행은 객체여야 합니다.")
+    trip_id = raw.get("id") or os.path.splitext(os.path.basename(path))[0]
+    _require(isinstance(trip_id, str) and trip_id.strip(), path, "id", "여행 ID(문자열)가 필요합니다.")
+    title = raw.get("title", trip_id)
+    _require(isinstance(title, str), path, "title", "제목은 문자열이어야 합니다.")
+    days = raw.get("days")
+    _require(isinstance(days, list) and days, path, "days", "일차 목록(배열)이 한 개 이상 필요합니다.")
+    return Trip(trip_id.strip(), title, (_parse_day(day, number, path) for number, day in enumerate(days, start=1)))
+
+
+def read_itinerary_file(path):
+    with open(path, encoding="utf-8") as file:
+        try:
+            raw = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ItineraryError(f"{os.path.basename(path)}: JSON 형식 오류 ({error})") from None
+    return parse_trip(raw, path)
+
+
+@lru_cache(maxsize=4)
+def _load_itineraries(directory, files):
+    trips = []
+    seen = {}
+    for file_name, _ in files:
+        trip = read_itinerary_file(os.path.join(directory, file_name))
+        if trip.id in seen:
+            raise ItineraryError(f"{file_name}: 여행 ID '{trip.id}'가 {seen[trip.id]}와 중복됩니다.")
+        seen[trip.id] = file_name
+        trips.append(trip)
+    return Itineraries(trips)
+
+
+def load_itineraries(directory=ITINERARY_DIR):
+    """
+    directory의 모든 일정 파일(*.json)을 읽어 Itineraries를 반환 (파일 이름 순).
+    파일 목록과 수정 시각이 같으면 다시 읽지 않습니다.
+    """
+    files = tuple(
+        (file_name, os.path.getmtime(os.path.join(directory, file_name)))
+        for file_name in sorted(os.listdir(directory))
+        if file_name.endswith(".json")
+    )
+    return _load_itineraries(directory, files)
@@ -0,0 +1,502 @@
+"""
+주가 데이터 다운로드 및 정규화 공통 모듈.
+
+여러 티커를 yfinance 한 번의 호출로 내려받고, 다운로드 결과의 컬럼 구조
+('Adj Close' / 'Close' / 멀티인덱스)를 프레임 전체에 대해 한 번만 판별하여
+티커별 컬럼을 가진 가격 DataFrame으로 돌려줍니다.
+load_prices는 디스크 저장소(price_store)를 거쳐, 이미 받아둔 구간은 다시 받지 않습니다.
+
+두 페이지는 get_price_history / get_price_series를 통해 이 모듈을 공유하며,
+프로세스 전체가 하나의 메모리 예산을 가진 캐시(PriceCache)를 함께 사용합니다.
+여러 티커의 현재가는 fetch_quotes로 스레드 풀에서 병렬 조회합니다.
+거래소가 다른 티커(미국 티커와 .KS 티커 등)는 align_to_sessions로 실제 거래일 기준으로 맞춥니다.
+기본 다운로드 함수는 market_source의 데이터 소스로, MARKET_DATA_MODE에 따라 응답을 기록하거나 재생할 수 있습니다.
+다운로드는 resilience 모듈로 동시 요청 합치기, 재시도, 데이터 소스별 서킷 브레이커를 거치며,
+브레이커가 열려 있는 동안에는 만료된 캐시 항목과 디스크 저장소의 마지막 데이터를 그대로 사용합니다.
+prefetch 모듈은 refresh_prices로 자주 쓰는 티커의 캐시 항목을 만료되기 전에 미리 갱신합니다.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import instrumentation
+import market_source
+import resilience
+from price_store import PriceStore
+
+# 가격으로 사용할 컬럼의 우선순위 ('Adj Close'가 없으면 'Close' 사용)
+PRICE_FIELDS = ("Adj Close", "Close")
+
+# 저장된 최근 데이터를 그대로 믿는 시간 (초). 이 시간이 지나면 마지막 저장일 이후만 다시 받음
+DEFAULT_MAX_AGE = 3600
+# 증분 갱신 시 마지막 저장일보다 며칠 앞에서부터 다시 받을지 (최근 종가 수정 반영)
+DELTA_OVERLAP_DAYS = 3
+
+# 프로세스 공용 메모리 캐시의 예산 (바이트)과 유효 시간 (초)
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("PRICE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+DEFAULT_CACHE_TTL = 3600
+
+# 병렬 시세 조회 기본값 (동시 실행 스레드 수, 전체 제한 시간(초))
+QUOTE_MAX_WORKERS = 8
+QUOTE_TIMEOUT = 10
+
+NO_DATA_REASON = "해당 기간의 주가 데이터를 찾을 수 없거나 데이터가 비어 있습니다."
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+class PriceCache:
+    """
+    가격 데이터를 보관하는 LRU 메모리 캐시.
+    항목 크기의 합이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고,
+    ttl초가 지난 항목은 조회 시 만료 처리합니다.
+    적중/실패/만료/제거 횟수는 instrumentation 카운터에 name 레이블로 기록됩니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES, ttl=DEFAULT_CACHE_TTL, name="price"):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _sizeof(value):
+        data = value[0] if isinstance(value, tuple) else value
+        usage = data.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if isinstance(data, pd.DataFrame) else int(usage)
+
+    def get(self, key, allow_stale=False):
+        """
+        key의 값을 반환 (없거나 만료되었으면 None).
+        allow_stale이면 만료된 항목도 지우지 않고 반환합니다 (데이터 소스 장애 시 마지막 데이터 사용).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[2] > self.ttl:
+                if allow_stale:
+                    instrumentation.increment("cache_stale_hits_total", cache=self.name)
+                    return entry[0]
+                del self._entries[key]
+                self._total_bytes -= entry[1]
+                instrumentation.increment("cache_expirations_total", cache=self.name)
+                entry = None
+            if entry is None:
+                instrumentation.increment("cache_misses_total", cache=self.name)
+                return None
+            self._entries.move_to_end(key)
+            instrumentation.increment("cache_hits_total", cache=self.name)
+            return entry[0]
+
+    def peek(self, key):
+        """
+        (값, 저장 후 지난 시간(초))를 반환 (없으면 None). 만료 여부와 관계없이 반환하며,
+        적중/실패 카운터와 LRU 순서는 바꾸지 않습니다 (미리 받기에서 갱신 시점 판단용).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return entry[0], time.time() - entry[2]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, time.time())
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                instrumentation.increment("cache_evictions_total", cache=self.name)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+
+# 두 페이지가 함께 사용하는 프로세스 공용 캐시
+price_cache = PriceCache()
+
+
+def _yf_download(tickers, **kwargs):
+    """
+    기본 다운로드 함수. 테스트 시에는 같은 시그니처의 가짜 함수로 대체할 수 있음.
+    단일 티커는 yf.Ticker.history를 사용하는데, yf.download와 달리 전역 상태를 공유하지 않아
+    여러 스레드에서 동시에 호출해도 결과가 섞이지 않습니다.
+    """
+    if len(tickers) == 1:
+        return yf.Ticker(tickers[0]).history(timeout=QUOTE_TIMEOUT, **kwargs)
+    return yf.download(tickers, progress=False, group_by="column", **kwargs)
+
+
+# 기본 데이터 소스: MARKET_DATA_MODE(live / record / replay)에 따라 yfinance 호출, 응답 기록, 기록된 응답 재생
+default_source = market_source.MarketDataSource.from_env(_yf_download)
+DEFAULT_SOURCE_NAME = "yfinance"
+
+# 같은 (티커, 구간)의 동시 다운로드를 하나로 합침
+_download_flight = resilience.SingleFlight()
+
+
+def _source_name(download):
+    if download is None or download is default_source:
+        return DEFAULT_SOURCE_NAME
+    return getattr(download, "__qualname__", None) or type(download).__name__
+
+
+def _is_retryable(error):
+    # 요청한 데이터가 없는 경우(재생 픽스처 없음 등)와 브레이커 차단은 다시 시도해도 결과가 같음
+    return not isinstance(error, (LookupError, resilience.CircuitOpenError))
+
+
+def _resilient_download(download, tickers, kwargs):
+    """서킷 브레이커와 재시도를 거쳐 download를 호출하고, 같은 요청이 진행 중이면 그 결과를 함께 사용"""
+    breaker = resilience.get_breaker(_source_name(download))
+    key = (_source_name(download), tuple(tickers), tuple(sorted((name, str(value)) for name, value in kwargs.items())))
+
+    def fetch():
+        with instrumentation.span("market_data.download"):
+            return breaker.call(
+                lambda: resilience.retry_call(lambda: download(tickers, **kwargs), retryable=_is_retryable),
+                ignore=(LookupError,),
+            )
+
+    return _download_flight.do(key, fetch)
+
+
+def source_unavailable(download=None):
+    """
+    데이터 소스의 서킷 브레이커가 열려 있어(open) 저장된 마지막 데이터를 사용 중인지.
+    half-open이면 False를 반환하여 다음 요청이 시험 호출로 데이터 소스를 호출하도록 합니다.
+    """
+    return resilience.get_breaker(_source_name(download)).is_open
+
+
+def select_price_frame(raw, tickers):
+    """
+    다운로드 결과에서 가격 컬럼을 골라 '티커별 컬럼' 형태의 DataFrame으로 반환.
+    멀티인덱스 컬럼(필드, 티커 / 티커, 필드 모두)과 단일 티커의 평면 컬럼을 지원하며,
+    유효한 가격 컬럼이 없으면 None을 반환합니다.
+    """
+    columns = raw.columns
+    if isinstance(columns, pd.MultiIndex):
+        for field in PRICE_FIELDS:
+            for level in range(columns.nlevels):
+                if field in columns.get_level_values(level):
+                    prices = raw.xs(field, axis=1, level=level)
+                    if isinstance(prices, pd.Series):
+                        prices = prices.to_frame(name=tickers[0])
+                    return prices
+        return None
+
+    for field in PRICE_FIELDS:
+        if field in columns:
+            prices = raw[field]
+            if isinstance(prices, pd.Series):
+                # 단일 티커 다운로드는 평면 컬럼이므로 티커 이름을 붙여줌
+                prices = prices.to_frame(name=tickers[0])
+            return prices
+    return None
+
+
+def download_prices(tickers, start_date=None, end_date=None, period=None, download=None):
+    """
+    여러 티커의 가격을 한 번에 다운로드하여 (가격 DataFrame, 실패 티커 dict)를 반환.
+
+    - 가격 DataFrame: 날짜 인덱스, 티커별 컬럼 (성공한 티커만 포함)
+    - 실패 티커 dict: {티커: 실패 사유}
+    download 인자로 yf.download와 같은 형태의 함수를 넘기면 네트워크 없이 동작을 확인할 수 있습니다.
+    """
+    tickers = list(dict.fromkeys(tickers))  # 중복 제거 (순서 유지)
+    failed = {}
+    if not tickers:
+        return pd.DataFrame(), failed
+
+    download = download or default_source
+    if period is not None:
+        kwargs = {"period": period}
+    else:
+        kwargs = {"start": start_date, "end": end_date}
+
+    try:
+        raw = _resilient_download(download, tickers, kwargs)
+    except Exception as e:
+        instrumentation.increment("download_errors_total")
+        return pd.DataFrame(), {ticker: f"주가 데이터를 다운로드하는 중 오류가 발생했습니다: {e}" for ticker in tickers}
+
+    if raw is None or raw.empty:
+        return pd.DataFrame(), {ticker: NO_DATA_REASON for ticker in tickers}
+
+    prices = select_price_frame(raw, tickers)
+    if prices is None:
+        reason = f"유효한 주가 데이터를 추출할 수 없습니다. 사용 가능한 컬럼: {raw.columns.tolist()}"
+        return pd.DataFrame(), {ticker: reason for ticker in tickers}
+
+    prices = prices.apply(pd.to_numeric, errors="coerce")
+    if getattr(prices.index, "tz", None) is not None:
+        # Ticker.history는 거래소 시간대가 붙은 인덱스를 반환하므로 현지 날짜 기준으로 통일
+        prices.index = prices.index.tz_localize(None).normalize()
+    for ticker in tickers:
+        if ticker not in prices.columns or prices[ticker].dropna().empty:
+            failed[ticker] = NO_DATA_REASON
+
+    prices = prices[[ticker for ticker in tickers if ticker not in failed]].sort_index()
+    prices.columns.name = None
+    return prices, failed
+
+
+def get_price_store():
+    """프로세스 전체에서 공유하는 기본 디스크 저장소"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PriceStore()
+        return _default_store
+
+
+def _plan_downloads(tickers, coverage, start, end, max_age):
+    """저장된 구간과 요청 구간을 비교하여 {(다운로드 시작, 다운로드 끝): [티커, ...]} 형태의 계획을 만듦"""
+    now = time.time()
+    plan = {}
+    for ticker in tickers:
+        if ticker not in coverage:
+            plan.setdefault((start, end), []).append(ticker)
+            continue
+
+        covered_start, covered_end, fetched_at, last_date = coverage[ticker]
+        # 앞부분: 저장된 구간보다 이전 데이터를 요청한 경우
+        if start < covered_start:
+            plan.setdefault((start, covered_start), []).append(ticker)
+        # 뒷부분: 저장된 구간 이후의 공백이 큰 경우, 또는 요청 구간이 저장된 구간 이후나 마지막 저장일까지 닿고
+        # 마지막 수집 후 max_age가 지난 경우. 종료일이 내일인 요청(오늘 봉 포함)은 수집 구간이 이미 끝까지
+        # 기록되어 있어도 마지막 거래일의 값이 바뀔 수 있으므로 max_age마다 최근 며칠을 다시 받음
+        gap_days = (end - covered_end).days
+        delta_start = max(covered_start, covered_end - pd.Timedelta(days=DELTA_OVERLAP_DAYS))
+        reaches_last = gap_days > 0 or (last_date is not None and end > last_date and end > delta_start)
+        if gap_days > DELTA_OVERLAP_DAYS or (reaches_last and now - fetched_at > max_age):
+            plan.setdefault((delta_start, end), []).append(ticker)
+    return plan
+
+
+def load_prices(tickers, start_date, end_date, store=None, download=None, max_age=DEFAULT_MAX_AGE):
+    """
+    디스크 저장소를 거쳐 [start_date, end_date) 구간의 가격을 (가격 DataFrame, 실패 티커 dict)로 반환.
+    저장소에 없는 구간(처음 보는 티커, 요청 구간의 앞부분, 마지막 저장일 이후)만 일괄 다운로드합니다.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return pd.DataFrame(), {}
+
+    store = store or get_price_store()
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    coverage = store.coverage(tickers)
+    errors = {}
+
+    for (fetch_start, fetch_end), group in _plan_downloads(tickers, coverage, start, end, max_age).items():
+        prices, failed = download_prices(group, fetch_start, fetch_end, download=download)
+        store.save(prices, fetch_start, fetch_end)
+
+        empty = [ticker for ticker, reason in failed.items() if reason == NO_DATA_REASON]
+        if not prices.empty:
+            # 같은 요청에서 다른 티커는 데이터를 받았으므로, 비어 있는 티커는 해당 구간에 데이터가 없는 것으로 기록
+            store.mark_covered([ticker for ticker in empty if ticker in coverage], fetch_start, fetch_end)
+        else:
+            # 전체가 비어 있으면 일시적인 장애일 수 있으므로 구간은 넓히지 않고 수집 시각만 갱신
+            store.touch([ticker for ticker in empty if ticker in coverage])
+        for ticker, reason in failed.items():
+            if reason != NO_DATA_REASON:
+                errors[ticker] = reason
+
+    with instrumentation.span("market_data.store_load"):
+        prices = store.load(tickers, start, end)
+    failed = {}
+    for ticker in tickers:
+        if ticker not in prices.columns or prices[ticker].dropna().empty:
+            failed[ticker] = errors.get(ticker, NO_DATA_REASON)
+    return prices, failed
+
+
+def _load_into_cache(tickers, start, end, cache, store, download, max_age=DEFAULT_MAX_AGE):
+    """[start, end) 구간을 load_prices로 불러와 티커별 캐시 항목으로 저장하고 ({티커: Series}, 실패 티커 dict)를 반환"""
+    loaded, failed = load_prices(tickers, start, end, store=store, download=download, max_age=max_age)
+    series_by_ticker = {}
+    for ticker in loaded.columns:
+        series = loaded[ticker].dropna()
+        cache.put(("history", ticker), (series, start, end))
+        series_by_ticker[ticker] = series
+    return series_by_ticker, failed
+
+
+def refresh_prices(tickers, start_date, end_date, cache=None, store=None, download=None, max_age=0):
+    """
+    캐시 항목이 만료되기 전에 미리 다시 불러와 저장 시각을 갱신 (prefetch 모듈에서 사용).
+    이미 캐시된 구간이 더 넓으면 그 구간까지 포함해서 불러오며, 실패 티커 dict를 반환합니다.
+    디스크 저장소의 데이터가 max_age초(기본값: 0, 항상)보다 오래되었으면 마지막 거래일을 데이터 소스에서 다시 받습니다.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    cache = cache if cache is not None else price_cache
+    if not tickers:
+        return {}
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    for ticker in tickers:
+        entry = cache.peek(("history", ticker))
+        if entry is not None:
+            start, end = min(start, entry[0][1]), max(end, entry[0][2])
+    _, failed = _load_into_cache(tickers, start, end, cache, store, download, max_age=max_age)
+    return failed
+
+
+def get_price_history(tickers, start_date, end_date, cache=None, store=None, download=None):
+    """
+    [start_date, end_date) 구간의 가격을 (가격 DataFrame, 실패 티커 dict)로 반환.
+    메모리 캐시에 티커별로 보관된 구간이 요청 구간을 포함하면 잘라서 사용하고,
+    나머지 티커만 디스크 저장소(load_prices)에서 한 번에 불러옵니다.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    cache = cache if cache is not None else price_cache
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+    series_by_ticker = {}
+    missing = []
+    load_start, load_end = start, end
+    # 데이터 소스가 차단된 동안에는 만료된 캐시 항목도 사용
+    allow_stale = source_unavailable(download)
+    for ticker in tickers:
+        entry = cache.get(("history", ticker), allow_stale=allow_stale)
+        if entry is not None and entry[1] <= start and entry[2] >= end:
+            series_by_ticker[ticker] = entry[0]
+            continue
+        missing.append(ticker)
+        if entry is not None:
+            # 이미 캐시된 구간까지 포함하도록 넓혀서 불러와 하나의 항목으로 유지
+            load_start, load_end = min(load_start, entry[1]), max(load_end, entry[2])
+
+    failed = {}
+    if missing:
+        loaded, failed = _load_into_cache(missing, load_start, load_end, cache, store, download)
+        series_by_ticker.update(loaded)
+
+    series_list = [
+        series_by_ticker[ticker][start:end - pd.Timedelta(days=1)].rename(ticker)
+        for ticker in tickers if ticker in series_by_ticker
+    ]
+    if not series_list:
+        return pd.DataFrame(), failed
+    with instrumentation.span("market_data.concat"):
+        return pd.concat(series_list, axis=1, join="outer", sort=True), failed
+
+
+def period_to_window(period, today=None):
+    """
+    yfinance 형식의 period('2d', '3mo', '1y', 'ytd' 등)를 (시작일, 종료일(미포함), 최근 봉 개수)로 변환.
+    'Nd'는 최근 N개 거래일을 뜻하므로 주말/연휴를 감안해 넉넉한 달력 구간을 잡고,
+    봉 개수로 잘라서 사용하도록 N을 함께 돌려줍니다 (그 외 단위는 None).
+    """
+    today = pd.Timestamp(today if today is not None else "today").normalize()
+    end = today + pd.Timedelta(days=1)  # 오늘 봉까지 포함
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1), end, None
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if match is None:
+        raise ValueError(f"지원하지 않는 기간 형식입니다: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return today - pd.Timedelta(days=count * 2 + 7), end, count
+    offsets = {"wk": pd.DateOffset(weeks=count), "mo": pd.DateOffset(months=count), "y": pd.DateOffset(years=count)}
+    return today - offsets[unit], end, None
+
+
+def get_price_series(ticker, period, cache=None, store=None, download=None):
+    """
+    yfinance의 period(예: '2d', '1y') 단위로 단일 티커의 가격 Series를 반환.
+    기간을 날짜 구간으로 바꿔 티커별 캐시 항목을 공유하므로, 이미 받아둔 더 긴 구간이 있으면
+    다시 다운로드하지 않고 잘라서 사용합니다.
+    데이터를 가져오지 못하면 빈 Series를 반환하여 호출 측에서 처리하도록 합니다.
+    """
+    start, end, bars = period_to_window(period)
+    prices, _ = get_price_history([ticker], start, end, cache=cache, store=store, download=download)
+    if ticker not in prices.columns:
+        return pd.Series(dtype="float64")
+    series = prices[ticker].dropna()
+    return series.tail(bars) if bars is not None else series
+
+
+def fetch_quotes(tickers, fetch, max_workers=QUOTE_MAX_WORKERS, timeout=QUOTE_TIMEOUT):
+    """
+    fetch(ticker)를 스레드 풀에서 병렬로 실행하여 ({티커: 결과}, {티커: 실패 사유})를 반환.
+    모든 티커가 요청을 넣은 시점부터 timeout초 안에 끝나야 하며 (전체 제한 시간), 그때까지 끝나지 않은 티커는
+    실행 중이든 아직 대기 중이든 실패로 처리합니다. 일부 티커가 실패해도 나머지 결과는 그대로 돌려줍니다.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    results, failed = {}, {}
+    if not tickers:
+        return results, failed
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)), thread_name_prefix="quote")
+    deadline = time.monotonic() + timeout
+    futures = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    failed[ticker] = f"시세 조회 중 오류가 발생했습니다: {e}"
+        for ticker in tickers:
+            if ticker not in results and ticker not in failed:
+                failed[ticker] = f"{timeout}초 안에 시세를 가져오지 못했습니다."
+    finally:
+        # 제한 시간을 넘긴 작업은 기다리지 않고, 아직 시작하지 않은 작업은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, failed
+
+
+def align_to_sessions(prices):
+    """
+    티커별 컬럼의 가격 DataFrame을 실제 거래일(세션)의 합집합에 맞춰 정렬.
+
+    - 어떤 티커도 거래하지 않은 날(주말, 공통 휴장일)은 행을 만들지 않음
+    - 한 시장만 휴장한 날은 해당 티커의 직전 종가를 유지 (앞 방향 채우기)
+    - 첫 거래일 이전 구간은 NaN으로 남겨, 미래 가격이 과거 날짜로 새지 않도록 함 (뒤 방향 채우기 없음)
+    날짜 정렬과 채우기는 pandas 재색인 대신 NumPy 배열 연산으로 처리합니다.
+    """
+    if prices.empty:
+        return prices
+    prices = prices.sort_index()
+    values = prices.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+
+    # 하나 이상의 티커가 실제로 거래한 날만 세션으로 남김
+    is_session = valid.any(axis=1)
+    values, valid = values[is_session], valid[is_session]
+    sessions = prices.index[is_session]
+
+    # 열마다 '마지막으로 값이 있었던 행 번호'를 누적 최댓값으로 구해 앞 방향으로 채움
+    last_valid_row = np.where(valid, np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(last_valid_row, axis=0, out=last_valid_row)
+    filled = values[np.maximum(last_valid_row, 0), np.arange(values.shape[1])]
+    filled[last_valid_row < 0] = np.nan
+
+    return pd.DataFrame(filled, index=sessions, columns=prices.columns)
@@ -0,0 +1,234 @@
+"""
+시세 데이터 소스(실시간 / 기록 / 재생) 모듈.
+
+환경 변수 MARKET_DATA_MODE로 market_data의 기본 다운로드 함수가 동작하는 방식을 정합니다.
+
+- live (기본값): yfinance를 그대로 호출
+- record: yfinance를 호출하고, 요청과 응답을 픽스처 디렉터리에 저장
+- replay: 네트워크 없이 픽스처 디렉터리의 응답만 반환 (없으면 FixtureNotFoundError)
+
+재생 시 요청과 정확히 같은 픽스처가 없으면, 같은 티커 조합(없으면 티커별)으로 기록된 가장 넓은 구간의
+응답을 요청 구간으로 잘라서 반환합니다. 페이지는 '오늘' 기준으로 구간을 정하므로, 기록한 다음 날에도 재생할 수 있습니다.
+
+재생 모드에서는 부하 테스트를 위해 지연 시간과 실패를 주입할 수 있습니다.
+주입 여부와 지연 시간은 (MARKET_DATA_SEED, 요청 내용, 같은 요청의 호출 순번)으로 정해지므로
+스레드 실행 순서와 관계없이 같은 요청 순서에는 항상 같은 결과가 나옵니다.
+
+    MARKET_DATA_FIXTURE_DIR   픽스처 디렉터리 (기본값: .cache/market_data, 저장소에 커밋되지 않음)
+    MARKET_DATA_LATENCY       요청당 지연 시간(초). '0.2' 또는 '0.1-0.5' 형식의 범위
+    MARKET_DATA_FAILURE_RATE  요청이 실패할 확률 (0~1)
+    MARKET_DATA_SEED          주입용 시드 (기본값: 0)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+MODES = ("live", "record", "replay")
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "market_data")
+
+
+class FixtureNotFoundError(LookupError):
+    """재생 모드에서 요청에 맞는 픽스처가 없을 때 발생"""
+
+
+class InjectedFailure(ConnectionError):
+    """재생 모드에서 설정한 실패율에 따라 주입된 실패"""
+
+
+def _parse_latency(value):
+    """'0.2' -> (0.2, 0.2), '0.1-0.5' -> (0.1, 0.5)"""
+    if not value:
+        return 0.0, 0.0
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+
+def request_description(tickers, kwargs):
+    """요청(티커, start/end/period 등)을 JSON으로 저장할 수 있는 dict로 변환"""
+    description = {"tickers": list(tickers)}
+    for key, value in sorted(kwargs.items()):
+        description[key] = str(pd.Timestamp(value).date()) if key in ("start", "end") and value is not None else value
+    return description
+
+
+def request_key(description):
+    return hashlib.sha1(json.dumps(description, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _unit_interval(*parts):
+    """parts로부터 결정되는 [0, 1) 구간의 값"""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+class MarketDataSource:
+    """
+    yf.download와 같은 형태로 호출되는 다운로드 함수.
+    mode에 따라 live 함수를 그대로 호출하거나, 응답을 기록하거나, 기록된 응답을 재생합니다.
+    """
+
+    def __init__(self, live, mode="live", fixture_dir=DEFAULT_FIXTURE_DIR, latency=(0.0, 0.0), failure_rate=0.0, seed=0):
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 데이터 소스 모드입니다: {mode} (가능한 값: {', '.join(MODES)})")
+        self.live = live
+        self.mode = mode
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._call_counts = {}
+        self._index = None  # 티커 -> [(설명, 키), ...] (재생 모드에서 처음 사용할 때 읽음)
+        self._frames = {}  # 키 -> 읽어 둔 응답 (재생 중 같은 픽스처를 반복해서 읽지 않도록 보관)
+
+    @classmethod
+    def from_env(cls, live):
+        return cls(
+            live,
+            mode=os.environ.get("MARKET_DATA_MODE", "live"),
+            fixture_dir=os.environ.get("MARKET_DATA_FIXTURE_DIR", DEFAULT_FIXTURE_DIR),
+            latency=_parse_latency(os.environ.get("MARKET_DATA_LATENCY")),
+            failure_rate=float(os.environ.get("MARKET_DATA_FAILURE_RATE", 0)),
+            seed=int(os.environ.get("MARKET_DATA_SEED", 0)),
+        )
+
+    def __call__(self, tickers, **kwargs):
+        if self.mode == "live":
+            return self.live(tickers, **kwargs)
+        description = request_description(tickers, kwargs)
+        key = request_key(description)
+        if self.mode == "record":
+            result = self.live(tickers, **kwargs)
+            self._save(key, description, result)
+            return result
+        self._inject(key)
+        return self._replay(key, description)
+
+    def _fixture_path(self, key, extension):
+        return os.path.join(self.fixture_dir, f"{key}.{extension}")
+
+    def _save(self, key, description, result):
+        if result is None or result.empty:
+            return
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        # 응답을 먼저 기록해야 설명(json)만 있고 응답(pkl)이 없는 픽스처가 색인에 잡히지 않음
+        _write_atomic(self._fixture_path(key, "pkl"), result.to_pickle)
+
+        def write_description(path):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(description, file, ensure_ascii=False, indent=2)
+
+        _write_atomic(self._fixture_path(key, "json"), write_description)
+        with self._lock:
+            self._index = None
+
+    def _inject(self, key):
+        """설정한 지연 시간과 실패율을 요청마다 결정적으로 적용"""
+        with self._lock:
+            call_number = self._call_counts.get(key, 0)
+            self._call_counts[key] = call_number + 1
+        low, high = self.latency
+        if high > 0:
+            time.sleep(low + (high - low) * _unit_interval(self.seed, key, call_number, "latency"))
+        if self.failure_rate > 0 and _unit_interval(self.seed, key, call_number, "failure") < self.failure_rate:
+            raise InjectedFailure("주입된 데이터 소스 장애입니다 (MARKET_DATA_FAILURE_RATE).")
+
+    def _load_index(self):
+        """기록된 픽스처 목록을 {티커: [(설명, 키), ...]} 형태로 읽음 (기록하면 다시 읽음)"""
+        with self._lock:
+            if self._index is None:
+                index = {}
+                if os.path.isdir(self.fixture_dir):
+                    for file_name in sorted(os.listdir(self.fixture_dir)):
+                        if file_name.endswith(".json"):
+                            with open(os.path.join(self.fixture_dir, file_name), encoding="utf-8") as file:
+                                description = json.load(file)
+                            for ticker in description["tickers"]:
+                                index.setdefault(ticker, []).append((description, file_name[:-5]))
+                self._index = index
+            return self._index
+
+    def _read(self, key):
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = pd.read_pickle(self._fixture_path(key, "pkl"))
+            with self._lock:
+                self._frames[key] = frame
+        return frame.copy()
+
+    def _widest_fixture(self, candidates):
+        return max((self._read(key) for _, key in candidates), key=len)
+
+    def _replay(self, key, description):
+        if key in self._frames or os.path.exists(self._fixture_path(key, "pkl")):
+            return self._read(key)
+
+        # 1) 같은 티커 조합으로 기록된 응답 중 가장 넓은 구간을 요청 구간으로 잘라서 사용
+        tickers = description["tickers"]
+        index = self._load_index()
+        same_tickers = [entry for entry in index.get(tickers[0], []) if entry[0]["tickers"] == tickers]
+        if same_tickers:
+            return _slice_to_request(self._widest_fixture(same_tickers), description)
+
+        # 2) 티커 조합이 다르면(디스크 저장소 상태에 따라 묶음이 달라짐) 티커별로 기록된 응답을 모아서 구성
+        missing = [ticker for ticker in tickers if ticker not in index]
+        if missing:
+            raise FixtureNotFoundError(
+                f"{', '.join(missing)}의 기록된 응답이 없습니다. MARKET_DATA_MODE=record로 먼저 기록해 주세요."
+            )
+        fields_by_ticker = {
+            ticker: _slice_to_request(_ticker_fields(self._widest_fixture(index[ticker]), ticker), description)
+            for ticker in tickers
+        }
+        if len(tickers) == 1:
+            return fields_by_ticker[tickers[0]]
+        combined = pd.concat(fields_by_ticker, axis=1, sort=True)  # 컬럼: (티커, 필드)
+        combined.columns = combined.columns.swaplevel(0, 1).set_names(["Price", "Ticker"])
+        return combined
+
+
+def _write_atomic(path, write):
+    """
+    write(임시 경로)로 기록한 파일을 path로 교체. 같은 요청을 여러 스레드/세션이 동시에 기록해도
+    서로의 임시 파일을 덮어쓰지 않도록 호출마다 고유한 임시 파일을 사용합니다.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _ticker_fields(frame, ticker):
+    """
+    기록된 응답에서 한 티커의 필드별 컬럼(Close 등)만 꺼내 시간대 없는 날짜 인덱스로 반환.
+    여러 티커 응답은 (필드, 티커) 멀티인덱스, 단일 티커 응답(Ticker.history)은 필드 컬럼만 가집니다.
+    """
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.xs(ticker, axis=1, level=-1)
+    if getattr(frame.index, "tz", None) is not None:
+        frame = frame.copy()
+        frame.index = frame.index.tz_localize(None).normalize()
+    return frame
+
+
+def _slice_to_request(frame, description):
+    """기록된 응답을 요청의 [start, end) 구간으로 자름 (period 요청은 그대로 반환)"""
+    start, end = description.get("start"), description.get("end")
+    if start is None and end is None:
+        return frame
+    tz = getattr(frame.index, "tz", None)
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= frame.index >= pd.Timestamp(start).tz_localize(tz)
+    if end is not None:
+        mask &= frame.index < pd.Timestamp(end).tz_localize(tz)
+    return frame[mask.to_numpy()]
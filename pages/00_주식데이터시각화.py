@@ -1,96 +1,46 @@
 import streamlit as st
-import yfinance as yf
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-
-# 1. 글로벌 시총 TOP 10 기업 티커 (2025년 6월 기준 예상, 실제 시점에 따라 변동 가능)
-top_10_tickers = [
-    "MSFT",  # Microsoft
-    "AAPL",  # Apple
-    "NVDA",  # NVIDIA
-    "GOOGL", # Alphabet (Google)
-    "AMZN",  # Amazon
-    "META",  # Meta Platforms
-    "TSLA",  # Tesla
-    "BRK-A", # Berkshire Hathaway A주
-    "LLY",   # Eli Lilly and Company
-    "JPM",   # JPMorgan Chase & Co.
-]
+import plotly.express as px
+
+import analytics
+import chart_utils
+import instrumentation
+import market_data
+import prefetch
+import price_matrix
+import ticker_universe
+
+# 1. 종목 유니버스 (data/ticker_universe.csv) 와 기본 선택 종목 (글로벌 시총 TOP 10)
+universe = ticker_universe.load_universe()
+top_10_tickers = ticker_universe.TOP_10_TICKERS
+
+# TOP 10 종목의 시세를 백그라운드에서 미리 갱신 (프로세스당 한 번만 시작됨)
+prefetch.start_background()
 
 # 2. 스트림릿 앱 제목 설정
 st.title("글로벌 시총 TOP 10 기업 주가 변화 (최근 3년)")
 st.write("yfinance를 이용하여 최근 3년간 글로벌 시총 TOP 10 기업의 주가 변화를 시각화합니다.")
 
 # 3. 데이터 로드 함수
-@st.cache_data(ttl=3600) # 데이터를 1시간(3600초) 동안 캐싱합니다.
+# 캐싱은 두 페이지가 공유하는 market_data 모듈의 메모리 캐시(1시간)와 디스크 저장소에서 처리합니다.
 def load_stock_data(tickers, start_date, end_date):
-    series_list = []
-    successful_tickers = []
-    failed_tickers = []
-
-    for ticker in tickers:
-        try:
-            df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if df.empty:
-                st.warning(f"⚠️ **{ticker}**: 해당 기간의 주가 데이터를 찾을 수 없거나 데이터가 비어 있습니다.")
-                failed_tickers.append(ticker)
-                continue
-
-            selected_column_data = None
-            
-            if 'Adj Close' in df.columns:
-                selected_column_data = df['Adj Close']
-            elif 'Close' in df.columns:
-                # 'Adj Close'가 없어 'Close' 컬럼을 사용하는 경우의 경고 메시지를 제거했습니다.
-                selected_column_data = df['Close']
-            # 멀티인덱스 컬럼 처리 (이전에 구현된 로직 유지)
-            elif isinstance(df.columns, pd.MultiIndex):
-                adj_close_col_name = None
-                close_col_name = None
-                for col_tuple in df.columns:
-                    if isinstance(col_tuple, tuple):
-                        if 'Adj Close' in col_tuple:
-                            adj_close_col_name = col_tuple
-                        if 'Close' in col_tuple:
-                            close_col_name = col_tuple
-                
-                if adj_close_col_name:
-                    selected_column_data = df[adj_close_col_name]
-                    # 멀티인덱스 컬럼에서 'Adj Close'를 찾아 사용하는 경우의 경고 메시지를 제거했습니다.
-                elif close_col_name:
-                    selected_column_data = df[close_col_name]
-                    # 멀티인덱스 컬럼에서 'Adj Close' 대신 'Close'를 찾아 사용하는 경우의 경고 메시지를 제거했습니다.
-            
-            if selected_column_data is not None and not selected_column_data.empty:
-                # Series에 티커 이름 할당 (pd.concat 시 컬럼명으로 사용)
-                selected_column_data.name = ticker
-                series_list.append(selected_column_data)
-                successful_tickers.append(ticker)
-            else:
-                st.warning(f"⚠️ **{ticker}**: 유효한 주가 데이터를 추출할 수 없습니다. 사용 가능한 컬럼: {df.columns.tolist()}")
-                failed_tickers.append(ticker)
-
-        except Exception as e:
-            st.error(f"❌ **{ticker}**: 주가 데이터를 다운로드하는 중 오류가 발생했습니다: {e}")
-            failed_tickers.append(ticker)
+    # 캐시/디스크 저장소에 이미 있는 구간은 그대로 읽고, 빠진 구간만 한 번의 요청으로 일괄 다운로드합니다.
+    combined_df, failed = market_data.get_price_history(tickers, start_date, end_date)
 
-    if failed_tickers:
-        st.error(f"다음 기업들의 데이터 로딩에 실패했습니다: **{', '.join(failed_tickers)}**")
-    
-    # 성공적으로 로드된 Series들을 하나의 DataFrame으로 합치기
-    if series_list:
-        combined_df = pd.concat(series_list, axis=1, join='outer')
-        
-        # 날짜 인덱스를 정렬 (필요시)
-        combined_df = combined_df.sort_index()
+    if market_data.source_unavailable():
+        st.info("ℹ️ 주가 데이터 서버에 일시적으로 연결할 수 없어, 마지막으로 받아 둔 데이터를 표시합니다.")
 
-        # 전체 기간 동안의 모든 날짜 인덱스를 생성하여 reindex (주말/공휴일 등 비거래일 포함)
-        all_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-        combined_df = combined_df.reindex(all_dates)
+    for ticker, reason in failed.items():
+        st.warning(f"⚠️ **{ticker}**: {reason}")
 
-        # NaN 값 처리: 앞의 값으로 채우고, 앞의 값이 없으면 뒤의 값으로 채움
-        combined_df = combined_df.fillna(method='ffill').fillna(method='bfill')
+    if failed:
+        st.error(f"다음 기업들의 데이터 로딩에 실패했습니다: **{', '.join(failed)}**")
+    
+    if not combined_df.empty:
+        # 실제 거래일(모든 티커의 거래일 합집합) 기준으로 정렬합니다.
+        # 한 시장만 휴장한 날은 직전 종가를 유지하고, 첫 거래일 이전은 비워 두어 미래 가격이 과거로 채워지지 않게 합니다.
+        combined_df = market_data.align_to_sessions(combined_df)
 
         # 처음 시작일부터 데이터가 없는 기업의 경우를 대비하여 모든 NaN 컬럼 제거
         combined_df = combined_df.dropna(axis=1, how='all')
@@ -105,53 +55,145 @@ end_date = pd.to_datetime('today').strftime('%Y-%m-%d')
 start_date = (pd.to_datetime('today') - pd.DateOffset(years=3)).strftime('%Y-%m-%d')
 
 st.sidebar.header("날짜 및 기업 선택")
+# 전체 유니버스를 선택지로 나열하지 않고, 검색어에 맞는 종목과 이미 선택한 종목만 선택지로 보여줍니다.
+# 가격은 아래에서 실제로 선택한 종목만 불러옵니다.
+if "selected_tickers" not in st.session_state:
+    st.session_state["selected_tickers"] = list(top_10_tickers) # 기본적으로 TOP 10 선택
+search_query = st.sidebar.text_input(
+    "기업 검색 (티커 또는 이름)",
+    placeholder="예: AAPL, Apple, 삼성",
+    help=f"{len(universe):,}개 종목 중에서 검색합니다."
+)
+search_results = universe.search(search_query) if search_query else list(top_10_tickers)
 selected_tickers = st.sidebar.multiselect(
     "주가 변화를 보고 싶은 기업을 선택하세요:",
-    options=top_10_tickers,
-    default=top_10_tickers # 기본적으로 모두 선택
+    options=list(dict.fromkeys(st.session_state["selected_tickers"] + search_results)),
+    format_func=universe.label,
+    key="selected_tickers"
+)
+if search_query and not search_results:
+    st.sidebar.caption("검색 결과가 없습니다.")
+
+# 차트 표시 설정: 가로 해상도에 맞춰 포인트 수를 제한하여 브라우저로 보내는 데이터 양을 줄입니다.
+st.sidebar.subheader("차트 표시 설정")
+chart_resolution = st.sidebar.select_slider(
+    "차트 해상도 (기업별 최대 포인트 수)",
+    options=[500, 1000, 1500, 2000, 3000],
+    value=1000
+)
+downsample_labels = {"lttb": "LTTB (모양 유지)", "minmax": "구간별 최소/최대 (급등락 유지)"}
+downsample_method = st.sidebar.radio(
+    "다운샘플링 방식",
+    chart_utils.DOWNSAMPLE_METHODS,
+    format_func=downsample_labels.get
 )
+compact_mode = st.sidebar.checkbox(
+    "float32 가격 행렬 모드",
+    value=False,
+    help="정규화한 가격을 float32 행렬로 한 번만 계산해 재사용하고, 차트에는 복사 없는 뷰를 넘깁니다. "
+         "원본 가격은 그대로 보관되므로 전체 메모리 사용량은 줄지 않습니다."
+)
+rolling_mode = st.sidebar.checkbox(
+    "롤링 분석 모드",
+    value=False,
+    help="N일 롤링 수익률, 연환산 변동성, 수익률 상관계수, 최대 낙폭을 함께 표시합니다."
+)
+if rolling_mode:
+    rolling_window = st.sidebar.slider("롤링 창 크기 (거래일)", min_value=5, max_value=252, value=20)
 
 # 5. 데이터 로드
 if selected_tickers:
-    stock_data = load_stock_data(selected_tickers, start_date, end_date)
+    with instrumentation.span("chart.fetch"):
+        stock_data = load_stock_data(selected_tickers, start_date, end_date)
 
     if not stock_data.empty:
+        # 표시 기간을 좁히면(확대) 해당 구간의 포인트 수가 해상도 이하가 되는 순간부터 원본 해상도로 표시됩니다.
+        view_start, view_end = st.sidebar.slider(
+            "표시 기간 (확대)",
+            min_value=stock_data.index[0].date(),
+            max_value=stock_data.index[-1].date(),
+            value=(stock_data.index[0].date(), stock_data.index[-1].date())
+        )
+        view_start, view_end = pd.Timestamp(view_start), pd.Timestamp(view_end)
+
         # 6. 주가 변화율 계산 (선택 사항: 정규화된 주가)
-        # 데이터프레임이 비어있지 않고, 첫 행이 모두 NaN이 아닌지 확인
-        if not stock_data.iloc[0].isnull().all():
-            normalized_stock_data = stock_data / stock_data.iloc[0] * 100
-            st.subheader("기업별 주가 변화율 (최초일 기준 100% 정규화)")
-            fig = go.Figure()
-            for col in normalized_stock_data.columns:
-                fig.add_trace(go.Scatter(x=normalized_stock_data.index, y=normalized_stock_data[col], mode='lines', name=col))
-
-            fig.update_layout(
-                title="최근 3년간 글로벌 시총 TOP 10 기업 주가 변화율",
+        # 기업별 첫 거래일 종가를 기준값으로 사용 (조회 기간 중 상장한 기업은 상장일 기준)
+        with instrumentation.span("chart.transform"):
+            if compact_mode:
+                # 가격 데이터가 같으면 캐싱된 float32 행렬을 재사용하고, 차트에는 복사 없는 뷰를 넘깁니다.
+                raw_prices, normalized_prices = price_matrix.cached_matrices(stock_data)
+                has_base_prices = not np.isnan(normalized_prices.values).all()
+                raw_view = raw_prices.slice_dates(view_start, view_end)
+                normalized_view = normalized_prices.slice_dates(view_start, view_end)
+            else:
+                base_prices = stock_data.bfill().iloc[0]
+                has_base_prices = not base_prices.isnull().all()
+                raw_view = stock_data.loc[view_start:view_end]
+                normalized_view = (stock_data / base_prices * 100).loc[view_start:view_end]
+
+        with instrumentation.span("chart.render"):
+            if has_base_prices:
+                st.subheader("기업별 주가 변화율 (최초일 기준 100% 정규화)")
+                # 티커별 trace는 데이터가 바뀌지 않는 한 캐싱된 것을 재사용하고, Figure는 조립만 합니다.
+                fig = chart_utils.build_line_figure(normalized_view, "normalized", dict(
+                    title="최근 3년간 글로벌 시총 TOP 10 기업 주가 변화율",
+                    xaxis_title="날짜",
+                    yaxis_title="주가 변화율 (%)",
+                    hovermode="x unified",
+                    legend_title="기업",
+                    height=600
+                ), max_points=chart_resolution, method=downsample_method)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.warning("선택된 기업 중 유효한 주가 변화율을 계산할 수 있는 데이터가 없습니다. 주가 데이터가 너무 짧거나, 지정된 기간에 거래일이 없습니다.")
+
+            st.subheader("원본 주가 데이터")
+            fig_raw = chart_utils.build_line_figure(raw_view, "raw", dict(
+                title="최근 3년간 글로벌 시총 TOP 10 기업 원본 주가",
                 xaxis_title="날짜",
-                yaxis_title="주가 변화율 (%)",
+                yaxis_title="주가 (USD)",
                 hovermode="x unified",
                 legend_title="기업",
                 height=600
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("선택된 기업 중 유효한 주가 변화율을 계산할 수 있는 데이터가 없습니다. 주가 데이터가 너무 짧거나, 지정된 기간에 거래일이 없습니다.")
-
-        st.subheader("원본 주가 데이터")
-        fig_raw = go.Figure()
-        for col in stock_data.columns:
-            fig_raw.add_trace(go.Scatter(x=stock_data.index, y=stock_data[col], mode='lines', name=col))
-
-        fig_raw.update_layout(
-            title="최근 3년간 글로벌 시총 TOP 10 기업 원본 주가",
-            xaxis_title="날짜",
-            yaxis_title="주가 (USD)",
-            hovermode="x unified",
-            legend_title="기업",
-            height=600
-        )
-        st.plotly_chart(fig_raw, use_container_width=True)
-
+            ), max_points=chart_resolution, method=downsample_method)
+            st.plotly_chart(fig_raw, use_container_width=True)
+
+        # 7. 롤링 분석: 전체 기간에 대해 한 번 계산(창 크기별 캐싱)한 뒤 표시 기간만 잘라 보여줍니다.
+        if rolling_mode:
+            with instrumentation.span("chart.transform.rolling"):
+                # stock_data는 한 시장만 휴장한 날을 직전 종가로 채웠으므로, 휴장일이 0% 수익률로 계산되지 않도록
+                # 실제로 거래한 날의 종가만 같은 날짜/티커 축에 놓고 분석합니다 (공용 가격 캐시에서 읽음).
+                closes, _ = market_data.get_price_history(list(stock_data.columns), start_date, end_date)
+                closes = closes.reindex(index=stock_data.index, columns=stock_data.columns)
+                rolling = analytics.rolling_analytics(closes, rolling_window)
+            with instrumentation.span("chart.render.rolling"):
+                chart_layout = dict(xaxis_title="날짜", hovermode="x unified", legend_title="기업", height=500)
+
+                st.subheader(f"롤링 분석 ({rolling_window}거래일)")
+                fig_returns = chart_utils.build_line_figure(
+                    rolling.returns.loc[view_start:view_end] * 100, f"rolling_return_{rolling_window}",
+                    dict(chart_layout, title=f"{rolling_window}거래일 롤링 수익률", yaxis_title="수익률 (%)"),
+                    max_points=chart_resolution, method=downsample_method
+                )
+                st.plotly_chart(fig_returns, use_container_width=True)
+
+                fig_volatility = chart_utils.build_line_figure(
+                    rolling.volatility.loc[view_start:view_end] * 100, f"rolling_volatility_{rolling_window}",
+                    dict(chart_layout, title=f"{rolling_window}거래일 롤링 변동성 (연환산)", yaxis_title="변동성 (%)"),
+                    max_points=chart_resolution, method=downsample_method
+                )
+                st.plotly_chart(fig_volatility, use_container_width=True)
+
+                col_corr, col_mdd = st.columns([3, 2])
+                with col_corr:
+                    fig_corr = px.imshow(
+                        rolling.correlation, zmin=-1, zmax=1, color_continuous_scale="RdBu_r",
+                        title="일별 수익률 상관계수 (전체 기간)"
+                    )
+                    st.plotly_chart(fig_corr, use_container_width=True)
+                with col_mdd:
+                    st.write("**기업별 최대 낙폭 (전체 기간)**")
+                    st.dataframe(rolling.max_drawdown.sort_values().to_frame().style.format("{:.2%}"))
 
         st.subheader("데이터 미리보기")
         st.dataframe(stock_data.tail()) # 최신 데이터 몇 개 보여주기
@@ -160,3 +202,6 @@ if selected_tickers:
         st.warning("선택된 기업에 대한 주가 데이터를 가져오지 못했습니다. 목록에서 다른 기업을 선택해 주세요.")
 else:
     st.info("시각화할 기업을 선택해주세요.")
+
+# 성능 계측: METRICS_EXPORT_PATH로 내보내고, 주소에 ?debug=1이 있으면 사이드바에 표시
+instrumentation.render_debug_sidebar()
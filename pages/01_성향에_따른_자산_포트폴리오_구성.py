@@ -1,36 +1,31 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import yfinance as yf
-import datetime
 import numpy as np
 
+import allocation
+import backtest
+import instrumentation
+import market_data
+import prefetch
+import recommendations
+import share_optimizer
+
 # --- 앱 설정 (가장 먼저 위치해야 함) ---
 st.set_page_config(layout="wide", page_title="AI 투자 도우미")
 
-# --- 캐싱 함수 정의 (st.cache_data 사용) ---
-@st.cache_data(ttl=3600) # 1시간마다 캐시 갱신
+# 추천 종목의 시세를 백그라운드에서 미리 갱신 (프로세스당 한 번만 시작됨)
+prefetch.start_background()
+
+# --- 가격 조회 함수 정의 (캐싱은 공용 market_data 모듈에서 처리) ---
 def get_stock_data(ticker, period="1y"):
     """
-    yfinance를 사용하여 주식/ETF 데이터를 가져오는 함수.
-    'Adj Close' 데이터가 없을 경우 'Close' 데이터를 사용하고,
+    공용 시세 모듈(market_data)을 통해 주식/ETF 데이터를 period 기간만큼 가져오는 함수.
+    'Adj Close'/'Close' 컬럼 선택과 캐싱은 차트 페이지와 같은 로직을 공유하며,
+    같은 티커의 '1d'/'2d'/'1y' 요청은 하나의 캐시 데이터를 잘라서 사용합니다.
     데이터가 없으면 안전하게 빈 Series를 반환하여 호출 측에서 처리하도록 함.
     """
-    try:
-        data = yf.download(ticker, period="1d", progress=False)
-
-        if data.empty:
-            return pd.Series(dtype='float64') # 빈 Series 반환
-
-        if 'Adj Close' in data.columns and not data['Adj Close'].empty:
-            return data['Adj Close']
-        elif 'Close' in data.columns and not data['Close'].empty:
-            return data['Close']
-        else:
-            return pd.Series(dtype='float64') # 유효한 컬럼이 없으면 빈 Series 반환
-
-    except Exception as e:
-        return pd.Series(dtype='float64')
+    return market_data.get_price_series(ticker, period=period)
 
 # --- 앱 본문 시작 ---
 st.title("💰 AI 투자 도우미: 맞춤형 자산 포트폴리오 구성")
@@ -84,43 +79,11 @@ if selected_section == "시작하기 & 포트폴리오 설정":
     if not selected_assets:
         st.warning("포트폴리오에 포함할 자산을 1개 이상 선택해주세요.")
     else:
-        portfolio = {}
-        base_allocations = {
-            "CMA/파킹통장 (현금)": 15,
-            "채권": 30,
-            "금": 10,
-            "적금": 15,
-            "ETF": 20,
-            "주식": 5,
-            "원자재": 5
-        }
-
-        for asset in selected_assets:
-            if asset in base_allocations:
-                base_percent = base_allocations[asset]
-                if asset in ["CMA/파킹통장 (현금)", "채권", "적금"]:
-                    portfolio[asset] = base_percent + (50 - risk_tolerance) * 0.4
-                elif asset in ["ETF", "주식", "원자재"]:
-                    portfolio[asset] = base_percent + (risk_tolerance - 50) * 0.4
-                else: # 금
-                    portfolio[asset] = base_percent
-
-        all_possible_assets = ["금", "채권", "CMA/파킹통장 (현금)", "적금", "ETF", "주식", "원자재"]
-        for asset_name in all_possible_assets:
-            if asset_name not in selected_assets:
-                portfolio[asset_name] = 0
-            elif asset_name not in portfolio:
-                portfolio[asset_name] = 0
-
-        total_percentage = sum(portfolio.values())
-        if total_percentage > 0:
-            for asset, percentage in portfolio.items():
-                if percentage < 0:
-                    portfolio[asset] = 0
-                portfolio[asset] = (portfolio[asset] / total_percentage) * 100
-        else:
+        # 투자 성향과 선택한 자산군에 따른 비율 계산 (allocation 모듈에서 벡터 연산으로 처리)
+        with instrumentation.span("portfolio.transform.allocate"):
+            portfolio = allocation.allocate(risk_tolerance, selected_assets)
+        if sum(portfolio.values()) <= 0:
             st.warning("선택된 자산으로 포트폴리오를 구성할 수 없습니다. 다른 자산을 선택해보세요.")
-            portfolio = {asset: 0 for asset in selected_assets}
 
         st.session_state['portfolio_allocations'] = portfolio # 계산된 포트폴리오 저장
 
@@ -133,12 +96,13 @@ if selected_section == "시작하기 & 포트폴리오 설정":
             df_portfolio = df_portfolio[df_portfolio['비율'] > 0.01]
 
             if not df_portfolio.empty:
-                fig = px.pie(df_portfolio, values='비율', names='자산',
-                             title='<b>나의 맞춤형 자산 포트폴리오 구성</b>',
-                             hole=0.4
-                )
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig, use_container_width=True)
+                with instrumentation.span("portfolio.render.pie"):
+                    fig = px.pie(df_portfolio, values='비율', names='자산',
+                                 title='<b>나의 맞춤형 자산 포트폴리오 구성</b>',
+                                 hole=0.4
+                    )
+                    fig.update_traces(textposition='inside', textinfo='percent+label')
+                    st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("선택된 자산 비중이 너무 작아 차트를 그릴 수 없습니다. 다른 자산을 선택해주세요.")
 
@@ -147,75 +111,22 @@ if selected_section == "시작하기 & 포트폴리오 설정":
     st.markdown("### 📈 추천 종목 및 ETF")
     st.markdown("선택하신 자산별로 추천하는 종목 또는 ETF입니다. 현재 가격은 `yfinance`를 통해 조회됩니다. 실제 투자는 신중하게 결정해주세요.")
 
-    asset_recommendations = {
-        "금": {
-            "종목": {
-                "SPDR Gold Shares (GLD)": "GLD",
-                "iShares Gold Trust (IAU)": "IAU",
-                "KODEX 골드선물(H)": "132030.KS",
-                "KRX 금 시장": "N/A"
-            },
-            "설명": "금은 인플레이션 헤지 및 안전자산으로 선호됩니다. 달러 가치와 반대로 움직이는 경향이 있습니다. **KRX 금 시장**을 통해 실물 금에 투자하거나, **금 ETF**를 통해 간접 투자할 수 있습니다."
-        },
-        "채권": {
-            "설명": "채권은 주식에 비해 안정적인 수익을 제공하며, 경기 침체 시 가치가 상승할 수 있습니다. 금리 변동에 민감합니다. 투자 성향에 따라 다양한 채권을 고려할 수 있습니다. **국고채**는 정부가 발행하여 안정성이 높고, **회사채**는 기업이 발행하여 수익률이 높지만 신용 위험이 있습니다. 만기에 따라 **단기채**, **중장기채**, **장기채**로 구분됩니다.",
-            "세부종목": {
-                "단기채 (안정적, 낮은 수익률)": {
-                    "설명": "만기가 짧아 금리 변동에 덜 민감하고 안정적입니다. 단기 자금 운용에 적합합니다.",
-                    "종목": {"KOSEF 단기자금": "123530.KS", "KBSTAR 국고채30년액티브": "306200.KS"}
-                },
-                "중장기채 (중간 위험, 중간 수익률)": {
-                    "설명": "금리 변동에 어느 정도 영향을 받지만, 장기채보다는 변동성이 작습니다.",
-                    "종목": {"KODEX 국고채3년": "114260.KS", "TIGER 국채10년": "148070.KS"}
-                },
-                "장기채 (공격적, 높은 변동성)": {
-                    "설명": "만기가 길어 금리 변동에 매우 민감하여 변동성이 크지만, 금리 하락 시 높은 수익률을 기대할 수 있습니다. 포트폴리오 분산에 활용됩니다.",
-                    "종목": {"iShares 20+ Year Treasury Bond ETF (TLT)": "TLT", "KODEX 미국채10년선물(H)": "308620.KS"}
-                }
-            }
-        },
-        "CMA/파킹통장 (현금)": {
-            "종목": {},
-            "설명": "단기 여유자금을 보관하며, 비교적 높은 금리의 이자를 매일 또는 매주 받을 수 있는 상품입니다. 비상 자금으로 활용하기 좋습니다. **가장 높은 금리를 비교하여 선택하는 것이 중요합니다.**"
-        },
-        "적금": {
-            "종목": {},
-            "설명": "정해진 기간 동안 꾸준히 저축하며, 확정된 금리 수익을 얻을 수 있는 안전한 상품입니다. 목돈 마련에 유용합니다. **은행별 최고 금리를 비교하여 선택하는 것이 중요합니다.**"
-        },
-        "ETF": {
-            "종목": {
-                "KODEX 미국S&P500TR": "379810.KS",
-                "TIGER 미국나스닥100": "133690.KS",
-                "KODEX 미국나스닥100TR": "395380.KS",
-                "SOL 미국배당다우존스": "446860.KS",
-                "ACE 미국배당다우존스": "449170.KS"
-            },
-            "특성": {
-                "KODEX 미국S&P500TR": "성장형",
-                "TIGER 미국나스닥100": "성장형",
-                "KODEX 미국나스닥100TR": "성장형",
-                "SOL 미국배당다우존스": "안정형",
-                "ACE 미국배당다우존스": "안정형"
-            },
-            "설명": "다양한 자산에 분산 투자하는 펀드를 주식처럼 거래할 수 있습니다. 특정 지수, 산업, 국가에 투자하여 분산 효과를 누릴 수 있습니다. **미국 주요 지수(S&P 500, 나스닥 100) 추종 ETF와 배당 성장 ETF(SCHD 유사)는 장기 투자에 적합합니다.**"
-        },
-        "주식": {
-            "종목": {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "네이버": "035420.KS", "카카오": "035720.KS"},
-            "설명": "개별 기업의 성장에 직접 투자하여 높은 수익을 추구할 수 있으나, 변동성이 매우 큽니다. 기업 분석과 시장 상황에 대한 이해가 필수적입니다."
-        },
-        "원자재": {
-            "종목": {
-                "United States Oil Fund (USO)": "USO",
-                "Invesco DB Commodity Index Tracking Fund (DBC)": "DBC",
-                "Aberdeen Standard Physical Platinum Shares ETF (PPLT)": "PPLT",
-                "KODEX 구리선물(H)": "226340.KS"
-            },
-            "설명": "원유, 구리, 곡물, 귀금속 등 실물 자산에 투자합니다. 글로벌 경제 상황이나 공급망 이슈에 따라 가격 변동성이 큽니다. 포트폴리오의 분산 효과를 높이는 데 활용될 수 있습니다."
-        }
-    }
+    asset_recommendations = recommendations.ASSET_RECOMMENDATIONS
 
     # selected_assets가 없는 경우를 대비하여 체크
     if 'selected_assets' in st.session_state and st.session_state['selected_assets']:
+        # 화면에 표시할 모든 종목의 시세를 먼저 병렬로 한 번에 조회 (가장 느린 종목만큼만 기다림)
+        quote_tickers = []
+        for asset in st.session_state['selected_assets']:
+            asset_info = asset_recommendations.get(asset, {})
+            for bond_info in asset_info.get('세부종목', {}).values():
+                quote_tickers.extend(bond_info['종목'].values())
+            quote_tickers.extend(ticker for ticker in asset_info.get('종목', {}).values() if ticker != "N/A")
+        with instrumentation.span("portfolio.fetch.quotes"):
+            stock_quotes, _ = market_data.fetch_quotes(quote_tickers, lambda ticker: get_stock_data(ticker, period="2d"))
+        if market_data.source_unavailable():
+            st.info("ℹ️ 시세 서버에 일시적으로 연결할 수 없어, 마지막으로 받아 둔 가격을 표시합니다.")
+
         for asset in st.session_state['selected_assets']:
             if asset in asset_recommendations:
                 st.markdown(f"#### ➡️ {asset}")
@@ -240,7 +151,7 @@ if selected_section == "시작하기 & 포트폴리오 설정":
                             for name, ticker in bond_info['종목'].items():
                                 col1, col2 = st.columns([0.5, 0.5])
                                 col1.write(f"- **{name}**")
-                                stock_data_series = get_stock_data(ticker, period="2d")
+                                stock_data_series = stock_quotes.get(ticker, pd.Series(dtype='float64'))
                                 if not stock_data_series.empty and len(stock_data_series) >= 1 and pd.api.types.is_numeric_dtype(stock_data_series):
                                     current_price = stock_data_series.iloc[-1]
                                     if len(stock_data_series) > 1 and pd.api.types.is_numeric_dtype(stock_data_series.iloc[-2]):
@@ -267,7 +178,7 @@ if selected_section == "시작하기 & 포트폴리오 설정":
                             if ticker != "N/A":
                                 col1, col2 = st.columns([0.5, 0.5])
                                 col1.write(f"- **{name}**")
-                                stock_data_series = get_stock_data(ticker, period="2d")
+                                stock_data_series = stock_quotes.get(ticker, pd.Series(dtype='float64'))
 
                                 if not stock_data_series.empty and len(stock_data_series) >= 1 and pd.api.types.is_numeric_dtype(stock_data_series):
                                     current_price = stock_data_series.iloc[-1]
@@ -322,73 +233,8 @@ elif selected_section == "💸 월별 투자 가이드":
     selected_bond_types = {} # 채권 유형
     selected_etf_items = {} # ETF 종목과 티커
 
-    # 월별 가이드 섹션에서도 asset_recommendations 정의 (재사용을 위해)
-    asset_recommendations_for_monthly_guide = {
-        "금": {
-            "종목": {
-                "SPDR Gold Shares (GLD)": "GLD",
-                "iShares Gold Trust (IAU)": "IAU",
-                "KODEX 골드선물(H)": "132030.KS",
-                "KRX 금 시장": "N/A"
-            },
-            "설명": "금은 인플레이션 헤지 및 안전자산으로 선호됩니다."
-        },
-        "채권": {
-            "설명": "채권은 주식에 비해 안정적인 수익을 제공합니다.",
-            "세부종목": {
-                "단기채 (안정적, 낮은 수익률)": {
-                    "설명": "만기가 짧아 금리 변동에 덜 민감하고 안정적입니다.",
-                    "종목": {"KOSEF 단기자금": "123530.KS", "KBSTAR 국고채30년액티브": "306200.KS"}
-                },
-                "중장기채 (중간 위험, 중간 수익률)": {
-                    "설명": "금리 변동에 어느 정도 영향을 받습니다.",
-                    "종목": {"KODEX 국고채3년": "114260.KS", "TIGER 국채10년": "148070.KS"}
-                },
-                "장기채 (공격적, 높은 변동성)": {
-                    "설명": "만기가 길어 금리 변동에 매우 민감합니다.",
-                    "종목": {"iShares 20+ Year Treasury Bond ETF (TLT)": "TLT", "KODEX 미국채10년선물(H)": "308620.KS"}
-                }
-            }
-        },
-        "CMA/파킹통장 (현금)": {
-            "종목": {},
-            "설명": "단기 여유자금을 보관하며, 비교적 높은 금리의 이자를 매일 또는 매주 받을 수 있는 상품입니다."
-        },
-        "적금": {
-            "종목": {},
-            "설명": "정해진 기간 동안 꾸준히 저축하며, 확정된 금리 수익을 얻을 수 있는 안전한 상품입니다."
-        },
-        "ETF": {
-            "종목": {
-                "KODEX 미국S&P500TR": "379810.KS",
-                "TIGER 미국나스닥100": "133690.KS",
-                "KODEX 미국나스닥100TR": "395380.KS",
-                "SOL 미국배당다우존스": "446860.KS",
-                "ACE 미국배당다우존스": "449170.KS"
-            },
-            "특성": {
-                "KODEX 미국S&P500TR": "성장형",
-                "TIGER 미국나스닥100": "성장형",
-                "KODEX 미국나스닥100TR": "성장형",
-                "SOL 미국배당다우존스": "안정형",
-                "ACE 미국배당다우존스": "안정형"
-            },
-            "설명": "다양한 자산에 분산 투자하는 펀드를 주식처럼 거래할 수 있습니다."
-        },
-        "주식": {
-            "종목": {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "네이버": "035420.KS", "카카오": "035720.KS"},
-            "설명": "개별 기업의 성장에 직접 투자하여 높은 수익을 추구할 수 있으나, 변동성이 매우 큽니다."
-        },
-        "원자재": {
-            "종목": {
-                "United States Oil Fund (USO)": "USO",
-                "Invesco DB Commodity Index Tracking Fund (DBC)": "DBC",
-                "Aberdeen Standard Physical Platinum Shares ETF (PPLT)": "PPLT",
-                "KODEX 구리선물(H)": "226340.KS"
-            },
-            "설명": "원유, 구리, 곡물, 귀금속 등 실물 자산에 투자합니다."
-        }
-    }
+    # 월별 가이드 섹션의 추천 목록 (설명이 짧은 버전, recommendations 모듈에서 공유)
+    asset_recommendations_for_monthly_guide = recommendations.MONTHLY_GUIDE_RECOMMENDATIONS
 
 
     for asset_type in selected_assets:
@@ -528,14 +374,40 @@ elif selected_section == "💸 월별 투자 가이드":
             st.subheader("💡 당신의 월별 투자 플랜")
             
             tickers_for_price_check = {v for k, v in selected_portfolio_items.items() if k not in selected_etf_items}
+            with instrumentation.span("portfolio.fetch.prices"):
+                price_quotes, _ = market_data.fetch_quotes(tickers_for_price_check, lambda ticker: get_stock_data(ticker, period="1d"))
             current_prices_cache = {}
             for ticker in tickers_for_price_check:
-                price_series = get_stock_data(ticker, period="1d")
+                price_series = price_quotes.get(ticker, pd.Series(dtype='float64'))
                 if not price_series.empty:
                     current_prices_cache[ticker] = price_series.iloc[-1]
                 else:
                     current_prices_cache[ticker] = None
 
+            # 종목을 직접 구매하는 자산군(금, 주식, 원자재 등)은 자산군을 통틀어 정수 주식 수를 한 번에 계산
+            # (자산군/종목별로 따로 내림하면 남는 금액이 커지므로, 남은 금액을 다른 종목 구매에 활용)
+            share_plan_names, share_plan_prices, share_plan_targets = [], [], []
+            share_plan_budget = 0
+            for asset, percentage in portfolio.items():
+                if percentage <= 0.01 or asset in ["CMA/파킹통장 (현금)", "적금", "채권", "ETF"] or asset not in asset_recommendations_for_monthly_guide:
+                    continue
+                priced_items = {
+                    rec_name: current_prices_cache[rec_ticker]
+                    for rec_name, rec_ticker in asset_recommendations_for_monthly_guide[asset]['종목'].items()
+                    if selected_portfolio_items.get(rec_name) == rec_ticker and current_prices_cache.get(rec_ticker) is not None
+                }
+                if priced_items:
+                    asset_amount = monthly_investment * (percentage / 100)
+                    share_plan_budget += asset_amount
+                    for name, price in priced_items.items():
+                        share_plan_names.append(name)
+                        share_plan_prices.append(float(price))
+                        share_plan_targets.append(asset_amount / len(priced_items))
+
+            with instrumentation.span("portfolio.transform.shares"):
+                shares, spent, share_plan_leftover = share_optimizer.optimize_shares(share_plan_budget, share_plan_targets, share_plan_prices)
+            share_plan = {name: (int(num_shares), float(amount)) for name, num_shares, amount in zip(share_plan_names, shares, spent)}
+
             total_invested_amount = 0
 
             st.markdown(f"#### 총 월 투자 금액: **{monthly_investment:,.0f}원**")
@@ -552,37 +424,11 @@ elif selected_section == "💸 월별 투자 가이드":
                     elif asset == "채권":
                         if selected_bond_types:
                             st.write(f"**추천 채권 유형별 구매 금액:**")
-                            bond_type_allocations = {}
-                            
-                            short_term_weight = 1
-                            mid_long_term_weight = 1
-                            long_term_weight = 1
-
-                            if risk_tolerance < 50:
-                                short_term_weight += (50 - risk_tolerance) * 0.04
-                                long_term_weight -= (50 - risk_tolerance) * 0.04
-                            elif risk_tolerance > 50:
-                                long_term_weight += (risk_tolerance - 50) * 0.04
-                                short_term_weight -= (risk_tolerance - 50) * 0.04
-                            
-                            short_term_weight = max(0.1, short_term_weight)
-                            mid_long_term_weight = max(0.1, mid_long_term_weight)
-                            long_term_weight = max(0.1, long_term_weight)
-
-                            total_weight = 0
-                            if "단기채 (안정적, 낮은 수익률)" in selected_bond_types:
-                                bond_type_allocations["단기채 (안정적, 낮은 수익률)"] = short_term_weight
-                                total_weight += short_term_weight
-                            if "중장기채 (중간 위험, 중간 수익률)" in selected_bond_types:
-                                bond_type_allocations["중장기채 (중간 위험, 중간 수익률)"] = mid_long_term_weight
-                                total_weight += mid_long_term_weight
-                            if "장기채 (공격적, 높은 변동성)" in selected_bond_types:
-                                bond_type_allocations["장기채 (공격적, 높은 변동성)"] = long_term_weight
-                                total_weight += long_term_weight
-
-                            if total_weight > 0:
+                            bond_type_allocations = allocation.bond_type_split(risk_tolerance, selected_bond_types)
+
+                            if bond_type_allocations:
                                 for bond_type_name, weight in bond_type_allocations.items():
-                                    recommended_bond_amount = asset_amount * (weight / total_weight)
+                                    recommended_bond_amount = asset_amount * weight
                                     st.write(f"- **{bond_type_name}**: 약 **{recommended_bond_amount:,.0f}원** 투자")
                             else:
                                 st.write("- 선택하신 채권 유형에 대한 비중을 설정할 수 없습니다.")
@@ -592,39 +438,15 @@ elif selected_section == "💸 월별 투자 가이드":
                     elif asset == "ETF":
                         if selected_etf_items:
                             st.write(f"**추천 ETF 종목별 구매 금액:**")
-                            etf_allocations = {}
-                            
                             etf_properties = asset_recommendations_for_monthly_guide["ETF"]["특성"]
-                            
-                            stability_weight = 1
-                            growth_weight = 1
-
-                            if risk_tolerance < 50:
-                                stability_weight += (50 - risk_tolerance) * 0.05
-                                growth_weight -= (50 - risk_tolerance) * 0.05
-                            elif risk_tolerance > 50:
-                                growth_weight += (risk_tolerance - 50) * 0.05
-                                stability_weight -= (risk_tolerance - 50) * 0.05
-                            
-                            stability_weight = max(0.1, stability_weight)
-                            growth_weight = max(0.1, growth_weight)
-
-                            total_etf_weight = 0
-                            for etf_name in selected_etf_items:
-                                etf_type = etf_properties.get(etf_name, "기타")
-                                
-                                if etf_type == "안정형":
-                                    etf_allocations[etf_name] = stability_weight
-                                elif etf_type == "성장형":
-                                    etf_allocations[etf_name] = growth_weight
-                                else:
-                                    etf_allocations[etf_name] = 1 
-                                
-                                total_etf_weight += etf_allocations[etf_name]
-                            
-                            if total_etf_weight > 0:
+                            etf_allocations = allocation.etf_item_split(
+                                risk_tolerance,
+                                {etf_name: etf_properties.get(etf_name, "기타") for etf_name in selected_etf_items}
+                            )
+
+                            if etf_allocations:
                                 for etf_name, weight in etf_allocations.items():
-                                    recommended_etf_amount = asset_amount * (weight / total_etf_weight)
+                                    recommended_etf_amount = asset_amount * weight
                                     st.write(f"- **{etf_name}**: 약 **{recommended_etf_amount:,.0f}원** 투자")
                             else:
                                 st.write("- 선택하신 ETF 종목에 대한 비중을 설정할 수 없습니다.")
@@ -648,30 +470,113 @@ elif selected_section == "💸 월별 투자 가이드":
                             }
 
                             if valid_items_with_prices:
-                                num_valid_items = len(valid_items_with_prices)
-                                if num_valid_items > 0:
-                                    amount_per_valid_item = asset_amount / num_valid_items
-                                    remaining_amount_for_asset = asset_amount
-                                    
-                                    for name, price in valid_items_with_prices.items():
-                                        if isinstance(price, (int, float)):
-                                            num_shares_raw = amount_per_valid_item / price
-                                            num_shares_scalar = np.floor(num_shares_raw).item()
-
-                                            if num_shares_scalar > 0:
-                                                purchase_amount = num_shares_scalar * price
-                                                st.write(f"- **{name}**: 약 **{float(purchase_amount):,.0f}원** ({int(num_shares_scalar)}주/개 구매 가능)")
-                                                remaining_amount_for_asset -= purchase_amount
-                                            else:
-                                                st.write(f"- **{name}**: **{float(price):,.0f}원** (1주/개 구매 금액) - 현재 배분 금액으로는 1주/개 구매 어려움.")
-                                            
-                                    if remaining_amount_for_asset > 0.01:
-                                        st.write(f"*{asset}군 내 남은 금액: {remaining_amount_for_asset:,.0f}원 (소수점 이하 또는 1주/개 미만으로 남을 수 있습니다.)*")
-                                else: 
-                                    st.write(f"- {asset}군 내 선택하신 모든 종목의 현재가 정보를 가져올 수 없어 정확한 금액 산출이 어렵습니다. (해당 자산군 내 투자 금액: {asset_amount:,.0f}원)")
+                                for name, price in valid_items_with_prices.items():
+                                    num_shares, purchase_amount = share_plan[name]
+                                    if num_shares > 0:
+                                        st.write(f"- **{name}**: 약 **{purchase_amount:,.0f}원** ({num_shares}주/개 구매 가능)")
+                                    else:
+                                        st.write(f"- **{name}**: **{float(price):,.0f}원** (1주/개 구매 금액) - 현재 배분 금액으로는 1주/개 구매 어려움.")
                             else:
                                 st.write(f"- {asset}군 내 선택하신 모든 종목의 현재가 정보를 가져올 수 없어 정확한 금액 산출이 어렵습니다. (해당 자산군 내 투자 금액: {asset_amount:,.0f}원)")
                         else: 
                             st.write(f"- {asset}군 내 선택하신 종목이 없습니다. 다시 선택해주세요.")
                     st.markdown("---")
+            if share_plan and share_plan_leftover > 0.01:
+                st.write(f"*종목 구매 후 남은 금액: {share_plan_leftover:,.0f}원 (자산군 전체에서 1주/개 단위로 최대한 구매한 뒤 남는 금액입니다.)*")
             st.success(f"**총 {total_invested_amount:,.0f}원**에 대한 포트폴리오 구성 제안이 완료되었습니다.")
+
+    # --- 적립식 투자 백테스트 ---
+    st.markdown("---")
+    st.markdown("### 📈 적립식 투자 백테스트")
+    st.write(
+        "현재 포트폴리오 비율과 선택한 종목으로 과거에 매달 적립식으로 투자했다면 어땠을지 시뮬레이션합니다. "
+        "매월 첫 거래일에 1주/개 단위로 매수하고 남은 금액은 다음 달로 이월하며, 현금성 자산(CMA/적금)은 이자 없이 적립한 것으로 계산합니다. "
+        "해외 종목은 해당 날짜의 원/달러 환율로 환산한 원화 가격으로 매수합니다."
+    )
+    backtest_years = st.slider("백테스트 기간 (년)", 1, 20, 5, key="backtest_years_monthly")
+
+    if st.button("백테스트 실행"):
+        # 자산군별로 {티커: 자산군 내 비중} 구성 (월별 추천 투자 금액과 같은 기준)
+        items_by_asset = {}
+        for asset in portfolio:
+            items = {}
+            if asset == "채권":
+                bond_details = asset_recommendations_for_monthly_guide["채권"]["세부종목"]
+                for bond_type_name, fraction in allocation.bond_type_split(risk_tolerance, selected_bond_types).items():
+                    bond_tickers = list(bond_details[bond_type_name]["종목"].values())
+                    for ticker in bond_tickers:
+                        items[ticker] = items.get(ticker, 0) + fraction / len(bond_tickers)
+            elif asset == "ETF":
+                etf_properties = asset_recommendations_for_monthly_guide["ETF"]["특성"]
+                etf_split = allocation.etf_item_split(
+                    risk_tolerance,
+                    {etf_name: etf_properties.get(etf_name, "기타") for etf_name in selected_etf_items}
+                )
+                items = {selected_etf_items[etf_name]: fraction for etf_name, fraction in etf_split.items()}
+            elif asset in asset_recommendations_for_monthly_guide:
+                asset_tickers = [
+                    ticker for name, ticker in asset_recommendations_for_monthly_guide[asset]['종목'].items()
+                    if selected_portfolio_items.get(name) == ticker
+                ]
+                items = {ticker: 1 / len(asset_tickers) for ticker in asset_tickers}
+            if items:
+                items_by_asset[asset] = items
+
+        backtest_tickers = sorted({ticker for items in items_by_asset.values() for ticker in items})
+        if not backtest_tickers:
+            st.warning("백테스트할 종목이 없습니다. 위에서 자산군별 종목을 선택해주세요.")
+            st.stop()
+
+        backtest_end = pd.Timestamp("today").normalize() + pd.Timedelta(days=1)
+        backtest_start = backtest_end - pd.DateOffset(years=backtest_years)
+        # 해외 종목이 있으면 원화로 환산하기 위한 원/달러 환율도 함께 조회
+        needs_fx = any(not backtest.is_krw_ticker(ticker) for ticker in backtest_tickers)
+        fetch_tickers = backtest_tickers + [backtest.USD_KRW_TICKER] if needs_fx else backtest_tickers
+        with instrumentation.span("portfolio.fetch.backtest"):
+            backtest_prices, backtest_failed = market_data.get_price_history(fetch_tickers, backtest_start, backtest_end)
+        if needs_fx:
+            backtest_failed.pop(backtest.USD_KRW_TICKER, None)
+            usd_krw = backtest_prices.pop(backtest.USD_KRW_TICKER) if backtest.USD_KRW_TICKER in backtest_prices else None
+            foreign_tickers = [ticker for ticker in backtest_prices.columns if not backtest.is_krw_ticker(ticker)]
+            if usd_krw is None or usd_krw.dropna().empty:
+                # 환율 없이 달러 가격을 원화로 볼 수는 없으므로 해외 종목은 매수하지 않은 것으로 계산
+                backtest_prices = backtest_prices.drop(columns=foreign_tickers)
+                backtest_failed.update({ticker: "원/달러 환율을 가져오지 못함" for ticker in foreign_tickers})
+            else:
+                backtest_prices = backtest.to_krw(backtest_prices, usd_krw)
+        # 국내/해외 시장의 휴장일이 달라도 매수일에 모든 종목의 가격이 있도록 실제 거래일 기준으로 정렬
+        backtest_prices = market_data.align_to_sessions(backtest_prices)
+        if backtest_failed:
+            st.warning(f"다음 종목은 가격 데이터를 가져오지 못해 현금으로 보유한 것으로 계산합니다: **{', '.join(backtest_failed)}**")
+        if backtest_prices.empty:
+            st.error("백테스트에 사용할 가격 데이터가 없습니다.")
+            st.stop()
+
+        with instrumentation.span("portfolio.transform.backtest"):
+            asset_to_ticker = backtest.asset_ticker_matrix(items_by_asset, backtest_tickers)
+            asset_to_ticker = asset_to_ticker[:, [backtest_tickers.index(ticker) for ticker in backtest_prices.columns]]
+            current_percentages = np.array([portfolio.get(asset, 0) for asset in allocation.ASSET_CLASSES])
+            equity, invested, metrics = backtest.run_dca_backtest(
+                backtest_prices, current_percentages / 100 @ asset_to_ticker, monthly_investment
+            )
+
+        result = metrics.iloc[0]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("최종 평가액", f"{result['최종 평가액']:,.0f}원", f"총 투자금 {result['총 투자금']:,.0f}원", delta_color="off")
+        col2.metric("연평균 수익률 (CAGR)", f"{result['CAGR'] * 100:,.2f}%")
+        col3.metric("최대 낙폭 (MDD)", f"{result['최대 낙폭'] * 100:,.2f}%")
+        col4.metric("연 변동성", f"{result['연 변동성'] * 100:,.2f}%")
+        st.line_chart(pd.DataFrame({"평가액": equity[0], "누적 투자금": invested}))
+
+        # 같은 종목 구성으로 투자 성향(0~100)만 바꿨을 때의 결과를 한 번에 비교
+        st.markdown("##### 투자 성향별 연평균 수익률 비교")
+        st.caption("자산군 비율만 투자 성향에 따라 바꾸고, 자산군 내 종목 비중은 현재 선택을 유지한 결과입니다.")
+        with instrumentation.span("portfolio.transform.backtest_sweep"):
+            risk_percentages = allocation.compute_allocations(allocation.RISK_LEVELS, allocation.asset_mask(selected_assets))
+            _, _, risk_metrics = backtest.run_dca_backtest(backtest_prices, risk_percentages / 100 @ asset_to_ticker, monthly_investment)
+        risk_metrics.index = allocation.RISK_LEVELS
+        risk_metrics.index.name = "투자 성향"
+        st.line_chart(risk_metrics[["CAGR", "최대 낙폭"]] * 100)
+
+# 성능 계측: METRICS_EXPORT_PATH로 내보내고, 주소에 ?debug=1이 있으면 사이드바에 표시
+instrumentation.render_debug_sidebar()
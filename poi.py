@@ -0,0 +1,155 @@
+"""
+주변 장소(POI) 모듈.
+
+data/guam_pois.csv의 장소(식당, 카페, 해변, 쇼핑, 관광지 등)를 한 번만 읽어 격자 공간 색인을 만들고,
+여행 지도에서 '오늘 방문 장소에서 X km 이내' 장소를 찾습니다.
+
+- 격자 색인: 위경도를 cell_km 크기의 칸으로 나눠 칸별 장소 번호를 보관하므로, 조회할 때는
+  반경에 걸치는 칸의 장소만 거리를 계산합니다 (장소 수가 수천 개여도 조회당 수십 µs).
+- 거리는 route.haversine_km(하버사인, km)로 계산합니다.
+"""
+import csv
+import math
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+import route
+
+POI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "guam_pois.csv")
+
+DEFAULT_CELL_KM = 1.0
+DEFAULT_RADIUS_KM = 2.0
+# 방문 장소와 이 거리 이내인 장소는 방문 장소 자체로 보고 주변 장소에서 제외
+SAME_PLACE_KM = 0.05
+KM_PER_DEGREE = math.pi * route.EARTH_RADIUS_KM / 180
+
+# 분류별 (이모지, 표시 이름)
+CATEGORIES = {
+    "restaurant": ("🍽️", "식당"),
+    "cafe": ("☕", "카페"),
+    "beach": ("🏖️", "해변"),
+    "shopping": ("🛍️", "쇼핑"),
+    "attraction": ("📸", "관광지"),
+    "hotel": ("🏨", "숙소"),
+    "transport": ("🚌", "교통"),
+}
+DEFAULT_CATEGORY = ("📍", "기타")
+
+Poi = namedtuple("Poi", ["name", "category", "latitude", "longitude"])
+# 주변 장소 조회 결과: 장소, 가장 가까운 방문 장소까지의 거리(km), 그 방문 장소 이름
+NearbyPoi = namedtuple("NearbyPoi", ["poi", "distance_km", "near"])
+
+
+def category_emoji(category):
+    return CATEGORIES.get(category, DEFAULT_CATEGORY)[0]
+
+
+def category_label(category):
+    return CATEGORIES.get(category, DEFAULT_CATEGORY)[1]
+
+
+class PoiIndex:
+    """장소 목록과 격자 공간 색인"""
+
+    def __init__(self, pois, cell_km=DEFAULT_CELL_KM):
+        self.pois = list(pois)
+        self.cell_km = cell_km
+        self.latitudes = np.array([poi.latitude for poi in self.pois], dtype=float)
+        self.longitudes = np.array([poi.longitude for poi in self.pois], dtype=float)
+        self.categories = np.array([poi.category for poi in self.pois], dtype=object)
+
+        # 위도 방향 칸 크기는 어디서나 같고, 경도 방향은 장소들의 평균 위도 기준 (조회 시 위도에 맞게 칸 수를 조정)
+        self._lat_step = cell_km / KM_PER_DEGREE
+        reference_lat = float(np.abs(self.latitudes).mean()) if self.pois else 0.0
+        self._lon_step = cell_km / (KM_PER_DEGREE * max(math.cos(math.radians(reference_lat)), 0.01))
+
+        rows = np.floor(self.latitudes / self._lat_step).astype(np.int64)
+        cols = np.floor(self.longitudes / self._lon_step).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        cells = np.stack([rows[order], cols[order]], axis=1)
+        starts = np.flatnonzero(np.any(np.diff(cells, axis=0) != 0, axis=1)) + 1 if len(order) else np.array([], dtype=int)
+        self._cells = {
+            (int(group[0, 0]), int(group[0, 1])): members
+            for group, members in zip(np.split(cells, starts), np.split(order, starts))
+            if len(members)
+        }
+
+    def __len__(self):
+        return len(self.pois)
+
+    def _candidates(self, lat, lon, radius_km):
+        """반경 radius_km 원에 걸치는 칸들의 장소 번호"""
+        row, col = math.floor(lat / self._lat_step), math.floor(lon / self._lon_step)
+        lat_reach = radius_km / KM_PER_DEGREE
+        # 원의 가장 높은 위도에서 경도 1도의 거리가 가장 짧으므로 그 위도를 기준으로 칸 수를 계산
+        widest = min(abs(lat) + lat_reach, 89.9)
+        lon_reach = radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest)))
+        row_span = math.ceil(lat_reach / self._lat_step)
+        col_span = math.ceil(lon_reach / self._lon_step)
+        found = [
+            self._cells[cell]
+            for cell in ((r, c) for r in range(row - row_span, row + row_span + 1)
+                         for c in range(col - col_span, col + col_span + 1))
+            if cell in self._cells
+        ]
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+    def nearby(self, lat, lon, radius_km=DEFAULT_RADIUS_KM, categories=None):
+        """(lat, lon)에서 radius_km 이내의 (장소 번호 배열, 거리 배열)을 가까운 순으로 반환"""
+        candidates = self._candidates(lat, lon, radius_km)
+        if categories is not None and len(candidates):
+            candidates = candidates[np.isin(self.categories[candidates], list(categories))]
+        distances = route.haversine_km(lat, lon, self.latitudes[candidates], self.longitudes[candidates])
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def near_stops(self, stops, radius_km=DEFAULT_RADIUS_KM, categories=None, limit=None):
+        """
+        방문 장소 목록(trip_map.location_key 형식) 중 하나라도 radius_km 이내에 있는 장소를 NearbyPoi 목록으로 반환.
+        여러 방문 장소에 가까우면 가장 가까운 방문 장소 기준이며, 방문 장소 자체(SAME_PLACE_KM 이내)는 제외합니다.
+        """
+        best = {}  # 장소 번호 -> (거리, 방문 장소 이름)
+        for stop in stops:
+            lat, lon = stop.coord
+            indexes, distances = self.nearby(lat, lon, radius_km, categories)
+            for index, distance in zip(indexes.tolist(), distances.tolist()):
+                if distance <= SAME_PLACE_KM:
+                    best[index] = None
+                elif index not in best or (best[index] is not None and distance < best[index][0]):
+                    best[index] = (distance, stop.label)
+        results = [NearbyPoi(self.pois[index], *found) for index, found in best.items() if found is not None]
+        results.sort(key=lambda item: item.distance_km)
+        return results[:limit] if limit is not None else results
+
+
+def read_poi_file(path=POI_PATH):
+    """CSV 파일(name, category, latitude, longitude 헤더)에서 Poi 목록을 읽음 (좌표가 잘못된 행은 건너뜀)"""
+    pois = []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            name = row.get("name", "").strip()
+            try:
+                lat, lon = float(row["latitude"]), float(row["longitude"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if name and -90 <= lat <= 90 and -180 <= lon <= 180:
+                pois.append(Poi(name, row.get("category", "").strip(), lat, lon))
+    return pois
+
+
+@lru_cache(maxsize=4)
+def _load_pois(path, mtime):
+    return PoiIndex(read_poi_file(path))
+
+
+def load_pois(path=POI_PATH):
+    """
+    장소 파일을 읽어 색인을 만든 PoiIndex를 반환.
+    프로세스 안에서 캐싱되며, 파일이 수정되면(수정 시각 변경) 다시 읽습니다.
+    """
+    return _load_pois(path, os.path.getmtime(path))
@@ -0,0 +1,180 @@
+"""
+시세 미리 받기(prefetch) 스케줄러.
+
+앱이 사용하는 티커는 고정되어 있으므로(차트 페이지의 TOP 10, 포트폴리오 페이지의 추천 종목),
+캐시 항목이 만료된 뒤 처음 들어온 사용자가 다운로드를 기다리지 않도록 백그라운드에서 미리 갱신합니다.
+
+- 스레드 모드: 페이지에서 start_background()를 호출하면 프로세스에 하나만 데몬 스레드를 띄우고,
+  PREFETCH_INTERVAL초마다 만료가 가까운 티커만 공용 메모리 캐시(market_data.price_cache)와
+  디스크 저장소에 다시 불러옵니다.
+- 프로세스 모드: `python prefetch.py`로 별도 작업 프로세스를 실행하면 같은 주기로 디스크 저장소
+  (PRICE_STORE_PATH)를 갱신합니다. 앱 프로세스의 메모리 캐시는 채우지 않지만, 캐시가 비어도
+  네트워크 대신 디스크에서 바로 읽게 됩니다.
+
+티커는 PREFETCH_BATCH_SIZE개씩 묶어 PREFETCH_STAGGER초 간격으로 불러와 데이터 소스에 요청이 몰리지 않게 합니다.
+
+    PREFETCH_ENABLED        0이면 스레드를 띄우지 않음 (기본값: 1)
+    PREFETCH_INTERVAL       갱신 주기(초) (기본값: 캐시 유효 시간의 1/4)
+    PREFETCH_STAGGER        묶음 사이 대기 시간(초) (기본값: 2)
+    PREFETCH_BATCH_SIZE     한 번에 불러올 티커 수 (기본값: 5)
+    PREFETCH_INITIAL_DELAY  시작 후 첫 갱신까지 대기 시간(초) (기본값: 10)
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+import instrumentation
+import market_data
+import recommendations
+import ticker_universe
+
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "1") != "0"
+PREFETCH_INTERVAL = float(os.environ.get("PREFETCH_INTERVAL", market_data.DEFAULT_CACHE_TTL / 4))
+PREFETCH_STAGGER = float(os.environ.get("PREFETCH_STAGGER", 2))
+PREFETCH_BATCH_SIZE = int(os.environ.get("PREFETCH_BATCH_SIZE", 5))
+PREFETCH_INITIAL_DELAY = float(os.environ.get("PREFETCH_INITIAL_DELAY", 10))
+
+# 미리 받을 대상: 이름, 티커 목록, 오늘(포함)까지 몇 년치를 받을지
+PrefetchJob = namedtuple("PrefetchJob", ["name", "tickers", "years"])
+
+DEFAULT_JOBS = (
+    # 차트 페이지: 최근 3년
+    PrefetchJob("chart", tuple(ticker_universe.TOP_10_TICKERS), 3),
+    # 포트폴리오 페이지: 백테스트 기본 기간(5년)이 현재가 조회('1d'/'2d')와 '1y' 구간을 모두 포함
+    PrefetchJob("portfolio", tuple(recommendations.recommendation_tickers()), 5),
+)
+
+
+def job_window(job, today=None):
+    """
+    job이 받을 [시작일, 종료일) 구간. 오늘로부터 years년 전부터 오늘 봉까지 포함하므로
+    차트 페이지([오늘-3년, 오늘))와 백테스트([내일-5년, 내일)) 구간을 모두 포함합니다.
+    """
+    today = pd.Timestamp(today if today is not None else "today").normalize()
+    return today - pd.DateOffset(years=job.years), today + pd.Timedelta(days=1)
+
+
+class PrefetchScheduler:
+    """
+    jobs의 티커를 interval초마다 미리 불러오는 스케줄러.
+    캐시 항목이 다음 갱신 전에 만료될 티커(없거나, 구간이 부족하거나, 오래된 티커)만 불러옵니다.
+    """
+
+    def __init__(self, jobs=DEFAULT_JOBS, interval=None, stagger=None, batch_size=None, initial_delay=None,
+                 cache=None, store=None, download=None):
+        self.jobs = jobs
+        self.interval = PREFETCH_INTERVAL if interval is None else interval
+        self.stagger = PREFETCH_STAGGER if stagger is None else stagger
+        self.batch_size = batch_size or PREFETCH_BATCH_SIZE
+        self.initial_delay = PREFETCH_INITIAL_DELAY if initial_delay is None else initial_delay
+        self.cache = cache if cache is not None else market_data.price_cache
+        self.store = store
+        self.download = download
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _due(self, tickers, start, end):
+        """다음 갱신 전에 만료되거나 구간이 부족한 티커 목록"""
+        batches = -(-len(tickers) // self.batch_size)
+        refresh_after = self.cache.ttl - self.interval - self.stagger * batches
+        due = []
+        for ticker in tickers:
+            entry = self.cache.peek(("history", ticker))
+            if entry is None:
+                due.append(ticker)
+                continue
+            (_, cached_start, cached_end), age = entry
+            if cached_start > start or cached_end < end or age >= refresh_after:
+                due.append(ticker)
+        return due
+
+    def run_once(self, today=None):
+        """모든 job을 한 번 갱신하고 불러온 티커 수를 반환"""
+        if market_data.source_unavailable(self.download):
+            # 데이터 소스가 차단된 동안에는 요청하지 않음 (페이지는 마지막 데이터를 사용)
+            instrumentation.increment("prefetch_skipped_total")
+            return 0
+
+        refreshed = 0
+        first_batch = True
+        for job in self.jobs:
+            start, end = job_window(job, today)
+            due = self._due(list(dict.fromkeys(job.tickers)), start, end)
+            for offset in range(0, len(due), self.batch_size):
+                if not first_batch and self._stop.wait(self.stagger):
+                    return refreshed
+                first_batch = False
+                batch = due[offset:offset + self.batch_size]
+                try:
+                    with instrumentation.span(f"prefetch.{job.name}"):
+                        failed = market_data.refresh_prices(batch, start, end, cache=self.cache, store=self.store,
+                                                            download=self.download)
+                except Exception:
+                    instrumentation.increment("prefetch_errors_total", job=job.name)
+                    continue
+                instrumentation.increment("prefetch_tickers_total", len(batch) - len(failed), job=job.name)
+                if failed:
+                    instrumentation.increment("prefetch_failed_tickers_total", len(failed), job=job.name)
+                refreshed += len(batch) - len(failed)
+        instrumentation.increment("prefetch_runs_total")
+        return refreshed
+
+    def run_forever(self):
+        if self._stop.wait(self.initial_delay):
+            return
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception:
+                instrumentation.increment("prefetch_errors_total", job="scheduler")
+            if self._stop.wait(max(0.0, self.interval - (time.monotonic() - started))):
+                return
+
+    def start(self):
+        """데몬 스레드로 실행 (이미 실행 중이면 아무것도 하지 않음)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_background():
+    """
+    프로세스에 하나뿐인 미리 받기 스레드를 시작하고 스케줄러를 반환 (PREFETCH_ENABLED=0이면 None).
+    Streamlit은 페이지를 실행할 때마다 이 함수를 호출하지만 스레드는 처음 한 번만 시작됩니다.
+    """
+    global _scheduler
+    if not PREFETCH_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrefetchScheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+if __name__ == "__main__":
+    # 별도 작업 프로세스로 실행: 디스크 저장소를 주기적으로 갱신 (Ctrl+C로 종료)
+    scheduler = PrefetchScheduler(initial_delay=0)
+    print(f"미리 받기 시작: 주기 {scheduler.interval:.0f}초, 묶음 {scheduler.batch_size}개, 간격 {scheduler.stagger:.1f}초")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
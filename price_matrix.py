@@ -0,0 +1,135 @@
+"""
+float32 가격 행렬 모듈.
+
+여러 티커의 가격을 (티커 수, 날짜 수) 크기의 float32 배열 하나와 공유 날짜 인덱스,
+티커 목록으로 보관합니다. 티커별 행이 메모리상 연속이므로 차트 코드에는 복사 없는 뷰(Series)를
+넘겨줄 수 있습니다.
+
+차트 페이지는 cached_matrices로 (원본, 정규화) 행렬을 가격 데이터 버전별로 한 번만 만들어 재사용합니다.
+원본 가격은 공용 가격 캐시(market_data.price_cache)에 float64로 남아 있으므로, 행렬은 그 데이터의
+추가 사본이며 전체 메모리 사용량을 줄이지는 않습니다 (float32이므로 추가되는 크기는 float64 사본의 절반입니다).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import instrumentation
+
+# 캐싱할 최대 (원본, 정규화) 행렬 쌍 수
+DEFAULT_MAX_MATRICES = 16
+
+
+class PriceMatrix:
+    """
+    연속된 float32 2차원 배열 기반의 가격 행렬.
+    DataFrame처럼 columns / matrix[티커]를 지원하므로 chart_utils.build_line_figure에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, values, dates, tickers):
+        self.values = np.asarray(values, dtype=np.float32)
+        if self.values.shape != (len(tickers), len(dates)):
+            raise ValueError("가격 배열의 크기가 티커 수 × 날짜 수와 일치하지 않습니다.")
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self._rows = {ticker: row for row, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        티커별 컬럼의 DataFrame에서 행렬을 생성 (티커별 행이 연속되도록 한 번만 복사).
+        pandas가 읽기 전용 뷰를 돌려줄 수 있으므로 항상 복사하여 normalize_ 등 제자리 연산이 가능하게 합니다.
+        """
+        values = np.ascontiguousarray(frame.to_numpy(dtype=np.float32, copy=True).T)
+        return cls(values, frame.index, frame.columns)
+
+    @property
+    def columns(self):
+        return self.tickers
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, ticker):
+        """티커의 가격을 복사 없이 배열 뷰를 감싼 Series로 반환"""
+        return pd.Series(self.values[self._rows[ticker]], index=self.dates, name=ticker, copy=False)
+
+    def row(self, ticker):
+        """티커의 가격 배열 뷰"""
+        return self.values[self._rows[ticker]]
+
+    def copy(self):
+        return PriceMatrix(self.values.copy(), self.dates, self.tickers)
+
+    def slice_dates(self, start=None, end=None):
+        """[start, end] 날짜 구간의 행렬을 복사 없이 뷰로 반환"""
+        begin, stop = self.dates.slice_indexer(start, end).indices(len(self.dates))[:2]
+        return PriceMatrix(self.values[:, begin:stop], self.dates[begin:stop], self.tickers)
+
+    def normalize_(self, base=100.0):
+        """
+        각 티커의 첫 유효 가격을 base로 하도록 제자리(in-place)에서 정규화하고 자신을 반환.
+        값이 하나도 없는 티커는 NaN으로 남습니다.
+        """
+        valid = ~np.isnan(self.values)
+        first = np.argmax(valid, axis=1)
+        base_prices = self.values[np.arange(len(self.tickers)), first]
+        base_prices[~valid.any(axis=1)] = np.nan
+        self.values /= base_prices[:, None]
+        self.values *= np.float32(base)
+        return self
+
+    def to_frame(self):
+        """DataFrame으로 변환 (가능하면 복사 없이 같은 배열을 공유)"""
+        return pd.DataFrame(self.values.T, index=self.dates, columns=self.tickers, copy=False)
+
+
+class MatrixCache:
+    """가격 데이터 버전을 키로 (원본 행렬, 정규화 행렬)을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_MATRICES, name="price_matrix"):
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, frame):
+        key = analytics.frame_version(frame)
+        with self._lock:
+            matrices = self._entries.get(key)
+            if matrices is not None:
+                self._entries.move_to_end(key)
+                instrumentation.increment("cache_hits_total", cache=self.name)
+                return matrices
+        instrumentation.increment("cache_misses_total", cache=self.name)
+        raw = PriceMatrix.from_frame(frame)
+        matrices = (raw, raw.copy().normalize_())
+        with self._lock:
+            self._entries[key] = matrices
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                instrumentation.increment("cache_evictions_total", cache=self.name)
+        return matrices
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 모든 세션이 함께 사용하는 행렬 캐시
+matrix_cache = MatrixCache()
+
+
+def cached_matrices(frame, cache=None):
+    """
+    캐시를 거쳐 가격 DataFrame의 (원본 PriceMatrix, 첫 유효 가격을 100으로 정규화한 PriceMatrix)를 반환.
+    캐시된 행렬은 여러 세션이 함께 사용하므로 값을 바꾸지 말고 slice_dates 등 뷰로만 사용해야 합니다.
+    """
+    cache = cache if cache is not None else matrix_cache
+    return cache.get_or_build(frame)
@@ -0,0 +1,151 @@
+"""
+디스크 기반 주가 저장소 (SQLite).
+
+이미 내려받은 일별 종가를 티커별로 보관하고, 어느 구간까지 받아두었는지를
+함께 기록하여 다음 요청 때는 마지막 저장일 이후의 데이터만 추가로 받도록 합니다.
+프로세스 재시작이나 캐시 만료 후에도 과거 데이터를 다시 받지 않아도 됩니다.
+"""
+import contextlib
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+# 저장소 파일 경로 (환경 변수 PRICE_STORE_PATH로 변경 가능)
+DEFAULT_STORE_PATH = os.environ.get(
+    "PRICE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "prices.sqlite"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    close REAL NOT NULL,
+    PRIMARY KEY (ticker, date)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def _to_date_str(value):
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+class PriceStore:
+    """
+    티커별 일별 종가와 수집 구간(coverage)을 저장하는 SQLite 저장소.
+    coverage의 end_date는 yfinance와 같이 '해당 날짜 미포함' 기준입니다.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # 호출마다 새 연결을 열어 스트림릿의 여러 스레드/레플리카에서 안전하게 사용
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:  # 블록이 정상 종료되면 커밋, 예외 시 롤백
+                yield conn
+        finally:
+            conn.close()
+
+    def coverage(self, tickers):
+        """
+        {티커: (시작일, 종료일, 수집 시각, 마지막 저장일)} 형태로 저장된 구간 정보를 반환.
+        마지막 저장일은 실제로 저장된 마지막 봉의 날짜이며 (없으면 None), 요청한 종료일이 미래여도
+        이 날짜 이후는 아직 받지 못한 것이므로 다시 받을지 판단할 때 사용합니다.
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+        placeholders = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, start_date, end_date, fetched_at, "
+                "(SELECT MAX(date) FROM prices WHERE prices.ticker = coverage.ticker) "
+                f"FROM coverage WHERE ticker IN ({placeholders})",
+                tickers,
+            ).fetchall()
+        return {
+            ticker: (pd.Timestamp(start), pd.Timestamp(end), fetched_at, pd.Timestamp(last) if last else None)
+            for ticker, start, end, fetched_at, last in rows
+        }
+
+    def load(self, tickers, start_date, end_date):
+        """저장된 종가를 [start_date, end_date) 구간으로 읽어 티커별 컬럼의 DataFrame으로 반환"""
+        tickers = list(tickers)
+        if not tickers:
+            return pd.DataFrame()
+        placeholders = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT ticker, date, close FROM prices WHERE ticker IN ({placeholders}) "
+                "AND date >= ? AND date < ?",
+                tickers + [_to_date_str(start_date), _to_date_str(end_date)],
+            ).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        long_df = pd.DataFrame(rows, columns=["ticker", "date", "close"])
+        long_df["date"] = pd.to_datetime(long_df["date"])
+        prices = long_df.pivot(index="date", columns="ticker", values="close").sort_index()
+        prices = prices[[ticker for ticker in tickers if ticker in prices.columns]]
+        prices.index.name = None
+        prices.columns.name = None
+        return prices
+
+    def save(self, prices, start_date, end_date):
+        """
+        다운로드한 가격(티커별 컬럼)을 저장하고, 각 티커의 수집 구간을 [start_date, end_date)만큼 넓힘.
+        같은 날짜의 값은 새 값으로 덮어씁니다 (당일 종가 갱신 반영).
+        """
+        if prices.empty:
+            return
+        with self._connect() as conn:
+            for ticker in prices.columns:
+                series = prices[ticker].dropna()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO prices (ticker, date, close) VALUES (?, ?, ?)",
+                    [(ticker, date.strftime("%Y-%m-%d"), float(value)) for date, value in series.items()],
+                )
+            self._update_coverage(conn, prices.columns, start_date, end_date)
+
+    def mark_covered(self, tickers, start_date, end_date):
+        """데이터가 없는 것으로 확인된 구간도 수집 완료로 기록 (상장 전 기간 등을 반복 다운로드하지 않도록)"""
+        with self._connect() as conn:
+            self._update_coverage(conn, tickers, start_date, end_date)
+
+    def touch(self, tickers):
+        """수집 구간은 그대로 두고 마지막 수집 시각만 갱신"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE coverage SET fetched_at = ? WHERE ticker = ?",
+                [(now, ticker) for ticker in tickers],
+            )
+
+    @staticmethod
+    def _update_coverage(conn, tickers, start_date, end_date):
+        start, end = _to_date_str(start_date), _to_date_str(end_date)
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO coverage (ticker, start_date, end_date, fetched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(ticker) DO UPDATE SET "
+            "start_date = MIN(start_date, excluded.start_date), "
+            "end_date = MAX(end_date, excluded.end_date), "
+            "fetched_at = excluded.fetched_at",
+            [(ticker, start, end, now) for ticker in tickers],
+        )
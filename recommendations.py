@@ -0,0 +1,155 @@
+"""
+자산군별 추천 종목/ETF 목록.
+
+포트폴리오 페이지의 추천 종목 섹션(ASSET_RECOMMENDATIONS)과 월별 투자 가이드
+(MONTHLY_GUIDE_RECOMMENDATIONS, 설명만 짧은 버전)에서 사용하며,
+백그라운드 미리 받기(prefetch)도 여기의 티커 목록을 사용합니다.
+"""
+
+# 티커가 없는 항목(예: KRX 금 시장)의 표시
+NO_TICKER = "N/A"
+
+ASSET_RECOMMENDATIONS = {
+    "금": {
+        "종목": {
+            "SPDR Gold Shares (GLD)": "GLD",
+            "iShares Gold Trust (IAU)": "IAU",
+            "KODEX 골드선물(H)": "132030.KS",
+            "KRX 금 시장": "N/A"
+        },
+        "설명": "금은 인플레이션 헤지 및 안전자산으로 선호됩니다. 달러 가치와 반대로 움직이는 경향이 있습니다. **KRX 금 시장**을 통해 실물 금에 투자하거나, **금 ETF**를 통해 간접 투자할 수 있습니다."
+    },
+    "채권": {
+        "설명": "채권은 주식에 비해 안정적인 수익을 제공하며, 경기 침체 시 가치가 상승할 수 있습니다. 금리 변동에 민감합니다. 투자 성향에 따라 다양한 채권을 고려할 수 있습니다. **국고채**는 정부가 발행하여 안정성이 높고, **회사채**는 기업이 발행하여 수익률이 높지만 신용 위험이 있습니다. 만기에 따라 **단기채**, **중장기채**, **장기채**로 구분됩니다.",
+        "세부종목": {
+            "단기채 (안정적, 낮은 수익률)": {
+                "설명": "만기가 짧아 금리 변동에 덜 민감하고 안정적입니다. 단기 자금 운용에 적합합니다.",
+                "종목": {"KOSEF 단기자금": "123530.KS", "KBSTAR 국고채30년액티브": "306200.KS"}
+            },
+            "중장기채 (중간 위험, 중간 수익률)": {
+                "설명": "금리 변동에 어느 정도 영향을 받지만, 장기채보다는 변동성이 작습니다.",
+                "종목": {"KODEX 국고채3년": "114260.KS", "TIGER 국채10년": "148070.KS"}
+            },
+            "장기채 (공격적, 높은 변동성)": {
+                "설명": "만기가 길어 금리 변동에 매우 민감하여 변동성이 크지만, 금리 하락 시 높은 수익률을 기대할 수 있습니다. 포트폴리오 분산에 활용됩니다.",
+                "종목": {"iShares 20+ Year Treasury Bond ETF (TLT)": "TLT", "KODEX 미국채10년선물(H)": "308620.KS"}
+            }
+        }
+    },
+    "CMA/파킹통장 (현금)": {
+        "종목": {},
+        "설명": "단기 여유자금을 보관하며, 비교적 높은 금리의 이자를 매일 또는 매주 받을 수 있는 상품입니다. 비상 자금으로 활용하기 좋습니다. **가장 높은 금리를 비교하여 선택하는 것이 중요합니다.**"
+    },
+    "적금": {
+        "종목": {},
+        "설명": "정해진 기간 동안 꾸준히 저축하며, 확정된 금리 수익을 얻을 수 있는 안전한 상품입니다. 목돈 마련에 유용합니다. **은행별 최고 금리를 비교하여 선택하는 것이 중요합니다.**"
+    },
+    "ETF": {
+        "종목": {
+            "KODEX 미국S&P500TR": "379810.KS",
+            "TIGER 미국나스닥100": "133690.KS",
+            "KODEX 미국나스닥100TR": "395380.KS",
+            "SOL 미국배당다우존스": "446860.KS",
+            "ACE 미국배당다우존스": "449170.KS"
+        },
+        "특성": {
+            "KODEX 미국S&P500TR": "성장형",
+            "TIGER 미국나스닥100": "성장형",
+            "KODEX 미국나스닥100TR": "성장형",
+            "SOL 미국배당다우존스": "안정형",
+            "ACE 미국배당다우존스": "안정형"
+        },
+        "설명": "다양한 자산에 분산 투자하는 펀드를 주식처럼 거래할 수 있습니다. 특정 지수, 산업, 국가에 투자하여 분산 효과를 누릴 수 있습니다. **미국 주요 지수(S&P 500, 나스닥 100) 추종 ETF와 배당 성장 ETF(SCHD 유사)는 장기 투자에 적합합니다.**"
+    },
+    "주식": {
+        "종목": {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "네이버": "035420.KS", "카카오": "035720.KS"},
+        "설명": "개별 기업의 성장에 직접 투자하여 높은 수익을 추구할 수 있으나, 변동성이 매우 큽니다. 기업 분석과 시장 상황에 대한 이해가 필수적입니다."
+    },
+    "원자재": {
+        "종목": {
+            "United States Oil Fund (USO)": "USO",
+            "Invesco DB Commodity Index Tracking Fund (DBC)": "DBC",
+            "Aberdeen Standard Physical Platinum Shares ETF (PPLT)": "PPLT",
+            "KODEX 구리선물(H)": "226340.KS"
+        },
+        "설명": "원유, 구리, 곡물, 귀금속 등 실물 자산에 투자합니다. 글로벌 경제 상황이나 공급망 이슈에 따라 가격 변동성이 큽니다. 포트폴리오의 분산 효과를 높이는 데 활용될 수 있습니다."
+    }
+}
+
+MONTHLY_GUIDE_RECOMMENDATIONS = {
+    "금": {
+        "종목": {
+            "SPDR Gold Shares (GLD)": "GLD",
+            "iShares Gold Trust (IAU)": "IAU",
+            "KODEX 골드선물(H)": "132030.KS",
+            "KRX 금 시장": "N/A"
+        },
+        "설명": "금은 인플레이션 헤지 및 안전자산으로 선호됩니다."
+    },
+    "채권": {
+        "설명": "채권은 주식에 비해 안정적인 수익을 제공합니다.",
+        "세부종목": {
+            "단기채 (안정적, 낮은 수익률)": {
+                "설명": "만기가 짧아 금리 변동에 덜 민감하고 안정적입니다.",
+                "종목": {"KOSEF 단기자금": "123530.KS", "KBSTAR 국고채30년액티브": "306200.KS"}
+            },
+            "중장기채 (중간 위험, 중간 수익률)": {
+                "설명": "금리 변동에 어느 정도 영향을 받습니다.",
+                "종목": {"KODEX 국고채3년": "114260.KS", "TIGER 국채10년": "148070.KS"}
+            },
+            "장기채 (공격적, 높은 변동성)": {
+                "설명": "만기가 길어 금리 변동에 매우 민감합니다.",
+                "종목": {"iShares 20+ Year Treasury Bond ETF (TLT)": "TLT", "KODEX 미국채10년선물(H)": "308620.KS"}
+            }
+        }
+    },
+    "CMA/파킹통장 (현금)": {
+        "종목": {},
+        "설명": "단기 여유자금을 보관하며, 비교적 높은 금리의 이자를 매일 또는 매주 받을 수 있는 상품입니다."
+    },
+    "적금": {
+        "종목": {},
+        "설명": "정해진 기간 동안 꾸준히 저축하며, 확정된 금리 수익을 얻을 수 있는 안전한 상품입니다."
+    },
+    "ETF": {
+        "종목": {
+            "KODEX 미국S&P500TR": "379810.KS",
+            "TIGER 미국나스닥100": "133690.KS",
+            "KODEX 미국나스닥100TR": "395380.KS",
+            "SOL 미국배당다우존스": "446860.KS",
+            "ACE 미국배당다우존스": "449170.KS"
+        },
+        "특성": {
+            "KODEX 미국S&P500TR": "성장형",
+            "TIGER 미국나스닥100": "성장형",
+            "KODEX 미국나스닥100TR": "성장형",
+            "SOL 미국배당다우존스": "안정형",
+            "ACE 미국배당다우존스": "안정형"
+        },
+        "설명": "다양한 자산에 분산 투자하는 펀드를 주식처럼 거래할 수 있습니다."
+    },
+    "주식": {
+        "종목": {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "네이버": "035420.KS", "카카오": "035720.KS"},
+        "설명": "개별 기업의 성장에 직접 투자하여 높은 수익을 추구할 수 있으나, 변동성이 매우 큽니다."
+    },
+    "원자재": {
+        "종목": {
+            "United States Oil Fund (USO)": "USO",
+            "Invesco DB Commodity Index Tracking Fund (DBC)": "DBC",
+            "Aberdeen Standard Physical Platinum Shares ETF (PPLT)": "PPLT",
+            "KODEX 구리선물(H)": "226340.KS"
+        },
+        "설명": "원유, 구리, 곡물, 귀금속 등 실물 자산에 투자합니다."
+    }
+}
+
+
+def recommendation_tickers(recommendations=None):
+    """추천 목록에 있는 모든 티커 (세부종목 포함, 'N/A' 제외, 순서 유지)"""
+    tickers = []
+    for source in ([recommendations] if recommendations is not None else [ASSET_RECOMMENDATIONS, MONTHLY_GUIDE_RECOMMENDATIONS]):
+        for asset_info in source.values():
+            groups = [asset_info.get("종목", {})] + [detail["종목"] for detail in asset_info.get("세부종목", {}).values()]
+            for group in groups:
+                tickers.extend(ticker for ticker in group.values() if ticker != NO_TICKER)
+    return list(dict.fromkeys(tickers))
@@ -0,0 +1,186 @@
+"""
+시세 조회 안정화 모듈.
+
+캐시가 만료된 직후 여러 세션이 동시에 같은 종목을 요청하면 각자 yfinance를 호출하게 되므로,
+다운로드 경로에 다음 세 가지를 적용합니다.
+
+- SingleFlight: 같은 키((티커, 구간))의 요청이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 사용
+- retry_call: 일시적인 오류는 지수 백오프 + 무작위 지연(full jitter)으로 재시도
+- CircuitBreaker: 데이터 소스별로 연속 실패가 일정 횟수를 넘으면 일정 시간 호출을 차단하고,
+  그동안 market_data는 캐시/디스크 저장소에 남아 있는 마지막 데이터(만료된 데이터 포함)를 사용
+"""
+import random
+import threading
+import time
+
+import instrumentation
+
+# 재시도 기본값 (총 시도 횟수, 첫 대기 시간(초), 최대 대기 시간(초))
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 4.0
+
+# 서킷 브레이커 기본값 (차단까지의 연속 실패 횟수, 차단 유지 시간(초))
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+_random = random.Random()
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 호출하지 않았을 때 발생"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐, 먼저 온 호출의 결과(또는 예외)를 모두에게 돌려줌"""
+
+    def __init__(self, name="download"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            instrumentation.increment("singleflight_shared_total", flight=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def retry_call(func, attempts=None, base_delay=None, max_delay=None, retryable=lambda error: True, sleep=time.sleep):
+    """
+    func를 호출하고, 예외가 나면 최대 attempts번까지 다시 시도.
+    n번째 재시도 전에는 0 ~ min(max_delay, base_delay × 2^n)초 사이에서 무작위로 기다리며,
+    retryable(예외)가 False인 예외는 바로 다시 발생시킵니다.
+    인자를 생략하면 모듈의 RETRY_* 값을 호출 시점에 사용합니다.
+    """
+    attempts = attempts or RETRY_ATTEMPTS
+    base_delay = RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = RETRY_MAX_DELAY if max_delay is None else max_delay
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as error:
+            if attempt == attempts - 1 or not retryable(error):
+                raise
+            instrumentation.increment("retries_total")
+            sleep(_random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    데이터 소스별 서킷 브레이커.
+    closed(정상) → 연속 실패 failure_threshold회 → open(차단) → reset_timeout초 후 한 번만 시험 호출(half-open)
+    → 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial_in_flight or self._clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    @property
+    def is_open(self):
+        """
+        호출이 차단되는 상태(open)인지. half-open에서는 False이므로 다음 요청이 그대로 데이터 소스를 호출하여
+        시험 호출이 되고, 그 결과에 따라 closed로 돌아가거나 다시 open이 됩니다.
+        """
+        return self.state == "open"
+
+    def _before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if not self._trial_in_flight and self._clock() - self._opened_at >= self.reset_timeout:
+                self._trial_in_flight = True
+                return
+        instrumentation.increment("circuit_rejected_total", source=self.name)
+        raise CircuitOpenError(f"{self.name} 데이터 소스의 연속 실패로 잠시 호출을 중단했습니다. 저장된 마지막 데이터를 사용합니다.")
+
+    def _record(self, success):
+        with self._lock:
+            self._trial_in_flight = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    instrumentation.increment("circuit_opened_total", source=self.name)
+                self._opened_at = self._clock()
+
+    def call(self, func, ignore=()):
+        """
+        차단 상태가 아니면 func를 호출. ignore에 속한 예외(요청한 데이터가 없는 경우 등)는
+        데이터 소스가 응답한 것으로 보아 실패로 세지 않습니다.
+        """
+        self._before_call()
+        try:
+            result = func()
+        except ignore:
+            self._record(success=True)
+            raise
+        except Exception:
+            self._record(success=False)
+            raise
+        self._record(success=True)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """데이터 소스 이름별로 프로세스에서 하나씩 공유하는 서킷 브레이커"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
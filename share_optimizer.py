@@ -0,0 +1,53 @@
+"""
+정수 주식 수 배분 모듈.
+
+월 투자 금액을 여러 종목에 나눌 때, 종목별 목표 금액을 최대한 따르면서
+1주 단위로 구매하고 남는 금액이 최소가 되도록 주식 수를 정합니다.
+"""
+import numpy as np
+
+
+def optimize_shares(budget, target_amounts, prices):
+    """
+    목표 금액에 맞춰 종목별로 구매할 정수 주식 수를 계산.
+
+    budget: 전체 구매 가능 금액
+    target_amounts: 종목별 목표 금액 (배열)
+    prices: 종목별 1주 가격 (배열, NaN 또는 0 이하이면 구매 대상에서 제외)
+    반환값: (종목별 주식 수, 종목별 구매 금액, 남은 금액)
+
+    1단계: 각 종목의 목표 금액 안에서 살 수 있는 만큼 내림하여 구매
+    2단계(보정): 남은 금액으로 살 수 있고 아직 목표 금액에 못 미친 종목 중 목표 대비 부족분이
+    1주 가격에서 차지하는 비율이 가장 큰 종목을 1주씩 추가 구매. 종목별 구매 금액은
+    목표 금액 + 1주 가격을 넘지 않으므로, 한 종목이 다른 종목(자산군)의 몫까지 가져가지 않습니다.
+    그 결과 살 수 있는 종목이 없으면 남은 금액이 최저가보다 클 수 있습니다.
+    """
+    targets = np.asarray(target_amounts, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    valid = np.isfinite(prices) & (prices > 0)
+    safe_prices = np.where(valid, prices, np.inf)
+
+    shares = np.where(valid, np.floor(np.clip(targets, 0, None) / safe_prices), 0).astype(np.int64)
+    # 목표 금액 합계가 예산을 넘는 경우에도 예산 안에서만 구매하도록 비싼 종목부터 줄임
+    for index in np.argsort(-safe_prices):
+        overspent = (shares * np.where(valid, prices, 0)).sum() - budget
+        if overspent <= 0:
+            break
+        if valid[index]:
+            shares[index] -= min(shares[index], int(np.ceil(overspent / prices[index])))
+
+    spent = shares * np.where(valid, prices, 0)
+    leftover = budget - spent.sum()
+
+    # 보정 단계: 추가 구매마다 최소 1주 가격 이상을 쓰므로 반복 횟수는 남은 금액 / 최저가 이하
+    while True:
+        affordable = valid & (safe_prices <= leftover + 1e-9) & (spent < targets - 1e-9)
+        if not affordable.any():
+            break
+        priority = np.where(affordable, (targets - spent) / safe_prices, -np.inf)
+        index = int(np.argmax(priority))
+        shares[index] += 1
+        spent[index] += prices[index]
+        leftover -= prices[index]
+
+    return shares, spent, float(leftover)
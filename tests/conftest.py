@@ -0,0 +1,59 @@
+"""
+테스트 공용 설정.
+
+앱 모듈은 저장소 최상위의 평면 모듈이므로 최상위 디렉터리를 import 경로에 추가하고,
+네트워크 없이 market_data를 확인할 수 있도록 yf.download와 같은 형태의 가짜 데이터 소스를 제공합니다.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트 중에는 미리 받기 스레드를 띄우지 않음
+os.environ.setdefault("PREFETCH_ENABLED", "0")
+
+import resilience  # noqa: E402
+
+
+class FakeSource:
+    """
+    yf.download와 같은 형태(컬럼이 (필드, 티커)인 MultiIndex)의 결과를 돌려주는 가짜 데이터 소스.
+    평일마다 prices[티커] 값의 종가를 만들고, 호출 기록을 calls에 남깁니다.
+    prices에 없는 티커는 값이 모두 NaN이며, error를 지정하면 호출 시 그 예외를 발생시킵니다.
+    """
+
+    def __init__(self, prices=None):
+        self.prices = dict(prices or {})
+        self.calls = []
+        self.error = None
+
+    def __call__(self, tickers, start=None, end=None, period=None, **kwargs):
+        self.calls.append((tuple(tickers), start, end, period))
+        if self.error is not None:
+            raise self.error
+        index = pd.bdate_range(pd.Timestamp(start), pd.Timestamp(end) - pd.Timedelta(days=1))
+        columns = pd.MultiIndex.from_product([["Close"], list(tickers)])
+        data = {("Close", ticker): [self.prices.get(ticker, float("nan"))] * len(index) for ticker in tickers}
+        return pd.DataFrame(data, index=index, columns=columns)
+
+
+@pytest.fixture(autouse=True)
+def isolated_breakers(monkeypatch):
+    """테스트마다 서킷 브레이커를 새로 만들고, 재시도 대기 없이 실행"""
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "RETRY_BASE_DELAY", 0.0)
+
+
+@pytest.fixture
+def fake_source():
+    return FakeSource({"AAA": 100.0, "BBB": 50.0})
+
+
+@pytest.fixture
+def store(tmp_path):
+    from price_store import PriceStore
+
+    return PriceStore(str(tmp_path / "prices.sqlite"))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import allocation
+
+
+def test_asset_table_matches_compute_allocations_for_every_risk_and_selection():
+    masks = allocation._subset_masks(len(allocation.ASSET_CLASSES))
+    expected = np.stack([allocation.compute_allocations(risk, masks) for risk in allocation.RISK_LEVELS])
+
+    np.testing.assert_allclose(allocation.ALLOCATION_TABLES.assets, expected)
+
+
+@pytest.mark.parametrize("risk", [0, 37, 100])
+def test_allocate_uses_table_and_matches_direct_computation(risk):
+    selected = ["금", "채권", "ETF", "주식"]
+    direct = allocation.compute_allocations(risk, allocation.asset_mask(selected))
+    percentages = allocation.allocate(risk, selected)
+
+    np.testing.assert_allclose(list(percentages.values()), direct)
+    assert sum(percentages.values()) == pytest.approx(100)
+    assert percentages["적금"] == 0
+
+
+def test_allocate_falls_back_for_fractional_risk():
+    percentages = allocation.allocate(42.5, allocation.ASSET_CLASSES)
+
+    np.testing.assert_allclose(list(percentages.values()),
+                               allocation.compute_allocations(42.5, np.ones(len(allocation.ASSET_CLASSES), bool)))
+
+
+def test_bond_type_split_matches_normalized_weights():
+    selected = allocation.BOND_TYPES[:2]
+    for risk in (0, 50, 100):
+        weights = allocation.bond_type_weights(risk).reshape(-1)[:2]
+        split = allocation.bond_type_split(risk, selected)
+        np.testing.assert_allclose(list(split.values()), weights / weights.sum())
+
+
+def test_etf_item_split_table_matches_fallback():
+    styles = {"A": "안정형", "B": "성장형", "C": "성장형", "D": "기타"}
+    for risk in (0, 80):
+        split = allocation.etf_item_split(risk, styles)
+        fallback = allocation.etf_item_split(risk + 1e-9, styles)  # 정수가 아니면 표를 사용하지 않음
+        assert split.keys() == styles.keys()
+        assert sum(split.values()) == pytest.approx(1)
+        np.testing.assert_allclose(list(split.values()), list(fallback.values()), atol=1e-9)
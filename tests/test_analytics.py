@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+
+
+def _prices(seed=0, n=300, columns=("AAA", "BBB", "CCC")):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=n)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, len(columns))), axis=0))
+    return pd.DataFrame(values, index=index, columns=list(columns))
+
+
+def _with_gaps(prices, seed=1):
+    """상장 전 구간과 티커별 휴장일(NaN)을 넣은 가격"""
+    rng = np.random.default_rng(seed)
+    gapped = prices.mask(rng.random(prices.shape) < 0.1)
+    gapped.iloc[:30, 2] = np.nan
+    return gapped
+
+
+def _reference_returns(prices):
+    return np.log(prices / prices.ffill().shift())
+
+
+def test_rolling_returns_match_pandas():
+    prices = _with_gaps(_prices())
+    expected = prices.ffill().pct_change(20, fill_method=None)
+
+    np.testing.assert_allclose(analytics.rolling_returns(prices, 20), expected.to_numpy(), equal_nan=True)
+
+
+def test_log_returns_skip_non_trading_days():
+    prices = pd.DataFrame({"AAA": [100.0, np.nan, 121.0, 110.0]})
+
+    returns = analytics.log_returns(prices)[:, 0]
+
+    assert np.isnan(returns[:2]).all()
+    assert returns[2:] == pytest.approx([np.log(1.21), np.log(110 / 121)])
+
+
+@pytest.mark.parametrize("gaps", [False, True])
+def test_rolling_volatility_matches_pandas(gaps):
+    prices = _prices()
+    if gaps:
+        prices = _with_gaps(prices)
+    window = 20
+    returns = _reference_returns(prices)
+    expected = returns.rolling(window, min_periods=2).std() * np.sqrt(analytics.TRADING_DAYS_PER_YEAR)
+    # 창이 첫 수익률 이전에 걸치면 NaN
+    first = returns.notna().to_numpy().argmax(axis=0)
+    expected = expected.mask(np.arange(len(prices))[:, None] < first + window - 1)
+
+    np.testing.assert_allclose(analytics.rolling_volatility(prices, window), expected.to_numpy(),
+                               rtol=1e-6, equal_nan=True)
+
+
+def test_forward_filled_holidays_do_not_lower_volatility():
+    prices = _with_gaps(_prices())
+    window = 20
+
+    actual = analytics.rolling_volatility(prices, window)
+    filled = analytics.rolling_volatility(prices.ffill(), window)
+
+    # 직전 종가로 채우면 휴장일마다 0% 수익률이 생겨 변동성이 낮아짐
+    assert np.nanmean(filled) < np.nanmean(actual)
+
+
+def test_correlation_matrix_matches_pandas_pairwise_complete():
+    prices = _with_gaps(_prices())
+    expected = _reference_returns(prices).corr(min_periods=20)
+
+    correlation = analytics.correlation_matrix(prices, min_periods=20)
+
+    np.testing.assert_allclose(correlation, expected.to_numpy(), atol=1e-9)
+    np.testing.assert_allclose(np.diag(correlation), 1.0)
+
+
+def test_correlation_matrix_requires_min_periods():
+    prices = _prices(n=10)
+
+    assert np.isnan(analytics.correlation_matrix(prices, min_periods=20)).all()
+
+
+def test_drawdowns_match_pandas():
+    prices = _prices()
+    expected = prices / prices.cummax() - 1
+
+    np.testing.assert_allclose(analytics.drawdowns(prices), expected.to_numpy())
+    np.testing.assert_allclose(analytics.max_drawdowns(prices), expected.min().to_numpy())
+
+
+def test_compute_rolling_analytics_uses_last_close_for_price_levels():
+    prices = _with_gaps(_prices())
+    result = analytics.compute_rolling_analytics(prices, 20)
+    filled = prices.ffill()
+
+    pd.testing.assert_frame_equal(result.drawdown, filled / filled.cummax() - 1, check_freq=False)
+    pd.testing.assert_series_equal(result.max_drawdown, (filled / filled.cummax() - 1).min(), check_names=False)
+    assert list(result.correlation.columns) == list(prices.columns)
+
+
+def test_rolling_analytics_caches_by_data_and_window():
+    cache = analytics.AnalyticsCache()
+    prices = _prices()
+
+    first = analytics.rolling_analytics(prices, 20, cache=cache)
+
+    assert analytics.rolling_analytics(prices.copy(), 20, cache=cache) is first
+    assert analytics.rolling_analytics(prices, 60, cache=cache) is not first
+    changed = prices.copy()
+    changed.iloc[-1, 0] += 1
+    assert analytics.rolling_analytics(changed, 20, cache=cache) is not first
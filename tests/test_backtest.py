@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+
+
+def _two_month_prices():
+    index = pd.bdate_range("2024-01-01", "2024-02-29")
+    return pd.DataFrame({"AAA": np.where(index.month == 1, 100.0, 200.0)}, index=index)
+
+
+def test_run_dca_backtest_buys_whole_shares_and_carries_remainder():
+    equity, invested, metrics = backtest.run_dca_backtest(_two_month_prices(), [1.0], 250)
+
+    # 1월: 250원으로 2주(200원), 50원 이월 / 2월: 300원으로 1주(200원), 100원 이월
+    assert equity[0].loc["2024-01-31"] == 2 * 100 + 50
+    assert equity[0].iloc[-1] == 3 * 200 + 100
+    assert invested.iloc[-1] == 500
+    assert metrics.loc[0, "최종 평가액"] == 700
+    assert metrics.loc[0, "총 투자금"] == 500
+
+
+def test_performance_metrics_excludes_contributions_from_returns():
+    prices = _two_month_prices()
+    _, _, metrics = backtest.run_dca_backtest(prices, [1.0], 250)
+
+    # 2월 첫날 보유 평가액 250원 -> 투자금 250원을 빼면 450원이므로 TWR은 1.8배
+    years = (prices.index[-1] - prices.index[0]).days / 365.25
+    assert metrics.loc[0, "CAGR"] == pytest.approx(1.8 ** (1 / years) - 1)
+    assert metrics.loc[0, "최대 낙폭"] == 0
+
+
+def test_run_dca_backtest_keeps_unallocated_share_as_cash():
+    equity, _, _ = backtest.run_dca_backtest(_two_month_prices(), [0.5], 400)
+
+    # 매달 200원은 현금으로 적립, 나머지 200원으로 1월 2주, 2월 1주 매수
+    assert equity[0].iloc[-1] == 3 * 200 + 400
+
+
+def test_run_dca_backtest_strategies_match_separate_runs():
+    index = pd.bdate_range("2023-01-01", "2023-12-31")
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(index), 2)), axis=0)),
+                          index=index, columns=["AAA", "BBB"])
+    prices.iloc[:40, 1] = np.nan  # 상장 전 구간
+    weights = np.array([[0.7, 0.3], [0.2, 0.5]])
+
+    equity, _, metrics = backtest.run_dca_backtest(prices, weights, 1_000_000)
+    for row, single in enumerate(weights):
+        single_equity, _, single_metrics = backtest.run_dca_backtest(prices, single, 1_000_000)
+        np.testing.assert_allclose(equity[row], single_equity[0])
+        np.testing.assert_allclose(metrics.iloc[row], single_metrics.iloc[0])
+
+
+def test_to_krw_converts_only_foreign_tickers_with_last_known_rate():
+    index = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"])
+    prices = pd.DataFrame({"069500.KS": 30000.0, "GLD": 200.0}, index=index)
+    usd_krw = pd.Series([1300.0, 1310.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"]))
+
+    converted = backtest.to_krw(prices, usd_krw)
+
+    assert (converted["069500.KS"] == 30000.0).all()
+    assert np.isnan(converted["GLD"].iloc[0])  # 첫 환율 이전에는 환산하지 않음
+    assert converted["GLD"].iloc[1:].tolist() == [260000.0, 262000.0, 262000.0]
+    assert (prices["GLD"] == 200.0).all()
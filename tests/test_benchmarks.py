@@ -0,0 +1,22 @@
+import json
+
+from benchmarks import run
+
+
+def test_data_and_allocation_benchmarks_run_on_small_inputs(tmp_path, capsys):
+    path = tmp_path / "bench.json"
+
+    status = run.main(["--only", "data,allocation", "--tickers", "3", "--years", "1", "--repeat", "1",
+                       "--save", str(path)])
+
+    assert status == 0
+    results = json.loads(path.read_text(encoding="utf-8"))["results"]
+    assert {"load_stock_data_cold", "load_stock_data_cached", "dca_backtest_101", "rolling_analytics"} <= set(results)
+    assert all(result["runs"] == 1 and result["median"] >= 0 for result in results.values())
+
+
+def test_compare_reports_only_regressions_beyond_tolerance():
+    baseline = {"results": {"fast": {"median": 1.0}, "slow": {"median": 1.0}}}
+    results = {"fast": {"median": 1.2}, "slow": {"median": 1.3}, "new": {"median": 5.0}}
+
+    assert run.compare(results, baseline, tolerance=0.25) == [("slow", 1.0, 1.3)]
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import chart_utils
+
+
+def _series(values, start="2024-01-01"):
+    return pd.Series(values, index=pd.bdate_range(start, periods=len(values)), dtype=float)
+
+
+def test_line_trace_reuses_trace_for_unchanged_data():
+    cache = chart_utils.TraceCache()
+    series = _series([1, 2, 3])
+
+    first = chart_utils.line_trace("raw", "AAA", series, cache=cache)
+    second = chart_utils.line_trace("raw", "AAA", series.copy(), cache=cache)
+
+    assert second is first
+    assert list(first.y) == [1, 2, 3]
+
+
+def test_line_trace_rebuilds_when_data_or_resolution_changes():
+    cache = chart_utils.TraceCache()
+    series = _series(np.arange(10))
+    first = chart_utils.line_trace("raw", "AAA", series, cache=cache)
+
+    changed = series.copy()
+    changed.iloc[-1] = 100
+    assert chart_utils.line_trace("raw", "AAA", changed, cache=cache) is not first
+    assert chart_utils.line_trace("raw", "AAA", series, max_points=5, cache=cache) is not first
+    assert chart_utils.line_trace("normalized", "AAA", series, cache=cache) is not first
+
+
+def test_trace_cache_evicts_least_recently_used():
+    cache = chart_utils.TraceCache(max_entries=2)
+    created = []
+
+    def create(name):
+        created.append(name)
+        return name
+
+    cache.get_or_create("a", lambda: create("a"))
+    cache.get_or_create("b", lambda: create("b"))
+    cache.get_or_create("a", lambda: create("a"))  # a를 최근 사용으로 갱신
+    cache.get_or_create("c", lambda: create("c"))  # b가 제거됨
+    cache.get_or_create("a", lambda: create("a"))
+    cache.get_or_create("b", lambda: create("b"))
+
+    assert created == ["a", "b", "c", "b"]
+
+
+def test_build_line_figure_adds_one_trace_per_column():
+    cache = chart_utils.TraceCache()
+    frame = pd.DataFrame({"AAA": [1.0, 2.0], "BBB": [3.0, 4.0]}, index=pd.bdate_range("2024-01-01", periods=2))
+
+    figure = chart_utils.build_line_figure(frame, "raw", go.Layout(title="t"), cache=cache)
+
+    assert [trace.name for trace in figure.data] == ["AAA", "BBB"]
+    assert figure.layout.title.text == "t"
+
+
+def _random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return _series(100 + np.cumsum(rng.normal(0, 1, n)))
+
+
+@pytest.mark.parametrize("method", chart_utils.DOWNSAMPLE_METHODS)
+@pytest.mark.parametrize("max_points", [2, 3, 4, 5, 999, 1000])
+def test_downsample_respects_budget_and_keeps_endpoints(method, max_points):
+    series = _random_walk(5000)
+    sampled = chart_utils.downsample(series, max_points, method)
+
+    assert len(sampled) <= max_points
+    assert sampled.index[0] == series.index[0] and sampled.index[-1] == series.index[-1]
+    assert sampled.index.is_monotonic_increasing
+    assert sampled.eq(series.loc[sampled.index]).all()
+
+
+def test_lttb_returns_exactly_requested_points():
+    series = _random_walk(5000)
+
+    assert len(chart_utils.downsample(series, 1000, "lttb")) == 1000
+
+
+def test_minmax_keeps_extremes():
+    series = _random_walk(5000, seed=1)
+    sampled = chart_utils.downsample(series, 100, "minmax")
+
+    assert series.idxmax() in sampled.index
+    assert series.idxmin() in sampled.index
+
+
+def test_downsample_leaves_short_series_unchanged():
+    series = _random_walk(10)
+
+    assert chart_utils.downsample(series, 10, "minmax") is series
+    assert chart_utils.downsample(series, None) is series
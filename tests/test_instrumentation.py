@@ -0,0 +1,41 @@
+import json
+import threading
+
+import instrumentation
+
+
+def test_counters_and_spans_are_exported_as_prometheus_text():
+    metrics = instrumentation.Metrics()
+    metrics.increment("cache_hits_total", cache="price")
+    metrics.increment("cache_hits_total", 2, cache="price")
+    with metrics.span("chart.fetch"):
+        pass
+
+    text = metrics.to_prometheus()
+
+    assert 'cache_hits_total{cache="price"} 3' in text
+    assert 'span_duration_seconds_count{span="chart.fetch"} 1' in text
+
+
+def test_concurrent_exports_leave_one_complete_file(tmp_path):
+    metrics = instrumentation.Metrics()
+    metrics.increment("requests_total")
+    path = tmp_path / "metrics" / "export.json"
+    errors = []
+
+    def export():
+        try:
+            for _ in range(20):
+                metrics.export(str(path))
+        except Exception as error:  # 임시 파일 이름이 겹치면 다른 스레드가 옮긴 파일을 찾지 못함
+            errors.append(error)
+
+    threads = [threading.Thread(target=export) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
+    assert json.loads(path.read_text(encoding="utf-8"))["counters"][0]["value"] == 1
+    assert [entry.name for entry in path.parent.iterdir()] == ["export.json"]
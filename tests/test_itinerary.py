@@ -0,0 +1,80 @@
+import json
+import re
+
+import pytest
+
+import itinerary
+
+
+def _trip(**overrides):
+    raw = {
+        "id": "guam",
+        "title": "괌 여행",
+        "days": [
+            {"schedule": {"오전": "해변"}, "locations": [{"name": "타무닝 해변", "icon": "🏖️", "lat": 13.4961, "lon": 144.7782}]},
+            {"locations": [{"name": "공항", "lat": "13.4839", "lon": "144.7960"}]},
+        ],
+    }
+    raw.update(overrides)
+    return raw
+
+
+def _location(**overrides):
+    location = {"name": "해변", "lat": 13.5, "lon": 144.8}
+    location.update(overrides)
+    return _trip(days=[{"locations": [location]}])
+
+
+def test_parse_trip_builds_days_and_defaults():
+    trip = itinerary.parse_trip(_trip())
+
+    assert (trip.id, trip.title, len(trip)) == ("guam", "괌 여행", 2)
+    assert trip.day(1).schedule == {"오전": "해변"}
+    assert trip.day(2).locations == (itinerary.Location("공항", itinerary.DEFAULT_ICON, 13.4839, 144.796),)
+    assert trip.day(3) is None and trip.day(0) is None
+
+
+def test_parse_trip_uses_file_name_as_default_id():
+    assert itinerary.parse_trip(_trip(id=None), "/data/saipan.json").id == "saipan"
+
+
+@pytest.mark.parametrize("raw, where", [
+    ([], "최상위"),
+    (_trip(id=" "), "id"),
+    (_trip(title=3), "title"),
+    (_trip(days=[]), "days"),
+    (_trip(days=["1일차"]), "days[0]"),
+    (_trip(days=[{"schedule": {"오전": 1}}]), "days[0].schedule"),
+    (_trip(days=[{"locations": {}}]), "days[0].locations"),
+    (_location(name=""), "days[0].locations[0]"),
+    (_location(icon="🏖️ 해변"), "days[0].locations[0]"),
+    (_location(lat="north"), "days[0].locations[0]"),
+    (_location(lon=None), "days[0].locations[0]"),
+    (_location(lat=91), "days[0].locations[0]"),
+])
+def test_parse_trip_reports_invalid_field(raw, where):
+    with pytest.raises(itinerary.ItineraryError, match=f"^{re.escape(f'trip.json {where}:')}"):
+        itinerary.parse_trip(raw, "/data/trip.json")
+
+
+def test_read_itinerary_file_reports_json_errors(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{", encoding="utf-8")
+
+    with pytest.raises(itinerary.ItineraryError, match="broken.json: JSON"):
+        itinerary.read_itinerary_file(str(path))
+
+
+def test_load_itineraries_rejects_duplicate_ids(tmp_path):
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text(json.dumps(_trip()), encoding="utf-8")
+
+    with pytest.raises(itinerary.ItineraryError, match="b.json: 여행 ID 'guam'가 a.json와 중복"):
+        itinerary.load_itineraries(str(tmp_path))
+
+
+def test_load_itineraries_indexes_bundled_trips():
+    trips = itinerary.load_itineraries()
+
+    assert "guam" in trips
+    assert len(trips.get("guam")) >= 1
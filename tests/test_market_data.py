@@ -0,0 +1,241 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import market_data
+from conftest import FakeSource
+
+
+def _frame(columns, values, index=None):
+    index = index if index is not None else pd.bdate_range("2024-01-01", periods=3)
+    return pd.DataFrame({column: [value] * len(index) for column, value in zip(columns, values)}, index=index)
+
+
+def test_download_prices_fetches_all_tickers_in_one_call(fake_source):
+    prices, failed = market_data.download_prices(["AAA", "BBB", "AAA"], "2024-01-01", "2024-01-10",
+                                                 download=fake_source)
+
+    assert len(fake_source.calls) == 1
+    assert fake_source.calls[0][0] == ("AAA", "BBB")
+    assert list(prices.columns) == ["AAA", "BBB"]
+    assert (prices["AAA"] == 100.0).all() and (prices["BBB"] == 50.0).all()
+    assert failed == {}
+
+
+def test_download_prices_reports_tickers_without_data(fake_source):
+    prices, failed = market_data.download_prices(["AAA", "ZZZ"], "2024-01-01", "2024-01-10", download=fake_source)
+
+    assert list(prices.columns) == ["AAA"]
+    assert failed == {"ZZZ": market_data.NO_DATA_REASON}
+
+
+def test_download_prices_fails_every_ticker_when_the_source_errors(fake_source):
+    fake_source.error = ValueError("bad response")
+    prices, failed = market_data.download_prices(["AAA", "BBB"], "2024-01-01", "2024-01-10", download=fake_source)
+
+    assert prices.empty
+    assert set(failed) == {"AAA", "BBB"}
+    assert all("bad response" in reason for reason in failed.values())
+
+
+def test_download_prices_passes_period_instead_of_dates():
+    calls = []
+
+    def download(tickers, **kwargs):
+        calls.append(kwargs)
+        return _frame(["Close"], [10.0])
+
+    prices, failed = market_data.download_prices(["AAA"], period="1y", download=download)
+
+    assert calls == [{"period": "1y"}]
+    assert list(prices.columns) == ["AAA"]
+    assert failed == {}
+
+
+def test_download_prices_normalizes_exchange_timezone_index():
+    index = pd.date_range("2024-01-02 09:30", periods=3, freq="D", tz="America/New_York")
+
+    def download(tickers, **kwargs):
+        return _frame(["Close"], [10.0], index=index)
+
+    prices, _ = market_data.download_prices(["AAA"], "2024-01-01", "2024-01-10", download=download)
+
+    assert prices.index.tz is None
+    assert list(prices.index) == list(pd.date_range("2024-01-02", periods=3, freq="D"))
+
+
+@pytest.mark.parametrize("columns", [
+    pd.MultiIndex.from_product([["Adj Close", "Close"], ["AAA", "BBB"]]),
+    pd.MultiIndex.from_product([["AAA", "BBB"], ["Close", "Adj Close"]]),
+])
+def test_select_price_frame_prefers_adjusted_close_on_either_level(columns):
+    raw = pd.DataFrame(
+        [[1.0 if "Adj Close" in column else 2.0 for column in columns]], columns=columns,
+        index=pd.bdate_range("2024-01-01", periods=1),
+    )
+    prices = market_data.select_price_frame(raw, ["AAA", "BBB"])
+
+    assert sorted(prices.columns) == ["AAA", "BBB"]
+    assert (prices.to_numpy() == 1.0).all()
+
+
+def test_select_price_frame_names_flat_single_ticker_columns():
+    prices = market_data.select_price_frame(_frame(["Open", "Close"], [1.0, 2.0]), ["AAA"])
+
+    assert list(prices.columns) == ["AAA"]
+    assert (prices["AAA"] == 2.0).all()
+
+
+def test_select_price_frame_returns_none_without_price_columns():
+    assert market_data.select_price_frame(_frame(["Open", "Volume"], [1.0, 2.0]), ["AAA"]) is None
+
+
+
+def _age_coverage(store, seconds):
+    with store._connect() as conn:
+        conn.execute("UPDATE coverage SET fetched_at = fetched_at - ?", (seconds,))
+
+
+def test_load_prices_reuses_stored_range(store):
+    source = FakeSource({"AAA": 100.0})
+    first, _ = market_data.load_prices(["AAA"], "2024-01-01", "2024-02-01", store=store, download=source)
+    second, failed = market_data.load_prices(["AAA"], "2024-01-08", "2024-01-20", store=store, download=source)
+
+    assert len(source.calls) == 1
+    assert failed == {}
+    assert second.equals(first.loc["2024-01-08":"2024-01-19"])
+
+
+def test_load_prices_refetches_last_session_after_max_age(store):
+    source = FakeSource({"AAA": 100.0})
+    start, end = market_data.period_to_window("1y")[:2]
+    market_data.load_prices(["AAA"], start, end, store=store, download=source)
+
+    # max_age 안에서는 저장된 마지막 거래일을 그대로 사용
+    source.prices["AAA"] = 200.0
+    prices, _ = market_data.load_prices(["AAA"], start, end, store=store, download=source)
+    assert len(source.calls) == 1
+    assert prices["AAA"].iloc[-1] == 100.0
+
+    _age_coverage(store, market_data.DEFAULT_MAX_AGE + 1)
+    prices, _ = market_data.load_prices(["AAA"], start, end, store=store, download=source)
+    assert len(source.calls) == 2
+    assert source.calls[-1][1] > start  # 전체가 아니라 최근 며칠만 다시 받음
+    assert prices["AAA"].iloc[-1] == 200.0
+
+
+def test_load_prices_does_not_refetch_closed_history(store):
+    source = FakeSource({"AAA": 100.0})
+    market_data.load_prices(["AAA"], "2024-01-01", "2024-03-01", store=store, download=source)
+    _age_coverage(store, market_data.DEFAULT_MAX_AGE + 1)
+    market_data.load_prices(["AAA"], "2024-01-01", "2024-02-01", store=store, download=source)
+
+    assert len(source.calls) == 1
+
+
+def test_fetch_quotes_bounds_total_time_when_tickers_queue():
+    release = threading.Event()
+
+    def fetch(ticker):
+        if ticker in ("HUNG1", "HUNG2"):
+            release.wait(5)
+        return ticker
+
+    started = time.monotonic()
+    results, failed = market_data.fetch_quotes(["HUNG1", "HUNG2", "AAA", "BBB"], fetch, max_workers=2, timeout=0.2)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 1.0
+    assert results == {}
+    assert list(failed) == ["HUNG1", "HUNG2", "AAA", "BBB"]
+
+
+def test_fetch_quotes_keeps_results_of_finished_tickers():
+    def fetch(ticker):
+        if ticker == "BAD":
+            raise ConnectionError("down")
+        return ticker.lower()
+
+    results, failed = market_data.fetch_quotes(["AAA", "BAD", "BBB"], fetch, max_workers=2, timeout=1)
+
+    assert results == {"AAA": "aaa", "BBB": "bbb"}
+    assert list(failed) == ["BAD"]
+
+
+@pytest.mark.parametrize("period, start, bars", [
+    ("2d", "2024-03-01", 2),
+    ("3mo", "2023-12-15", None),
+    ("1y", "2023-03-15", None),
+    ("ytd", "2024-01-01", None),
+])
+def test_period_to_window(period, start, bars):
+    window_start, window_end, window_bars = market_data.period_to_window(period, today="2024-03-15")
+
+    if bars is None:
+        assert window_start == pd.Timestamp(start)
+    else:
+        # 'Nd'는 N개 거래일이 들어가도록 넉넉한 달력 구간을 잡음
+        assert window_start <= pd.Timestamp("2024-03-15") - pd.Timedelta(days=bars * 2)
+    assert window_end == pd.Timestamp("2024-03-16")
+    assert window_bars == bars
+
+
+def test_period_to_window_rejects_unknown_period():
+    with pytest.raises(ValueError):
+        market_data.period_to_window("5x")
+
+
+def test_get_price_series_returns_last_bars_and_shares_cache(store):
+    source = FakeSource({"AAA": 100.0})
+    cache = market_data.PriceCache()
+
+    yearly = market_data.get_price_series("AAA", "1y", cache=cache, store=store, download=source)
+    recent = market_data.get_price_series("AAA", "2d", cache=cache, store=store, download=source)
+
+    assert len(recent) == 2
+    assert recent.index[-1] == yearly.index[-1]
+    assert len(source.calls) == 1  # 짧은 구간은 이미 받은 1년치에서 잘라서 사용
+
+
+def test_get_price_series_returns_empty_series_without_data(store):
+    series = market_data.get_price_series("ZZZ", "1mo", cache=market_data.PriceCache(), store=store,
+                                          download=FakeSource())
+
+    assert series.empty
+
+
+def test_align_to_sessions_forward_fills_one_market_holidays_without_backfill():
+    index = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-06", "2024-01-04"])
+    prices = pd.DataFrame({
+        "KR": [float("nan"), 10.0, float("nan"), float("nan"), 12.0],
+        "US": [5.0, float("nan"), 6.0, float("nan"), 7.0],
+    }, index=index)
+
+    aligned = market_data.align_to_sessions(prices)
+
+    # 어떤 티커도 거래하지 않은 날(01-06)은 빠지고, 날짜는 정렬됨
+    assert list(aligned.index) == list(pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]))
+    assert pd.isna(aligned.loc["2024-01-01", "KR"])  # 첫 거래일 이전은 뒤 방향으로 채우지 않음
+    assert aligned["KR"].iloc[1:].tolist() == [10.0, 10.0, 12.0]
+    assert aligned["US"].tolist() == [5.0, 5.0, 6.0, 7.0]
+
+
+def test_align_to_sessions_matches_pandas_forward_fill():
+    index = pd.bdate_range("2024-01-01", periods=60)
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(rng.normal(100, 1, (60, 3)), index=index, columns=["A", "B", "C"])
+    prices = prices.mask(rng.random((60, 3)) < 0.3)
+    prices.iloc[:10, 2] = np.nan
+
+    aligned = market_data.align_to_sessions(prices)
+    sessions = prices.dropna(how="all")
+
+    pd.testing.assert_frame_equal(aligned, sessions.ffill(), check_freq=False)
+
+
+def test_align_to_sessions_keeps_empty_frame():
+    assert market_data.align_to_sessions(pd.DataFrame()).empty
@@ -0,0 +1,60 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import market_source
+from conftest import FakeSource
+
+
+def test_replay_returns_recorded_response_without_calling_live(tmp_path):
+    live = FakeSource({"AAA": 100.0, "BBB": 50.0})
+    recorder = market_source.MarketDataSource(live, mode="record", fixture_dir=str(tmp_path))
+    recorded = recorder(["AAA", "BBB"], start="2024-01-01", end="2024-02-01")
+
+    replayer = market_source.MarketDataSource(FakeSource(), mode="replay", fixture_dir=str(tmp_path))
+    replayed = replayer(["AAA", "BBB"], start="2024-01-01", end="2024-02-01")
+
+    pd.testing.assert_frame_equal(replayed, recorded)
+    assert len(live.calls) == 1
+
+
+def test_replay_slices_widest_recorded_window(tmp_path):
+    recorder = market_source.MarketDataSource(FakeSource({"AAA": 100.0}), mode="record", fixture_dir=str(tmp_path))
+    recorder(["AAA"], start="2024-01-01", end="2024-03-01")
+
+    replayer = market_source.MarketDataSource(FakeSource(), mode="replay", fixture_dir=str(tmp_path))
+    replayed = replayer(["AAA"], start="2024-01-10", end="2024-01-20")
+
+    assert replayed.index[0] >= pd.Timestamp("2024-01-10")
+    assert replayed.index[-1] < pd.Timestamp("2024-01-20")
+
+
+def test_replay_raises_for_unrecorded_ticker(tmp_path):
+    replayer = market_source.MarketDataSource(FakeSource(), mode="replay", fixture_dir=str(tmp_path))
+
+    with pytest.raises(market_source.FixtureNotFoundError):
+        replayer(["ZZZ"], start="2024-01-01", end="2024-02-01")
+
+
+def test_concurrent_recording_of_same_request_keeps_complete_fixture(tmp_path):
+    recorder = market_source.MarketDataSource(FakeSource({"AAA": 100.0}), mode="record", fixture_dir=str(tmp_path))
+    errors = []
+
+    def record():
+        try:
+            for _ in range(10):
+                recorder(["AAA"], start="2024-01-01", end="2024-02-01")
+        except Exception as error:  # 임시 파일 이름이 겹치면 다른 스레드가 옮긴 파일을 찾지 못함
+            errors.append(error)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".json", ".pkl"]
+    replayer = market_source.MarketDataSource(FakeSource(), mode="replay", fixture_dir=str(tmp_path))
+    assert not replayer(["AAA"], start="2024-01-01", end="2024-02-01").empty
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import poi
+import route
+from poi import Poi
+from trip_map import Stop
+
+ORIGIN = (13.5, 144.8)
+
+
+def _north_of(coord, km):
+    """coord에서 정북으로 km 떨어진 좌표 (같은 경도에서는 하버사인 거리가 정확히 km)"""
+    return coord[0] + km / poi.KM_PER_DEGREE, coord[1]
+
+
+def _poi(name, coord, category="cafe"):
+    return Poi(name, category, *coord)
+
+
+@pytest.mark.parametrize("cell_km", [0.3, 1.0, 5.0])
+def test_nearby_matches_brute_force(cell_km):
+    rng = np.random.default_rng(0)
+    coords = np.column_stack([rng.uniform(13.2, 13.7, 2000), rng.uniform(144.6, 145.0, 2000)])
+    index = poi.PoiIndex([_poi(f"p{i}", coord) for i, coord in enumerate(coords)], cell_km=cell_km)
+
+    for lat, lon in coords[:20]:
+        for radius in (0.5, 2.0, 7.5):
+            found, distances = index.nearby(lat, lon, radius)
+            expected = route.haversine_km(lat, lon, coords[:, 0], coords[:, 1])
+            assert sorted(found.tolist()) == np.flatnonzero(expected <= radius).tolist()
+            assert np.all(np.diff(distances) >= 0)
+
+
+def test_near_stops_includes_radius_boundary():
+    index = poi.PoiIndex([
+        _poi("inside", _north_of(ORIGIN, 1.99)),
+        _poi("edge", _north_of(ORIGIN, 2.0)),
+        _poi("outside", _north_of(ORIGIN, 2.01)),
+    ])
+
+    found = index.near_stops([Stop("🏨 숙소", "🏨", ORIGIN)], radius_km=2.0)
+
+    assert [item.poi.name for item in found] == ["inside", "edge"]
+    assert found[1].distance_km == pytest.approx(2.0)
+
+
+def test_near_stops_excludes_the_stops_themselves():
+    other_stop = _north_of(ORIGIN, 1.0)
+    index = poi.PoiIndex([
+        _poi("hotel", _north_of(ORIGIN, poi.SAME_PLACE_KM * 0.8)),
+        _poi("next door", _north_of(ORIGIN, poi.SAME_PLACE_KM * 1.2)),
+    ])
+
+    stops = [Stop("🏨 숙소", "🏨", ORIGIN), Stop("🏖️ 해변", "🏖️", other_stop)]
+    found = index.near_stops(stops)
+
+    # 다른 방문 장소 기준으로는 충분히 멀어도, 한 방문 장소와 같은 곳이면 제외
+    assert [item.poi.name for item in found] == ["next door"]
+
+
+def test_near_stops_reports_nearest_stop_and_filters():
+    east_stop = (ORIGIN[0], ORIGIN[1] + 0.02)
+    index = poi.PoiIndex([
+        _poi("cafe", _north_of(ORIGIN, 0.5), "cafe"),
+        _poi("beach", _north_of(east_stop, 0.3), "beach"),
+        _poi("far", _north_of(ORIGIN, 10), "cafe"),
+    ])
+    stops = [Stop("A", "📍", ORIGIN), Stop("B", "📍", east_stop)]
+
+    found = index.near_stops(stops)
+    assert [(item.poi.name, item.near) for item in found] == [("beach", "B"), ("cafe", "A")]
+    assert [item.poi.name for item in index.near_stops(stops, categories={"cafe"})] == ["cafe"]
+    assert len(index.near_stops(stops, limit=1)) == 1
+
+
+def test_read_poi_file_skips_invalid_rows(tmp_path):
+    path = tmp_path / "pois.csv"
+    path.write_text(
+        "name,category,latitude,longitude\n"
+        "카페,cafe,13.5,144.8\n"
+        "잘못된 좌표,cafe,abc,144.8\n"
+        "범위 밖,cafe,95,144.8\n"
+        ",cafe,13.5,144.8\n",
+        encoding="utf-8",
+    )
+
+    assert poi.read_poi_file(str(path)) == [Poi("카페", "cafe", 13.5, 144.8)]
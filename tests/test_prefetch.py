@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+import market_data
+import prefetch
+import resilience
+from conftest import FakeSource
+
+TODAY = pd.Timestamp("2024-03-15")
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+def _scheduler(source, store, tickers=("AAA", "BBB", "CCC"), cache=None, **kwargs):
+    kwargs = {"interval": 60, "stagger": 0, "batch_size": 2, "initial_delay": 0, **kwargs}
+    return prefetch.PrefetchScheduler(
+        jobs=(prefetch.PrefetchJob("test", tickers, 1),),
+        cache=cache if cache is not None else market_data.PriceCache(ttl=3600),
+        store=store, download=source, **kwargs,
+    )
+
+
+def test_job_window_includes_today():
+    start, end = prefetch.job_window(prefetch.PrefetchJob("test", ("AAA",), 3), today=TODAY)
+
+    assert start == pd.Timestamp("2021-03-15")
+    assert end == pd.Timestamp("2024-03-16")
+
+
+def test_run_once_loads_due_tickers_in_batches(store):
+    source = FakeSource({"AAA": 1.0, "BBB": 2.0, "CCC": 3.0})
+    scheduler = _scheduler(source, store)
+
+    assert scheduler.run_once(today=TODAY) == 3
+    assert [tickers for tickers, *_ in source.calls] == [("AAA", "BBB"), ("CCC",)]
+    start, end = prefetch.job_window(scheduler.jobs[0], TODAY)
+    assert scheduler._due(["AAA", "BBB", "CCC"], start, end) == []
+
+    # 캐시가 유효한 동안에는 다시 불러오지 않음
+    assert scheduler.run_once(today=TODAY) == 0
+    assert len(source.calls) == 2
+
+
+def test_due_includes_entries_that_expire_before_next_run(store):
+    source = FakeSource({"AAA": 1.0})
+    cache = market_data.PriceCache(ttl=3600)
+    scheduler = _scheduler(source, store, tickers=("AAA",), cache=cache)
+    scheduler.run_once(today=TODAY)
+    start, end = prefetch.job_window(scheduler.jobs[0], TODAY)
+
+    # 다음 갱신(interval) 전에 만료되는 항목은 미리 갱신 대상
+    assert _scheduler(source, store, tickers=("AAA",), cache=cache, interval=3600)._due(["AAA"], start, end) == ["AAA"]
+    # 캐시된 구간보다 넓은 구간을 요청하면 대상
+    assert scheduler._due(["AAA"], start - pd.Timedelta(days=30), end) == ["AAA"]
+
+
+def test_run_once_does_not_count_failed_tickers(store):
+    source = FakeSource({"AAA": 1.0})
+    scheduler = _scheduler(source, store, tickers=("AAA", "ZZZ"))
+
+    assert scheduler.run_once(today=TODAY) == 1
+
+
+def test_run_once_skips_while_source_breaker_is_open(store):
+    source = FakeSource({"AAA": 1.0})
+    breaker = resilience.CircuitBreaker(market_data._source_name(source), failure_threshold=1)
+    resilience._breakers[breaker.name] = breaker
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    assert _scheduler(source, store).run_once(today=TODAY) == 0
+    assert source.calls == []
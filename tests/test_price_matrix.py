@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import price_matrix
+
+
+def _frame():
+    index = pd.bdate_range("2024-01-01", periods=5)
+    return pd.DataFrame({
+        "AAA": [10.0, 11.0, 12.0, 13.0, 14.0],
+        "BBB": [np.nan, np.nan, 50.0, 25.0, 100.0],
+        "CCC": np.nan,
+    }, index=index)
+
+
+def test_to_frame_round_trips_float32_values():
+    frame = _frame()
+    matrix = price_matrix.PriceMatrix.from_frame(frame)
+
+    assert matrix.values.dtype == np.float32
+    assert matrix.values.flags.c_contiguous
+    assert matrix.nbytes == 3 * 5 * 4
+    pd.testing.assert_frame_equal(matrix.to_frame(), frame.astype(np.float32), check_freq=False)
+
+
+def test_getitem_returns_view_of_ticker_row():
+    matrix = price_matrix.PriceMatrix.from_frame(_frame())
+    series = matrix["AAA"]
+
+    assert series.name == "AAA"
+    assert np.shares_memory(series.to_numpy(), matrix.values)
+    assert series.tolist() == [10.0, 11.0, 12.0, 13.0, 14.0]
+
+
+def test_normalize_sets_first_valid_price_to_base():
+    matrix = price_matrix.PriceMatrix.from_frame(_frame()).normalize_()
+    expected = _frame() / _frame().bfill().iloc[0] * 100
+
+    np.testing.assert_allclose(matrix.to_frame().to_numpy(), expected.to_numpy(), rtol=1e-6)
+    assert matrix["CCC"].isna().all()
+
+
+def test_slice_dates_is_an_inclusive_view():
+    matrix = price_matrix.PriceMatrix.from_frame(_frame())
+    sliced = matrix.slice_dates("2024-01-02", "2024-01-04")
+
+    assert list(sliced.dates) == list(pd.bdate_range("2024-01-02", "2024-01-04"))
+    assert np.shares_memory(sliced.values, matrix.values)
+    assert sliced["AAA"].tolist() == [11.0, 12.0, 13.0]
+
+
+def test_rejects_mismatched_shape():
+    with pytest.raises(ValueError):
+        price_matrix.PriceMatrix(np.zeros((2, 3)), pd.bdate_range("2024-01-01", periods=3), ["AAA"])
+
+
+def test_cached_matrices_reuses_matrices_for_same_data():
+    cache = price_matrix.MatrixCache()
+    raw, normalized = price_matrix.cached_matrices(_frame(), cache=cache)
+
+    assert price_matrix.cached_matrices(_frame(), cache=cache)[0] is raw
+    assert not np.shares_memory(raw.values, normalized.values)
+    assert raw["AAA"].iloc[0] == 10.0 and normalized["AAA"].iloc[0] == 100.0
@@ -0,0 +1,219 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import market_data
+import resilience
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _install_breaker(download, clock, failure_threshold=2, reset_timeout=30.0):
+    breaker = resilience.CircuitBreaker(
+        market_data._source_name(download), failure_threshold=failure_threshold,
+        reset_timeout=reset_timeout, clock=clock,
+    )
+    resilience._breakers[breaker.name] = breaker
+    return breaker
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+def _missing():
+    raise LookupError("no fixture")
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = resilience.SingleFlight(name="test")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["result"] * 4
+    # 완료된 키는 지워지므로 다음 호출은 새로 실행됨
+    assert flight.do("key", lambda: "next") == "next"
+
+
+def test_single_flight_shares_errors_with_waiting_callers():
+    flight = resilience.SingleFlight(name="test")
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ConnectionError("down")
+
+    errors = []
+
+    def run():
+        try:
+            flight.do("key", failing)
+        except ConnectionError as error:
+            errors.append(error)
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run)
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+
+
+def test_retry_call_retries_only_retryable_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("temporary")
+        return "ok"
+
+    assert resilience.retry_call(flaky, attempts=3, sleep=lambda _: None) == "ok"
+    assert len(attempts) == 3
+
+    attempts.clear()
+
+    def missing():
+        attempts.append(1)
+        _missing()
+
+    with pytest.raises(LookupError):
+        resilience.retry_call(missing, attempts=3, retryable=lambda error: not isinstance(error, LookupError),
+                              sleep=lambda _: None)
+    assert len(attempts) == 1
+
+
+def test_breaker_open_half_open_closed_transitions():
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker("test", failure_threshold=2, reset_timeout=30.0, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == "open"
+    assert breaker.is_open
+
+    calls = []
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+
+    clock.now = 30.0
+    assert breaker.state == "half-open"
+    assert not breaker.is_open
+    assert breaker.call(lambda: "trial") == "trial"
+    assert breaker.state == "closed"
+
+
+def test_breaker_reopens_when_half_open_trial_fails():
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker("test", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    clock.now = 10.0
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == "open"
+
+    clock.now = 15.0
+    assert breaker.is_open
+    clock.now = 20.0
+    assert breaker.state == "half-open"
+
+
+def test_breaker_allows_only_one_trial_call():
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker("test", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    clock.now = 10.0
+
+    def trial():
+        # 시험 호출이 진행 중인 동안 다른 호출은 차단됨
+        with pytest.raises(resilience.CircuitOpenError):
+            breaker.call(lambda: "second")
+        return "first"
+
+    assert breaker.call(trial) == "first"
+    assert breaker.state == "closed"
+
+
+def test_breaker_ignores_missing_data_errors():
+    breaker = resilience.CircuitBreaker("test", failure_threshold=1)
+    with pytest.raises(LookupError):
+        breaker.call(_missing, ignore=(LookupError,))
+    assert breaker.state == "closed"
+
+
+def test_open_breaker_serves_stale_cache_without_calling_source(fake_source, store):
+    clock = FakeClock()
+    breaker = _install_breaker(fake_source, clock, failure_threshold=1)
+    cache = market_data.PriceCache(ttl=-1)  # 저장 즉시 만료
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")
+    series = pd.Series(1.0, index=pd.bdate_range(start, end - pd.Timedelta(days=1)))
+    cache.put(("history", "AAA"), (series, start, end))
+
+    fake_source.error = ConnectionError("down")
+    with pytest.raises(ConnectionError):
+        breaker.call(lambda: fake_source(["AAA"], start=start, end=end))
+    fake_source.calls.clear()
+    assert market_data.source_unavailable(fake_source)
+
+    prices, failed = market_data.get_price_history(["AAA"], start, end, cache=cache, store=store,
+                                                   download=fake_source)
+    assert failed == {}
+    assert (prices["AAA"] == 1.0).all()
+    assert fake_source.calls == []
+
+
+def test_half_open_breaker_lets_page_request_through_as_trial(fake_source, store):
+    clock = FakeClock()
+    breaker = _install_breaker(fake_source, clock, failure_threshold=1, reset_timeout=30.0)
+    cache = market_data.PriceCache(ttl=-1)
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")
+    stale = pd.Series(1.0, index=pd.bdate_range(start, end - pd.Timedelta(days=1)))
+    cache.put(("history", "AAA"), (stale, start, end))
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+
+    clock.now = 30.0
+    assert not market_data.source_unavailable(fake_source)
+    prices, failed = market_data.get_price_history(["AAA"], start, end, cache=cache, store=store,
+                                                   download=fake_source)
+
+    assert len(fake_source.calls) == 1
+    assert failed == {}
+    assert (prices["AAA"] == 100.0).all()
+    assert breaker.state == "closed"
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import route
+from trip_map import Stop
+
+
+def _coords(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(13.2, 13.7, n), rng.uniform(144.6, 145.0, n)])
+
+
+def _brute_force_length(distances):
+    n = len(distances)
+    orders = np.array([(0,) + rest for rest in itertools.permutations(range(1, n))])
+    return distances[orders[:, :-1], orders[:, 1:]].sum(axis=1).min()
+
+
+def test_haversine_one_degree_of_latitude():
+    assert route.haversine_km(0, 0, 1, 0) == pytest.approx(111.195, abs=0.01)
+    distances = route.haversine_matrix([(13.0, 144.0), (13.5, 144.5)])
+    np.testing.assert_allclose(distances, distances.T)
+    np.testing.assert_allclose(np.diag(distances), 0)
+
+
+@pytest.mark.parametrize("n", range(3, 10))
+@pytest.mark.parametrize("seed", range(3))
+def test_held_karp_matches_brute_force(n, seed):
+    distances = route.haversine_matrix(_coords(n, seed))
+
+    order = route.optimize_order(distances)
+
+    assert order[0] == 0 and sorted(order) == list(range(n))
+    assert route.path_length(order, distances) == pytest.approx(_brute_force_length(distances))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_heuristic_is_close_to_brute_force_and_two_opt_optimal(seed, monkeypatch):
+    distances = route.haversine_matrix(_coords(9, seed))
+    monkeypatch.setattr(route, "EXACT_MAX_STOPS", 2)  # 2-opt / or-opt 경로를 강제로 사용
+
+    order = route.optimize_order(distances)
+
+    assert order[0] == 0 and sorted(order) == list(range(9))
+    length = route.path_length(order, distances)
+    assert length <= 1.1 * _brute_force_length(distances)
+    # 더 이상 줄일 수 있는 2-opt 교환이 없어야 함
+    assert route._two_opt(list(order), distances.tolist()) == order
+
+
+def test_heuristic_improves_on_nearest_neighbor_for_many_stops():
+    distances = route.haversine_matrix(_coords(60, seed=7))
+
+    order = route.optimize_order(distances)
+
+    assert order[0] == 0 and sorted(order) == list(range(60))
+    assert route.path_length(order, distances) <= route.path_length(route._nearest_neighbor(distances), distances)
+
+
+def test_plan_route_keeps_first_stop_and_reports_distance():
+    stops = tuple(Stop(f"장소 {i}", "📍", tuple(coord)) for i, coord in enumerate(_coords(6, seed=1)))
+
+    planned = route.plan_route(stops)
+
+    assert planned.order[0] == stops[0] and set(planned.order) == set(stops)
+    assert planned.distance_km == pytest.approx(route.route_distance(planned.order))
+    assert planned.distance_km <= route.route_distance(stops) + 1e-9
+    assert route.plan_route(()) == route.Route((), 0.0)
@@ -0,0 +1,28 @@
+import numpy as np
+
+import share_optimizer
+
+
+def test_repair_step_does_not_spend_another_ticker_budget():
+    shares, spent, leftover = share_optimizer.optimize_shares(150000, [90000, 60000], [300, 70000])
+
+    assert shares.tolist() == [300, 0]
+    assert spent.tolist() == [90000, 0]
+    assert leftover == 60000
+
+
+def test_repair_step_tops_up_tickers_below_target():
+    targets = np.array([50000, 50000])
+    prices = np.array([30000, 20000])
+    shares, spent, leftover = share_optimizer.optimize_shares(100000, targets, prices)
+
+    assert shares.tolist() == [2, 2]
+    assert (spent <= targets + prices).all()
+    assert leftover == 0
+
+
+def test_invalid_prices_are_skipped():
+    shares, spent, leftover = share_optimizer.optimize_shares(10000, [5000, 5000], [np.nan, 1000])
+
+    assert shares.tolist() == [0, 5]
+    assert leftover == 5000
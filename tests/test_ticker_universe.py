@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import ticker_universe
+from ticker_universe import TickerInfo
+
+
+@pytest.fixture
+def universe():
+    return ticker_universe.TickerUniverse([
+        TickerInfo("AAPL", "Apple Inc.", "NASDAQ", "Technology", "USD"),
+        TickerInfo("AMZN", "Amazon.com Inc.", "NASDAQ", "Consumer", "USD"),
+        TickerInfo("APP", "AppLovin Corp", "NASDAQ", "Technology", "USD"),
+        TickerInfo("MSFT", "Microsoft Corporation", "NASDAQ", "Technology", "USD"),
+        TickerInfo("005930.KS", "삼성전자", "KRX", "Technology", "KRW"),
+        TickerInfo("PNAP", "Pineapple Holdings", "NYSE", "Food", "USD"),
+    ])
+
+
+def test_search_ranks_exact_symbol_before_prefix_matches(universe):
+    # 정확히 일치하는 티커 > 이름 접두어(Apple) > 부분 문자열(Pineapple)
+    assert universe.search("app") == ["APP", "AAPL", "PNAP"]
+
+
+def test_search_matches_symbol_and_name_word_prefixes(universe):
+    assert universe.search("am") == ["AMZN"]
+    assert universe.search("corp") == ["APP", "MSFT"]
+    assert universe.search("삼성") == ["005930.KS"]
+
+
+def test_search_falls_back_to_substring(universe):
+    assert universe.search("soft") == ["MSFT"]
+    assert universe.search("5930") == ["005930.KS"]
+
+
+def test_search_falls_back_to_fuzzy_symbol_match(universe):
+    assert universe.search("msfy") == ["MSFT"]
+    assert universe.search("zzzz") == []
+
+
+def test_search_ignores_case_whitespace_and_limit(universe):
+    assert universe.search("  AMZN ") == ["AMZN"]
+    assert universe.search("") == []
+    assert len(universe.search("a", limit=2)) == 2
+
+
+def test_load_universe_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "universe.csv"
+    path.write_text("symbol,name,exchange,sector,currency\nAAA,Alpha,NYSE,Tech,USD\n", encoding="utf-8")
+    first = ticker_universe.load_universe(str(path))
+    assert ticker_universe.load_universe(str(path)) is first
+
+    path.write_text(path.read_text(encoding="utf-8") + "BBB,Beta,NYSE,Tech,USD\n", encoding="utf-8")
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    reloaded = ticker_universe.load_universe(str(path))
+
+    assert len(reloaded) == 2
+    assert reloaded.label("BBB") == "BBB · Beta (NYSE)"
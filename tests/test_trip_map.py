@@ -0,0 +1,119 @@
+import pytest
+
+import itinerary
+import trip_map
+from itinerary import Location
+
+BEACH = Location("타무닝 해변", "🏖️", 13.4961, 144.7782)
+MALL = Location("마이크로네시아 몰", "🛍️", 13.5170, 144.8145)
+FORT = Location("솔레다드 요새", "🏰", 13.2953, 144.6617)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """build_day_map 호출 기록 (실제 지도는 그대로 생성)"""
+    calls = []
+    build = trip_map.build_day_map
+
+    def counting_build(locations, extras=()):
+        calls.append((locations, extras))
+        return build(locations, extras)
+
+    monkeypatch.setattr(trip_map, "build_day_map", counting_build)
+    return calls
+
+
+def test_location_key_uses_label_icon_and_float_coordinates():
+    key = trip_map.location_key([BEACH._replace(latitude="13.4961")])
+
+    assert key == (trip_map.Stop("🏖️ 타무닝 해변", "🏖️", (13.4961, 144.7782)),)
+    assert key[0].label == itinerary.location_label(BEACH)
+
+
+def test_map_cache_reuses_html_for_equal_locations(builds):
+    cache = trip_map.MapCache()
+
+    first = cache.get_or_build(trip_map.location_key([BEACH, MALL]))
+    second = cache.get_or_build(trip_map.location_key([Location(*BEACH), Location(*MALL)]))
+
+    assert second is first
+    assert len(builds) == 1
+    assert "타무닝 해변" in first and "L.polyline" in first
+
+
+def test_map_cache_keys_on_order_icon_and_extras(builds):
+    cache = trip_map.MapCache()
+    locations = trip_map.location_key([BEACH, MALL])
+    cache.get_or_build(locations)
+
+    cache.get_or_build(trip_map.location_key([MALL, BEACH]))  # 방문 순서가 바뀌면 경로도 바뀜
+    cache.get_or_build(trip_map.location_key([BEACH._replace(icon="🌊"), MALL]))
+    cache.get_or_build(locations, extras=(("카페", "☕", (13.5, 144.8)),))
+    cache.get_or_build(locations)
+
+    assert len(builds) == 4
+
+
+def test_map_cache_evicts_least_recently_used(builds):
+    cache = trip_map.MapCache(max_entries=2)
+    beach, mall, fort = (trip_map.location_key([location]) for location in (BEACH, MALL, FORT))
+
+    cache.get_or_build(beach)
+    cache.get_or_build(mall)
+    cache.get_or_build(beach)
+    cache.get_or_build(fort)  # mall이 제거됨
+    cache.get_or_build(beach)
+    cache.get_or_build(mall)
+
+    assert [locations for locations, _ in builds] == [beach, mall, fort, mall]
+
+
+def test_bounds_from_state_reads_st_folium_bounds():
+    state = {"bounds": {"_southWest": {"lat": 13.4, "lng": 144.7}, "_northEast": {"lat": 13.6, "lng": 144.9}}}
+
+    assert trip_map.bounds_from_state(state) == ((13.4, 144.7), (13.6, 144.9))
+
+
+@pytest.mark.parametrize("state", [
+    None,
+    {},
+    {"bounds": None},
+    {"bounds": {"_southWest": {"lat": 13.4, "lng": 144.7}}},
+    {"bounds": {"_southWest": {"lat": None, "lng": 144.7}, "_northEast": {"lat": 13.6, "lng": 144.9}}},
+])
+def test_bounds_from_state_returns_none_before_map_reports_bounds(state):
+    assert trip_map.bounds_from_state(state) is None
+
+
+def test_visible_markers_keeps_markers_within_padded_bounds():
+    bounds = ((13.0, 144.0), (14.0, 145.0))
+    markers = (
+        ("center", "☕", (13.5, 144.5)),
+        ("padded edge", "☕", (14.25, 145.25)),  # 범위의 25% 여유분 경계
+        ("outside", "☕", (14.3, 144.5)),
+        ("west", "☕", (13.5, 143.7)),
+    )
+
+    assert [name for name, _, _ in trip_map.visible_markers(markers, bounds)] == ["center", "padded edge"]
+    assert [name for name, _, _ in trip_map.visible_markers(markers, bounds, padding=0)] == ["center"]
+    assert trip_map.visible_markers((), bounds) == ()
+
+
+def test_initial_bounds_contains_every_stop_and_default_view():
+    stops = trip_map.location_key([BEACH, MALL, FORT])
+
+    (south, west), (north, east) = trip_map.initial_bounds(stops)
+
+    assert all(south <= lat <= north and west <= lon <= east for lat, lon in (stop.coord for stop in stops))
+    # 장소가 한 곳이어도 기본 확대 수준에서 지도 크기만큼의 범위
+    (south, west), (north, east) = trip_map.initial_bounds(trip_map.location_key([BEACH]))
+    degrees_per_pixel = 360 / (256 * 2 ** trip_map.DEFAULT_ZOOM)
+    assert north - south == pytest.approx(degrees_per_pixel * trip_map.MAP_HEIGHT)
+    assert east - west == pytest.approx(degrees_per_pixel * trip_map.MAP_WIDTH)
+
+
+def test_build_marker_layer_escapes_labels():
+    layer = trip_map.build_marker_layer((("<b>카페</b>", "☕", (13.5, 144.8)),))
+    cluster = next(iter(layer._children.values()))
+
+    assert cluster.data == [[13.5, 144.8, "☕", "&lt;b&gt;카페&lt;/b&gt;"]]
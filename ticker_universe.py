@@ -0,0 +1,148 @@
+"""
+티커 유니버스(종목 메타데이터) 모듈.
+
+data/ticker_universe.csv의 종목 정보(티커, 이름, 거래소, 섹터, 통화)를 한 번만 읽어
+검색 색인을 만들어 두고, 차트 페이지의 종목 선택기에서 입력한 글자로 종목을 찾습니다.
+
+- 접두어 검색: 티커와 이름(및 이름의 각 단어)을 정렬한 목록에서 bisect로 찾으므로
+  유니버스 크기와 관계없이 O(log n + 결과 수)입니다.
+- 부분 문자열 검색: 접두어 결과가 부족하면 미리 소문자로 만든 검색 문자열을 순회합니다.
+- 유사어(오타) 검색: 그래도 결과가 없으면 첫 글자가 같은 티커들만 difflib로 비교합니다.
+
+가격은 선택기에서 실제로 고른 티커만 market_data에서 불러옵니다.
+"""
+import bisect
+import csv
+import difflib
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+UNIVERSE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ticker_universe.csv")
+
+# 글로벌 시총 TOP 10 기업 티커 (2025년 6월 기준 예상, 실제 시점에 따라 변동 가능)
+TOP_10_TICKERS = [
+    "MSFT",  # Microsoft
+    "AAPL",  # Apple
+    "NVDA",  # NVIDIA
+    "GOOGL", # Alphabet (Google)
+    "AMZN",  # Amazon
+    "META",  # Meta Platforms
+    "TSLA",  # Tesla
+    "BRK-A", # Berkshire Hathaway A주
+    "LLY",   # Eli Lilly and Company
+    "JPM",   # JPMorgan Chase & Co.
+]
+
+DEFAULT_SEARCH_LIMIT = 20
+FUZZY_CUTOFF = 0.6
+
+TickerInfo = namedtuple("TickerInfo", ["symbol", "name", "exchange", "sector", "currency"])
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+class TickerUniverse:
+    """종목 메타데이터와 접두어/부분 문자열/유사어 검색 색인"""
+
+    def __init__(self, infos):
+        self.infos = {}
+        for info in infos:
+            self.infos.setdefault(info.symbol, info)
+        self.symbols = list(self.infos)
+
+        # 우선순위별(티커 > 이름 전체 > 이름의 단어) (검색 키, 티커) 정렬 목록
+        symbol_keys, name_keys, word_keys = set(), set(), set()
+        for symbol, info in self.infos.items():
+            name = info.name.lower()
+            symbol_keys.add((symbol.lower(), symbol))
+            name_keys.add((name, symbol))
+            word_keys.update((word, symbol) for word in _WORD_PATTERN.findall(name))
+        self._prefix_indexes = []
+        for keys in (symbol_keys, name_keys, word_keys):
+            keys = sorted(keys)
+            self._prefix_indexes.append(([key for key, _ in keys], [symbol for _, symbol in keys]))
+
+        self._haystacks = [f"{symbol.lower()} {info.name.lower()}" for symbol, info in self.infos.items()]
+        self._by_initial = {}
+        for symbol in self.symbols:
+            self._by_initial.setdefault(symbol[0].lower(), []).append(symbol.lower())
+        self._lower_to_symbol = {symbol.lower(): symbol for symbol in self.symbols}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.infos
+
+    def get(self, symbol):
+        return self.infos.get(symbol)
+
+    def label(self, symbol):
+        """선택기에 표시할 이름 (예: 'AAPL · Apple Inc. (NASDAQ)'). 유니버스에 없는 티커는 티커 그대로"""
+        info = self.infos.get(symbol)
+        if info is None:
+            return symbol
+        return f"{symbol} · {info.name} ({info.exchange})"
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        입력한 글자로 종목을 찾아 티커 목록을 반환 (정확히 일치 > 접두어 > 부분 문자열 > 유사어 순).
+        query가 비어 있으면 빈 목록을 반환합니다.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        found = {}  # 티커 -> 순위 (삽입 순서 유지)
+        exact = self._lower_to_symbol.get(query)
+        if exact is not None:
+            found[exact] = 0
+
+        # 접두어 검색: 정렬된 키에서 query로 시작하는 구간만 확인 (우선순위가 높은 색인부터)
+        for rank, (words, symbols) in enumerate(self._prefix_indexes, start=1):
+            begin = bisect.bisect_left(words, query)
+            end = bisect.bisect_left(words, query + "\uffff", lo=begin)
+            for symbol in symbols[begin:end]:
+                found.setdefault(symbol, rank)
+                if len(found) >= limit:
+                    return list(found)[:limit]
+
+        # 부분 문자열 검색
+        for symbol, haystack in zip(self.symbols, self._haystacks):
+            if query in haystack:
+                found.setdefault(symbol, 4)
+                if len(found) >= limit:
+                    return list(found)[:limit]
+
+        # 유사어 검색 (오타 허용): 첫 글자가 같은 티커만 비교하여 후보 수를 줄임
+        if not found:
+            candidates = self._by_initial.get(query[0], [])
+            for match in difflib.get_close_matches(query, candidates, n=limit, cutoff=FUZZY_CUTOFF):
+                found.setdefault(self._lower_to_symbol[match], 5)
+
+        return list(found)[:limit]
+
+
+def read_universe_file(path=UNIVERSE_PATH):
+    """CSV 파일(symbol, name, exchange, sector, currency 헤더)에서 TickerInfo 목록을 읽음"""
+    with open(path, newline="", encoding="utf-8") as file:
+        return [
+            TickerInfo(*(row.get(field, "").strip() for field in TickerInfo._fields))
+            for row in csv.DictReader(file)
+            if row.get("symbol", "").strip()
+        ]
+
+
+@lru_cache(maxsize=4)
+def _load_universe(path, mtime):
+    return TickerUniverse(read_universe_file(path))
+
+
+def load_universe(path=UNIVERSE_PATH):
+    """
+    유니버스를 읽어 색인을 만든 TickerUniverse를 반환.
+    프로세스 안에서 캐싱되며, 파일이 수정되면(수정 시각 변경) 다시 읽습니다.
+    """
+    return _load_universe(path, os.path.getmtime(path))
@@ -0,0 +1,208 @@
+"""
+여행 일정 지도 모듈.
+
+일차별 지도(마커 + 이동 경로)는 방문 장소가 같으면 항상 같으므로, 장소 목록을 키로
+folium 지도를 한 번만 만들고 렌더링한 HTML을 프로세스 전체에서 캐시합니다.
+여행 날짜나 일차 선택이 바뀌어 페이지가 다시 실행되어도 장소가 같으면 지도를 다시 만들지 않고,
+같은 HTML을 보내므로 브라우저의 지도도 새로 그려지지 않습니다.
+
+같은 folium.Map 객체를 st_folium에 반복해서 넘기면 렌더링할 때마다 스크립트가 중복으로 쌓이므로,
+객체 대신 렌더링이 끝난 HTML 문자열을 캐시합니다.
+
+주변 장소처럼 마커가 많을 때는 묶음 표시 모드(render_clustered_map)를 사용합니다.
+- 마커는 FastMarkerCluster로 묶어서 표시하고, 마커마다 HTML을 만드는 대신 공용 콜백 하나가
+  이모지별 아이콘을 한 번만 만들어 함께 사용합니다 (마커 데이터는 [위도, 경도, 이모지, 이름]만 전달).
+- st_folium이 돌려주는 현재 화면 범위(bounds)를 session_state에 보관하고, 그 범위(여유분 포함) 안의
+  마커만 feature_group_to_add로 보냅니다. 기본 지도는 그대로 두고 마커 레이어만 바뀌므로 지도가 다시 그려지지 않습니다.
+"""
+import html
+import threading
+from collections import OrderedDict, namedtuple
+
+import folium
+import numpy as np
+import streamlit as st
+from folium.plugins import FastMarkerCluster
+from streamlit_folium import st_folium
+
+import instrumentation
+import itinerary
+
+MAP_WIDTH = 700
+MAP_HEIGHT = 500
+DEFAULT_ZOOM = 11
+DEFAULT_MAX_MAPS = 64
+
+# 추가 마커가 이 개수보다 많으면 묶음 표시 모드를 기본으로 사용
+CLUSTER_THRESHOLD = 50
+# 화면 범위 밖으로 이 비율만큼 더 넓게 마커를 불러옴 (조금 움직여도 바로 보이도록)
+VIEWPORT_PADDING = 0.25
+
+# 묶음 표시 모드의 공용 마커 콜백: 이모지별 아이콘을 한 번만 만들어 모든 마커가 함께 사용
+MARKER_CALLBACK = """function (row) {
+    var icons = window.tripMarkerIcons = window.tripMarkerIcons || {};
+    var icon = icons[row[2]] = icons[row[2]] || L.divIcon({
+        html: '<div style="font-size: 16px; opacity: 0.8;">' + row[2] + '</div>',
+        className: 'custom-icon'
+    });
+    return L.marker(new L.LatLng(row[0], row[1]), {icon: icon}).bindTooltip(row[3]);
+}"""
+
+# 지도와 경로에 사용하는 방문 장소: 표시 이름('🏖️ 타무닝 해변'), 마커 아이콘, (위도, 경도)
+Stop = namedtuple("Stop", ["label", "icon", "coord"])
+
+
+def location_key(locations):
+    """itinerary.Location 목록을 캐시 키로 쓸 수 있는 Stop 튜플로 변환 (순서 유지, 아이콘은 일정 파일의 icon)"""
+    return tuple(
+        Stop(itinerary.location_label(location), location.icon,
+             (float(location.latitude), float(location.longitude)))
+        for location in locations
+    )
+
+
+def build_day_map(locations, extras=()):
+    """
+    location_key 형식의 장소 목록으로 마커와 이동 경로가 있는 folium 지도를 생성 (목록 순서가 방문 순서).
+    extras는 주변 장소 등 함께 표시할 ((이름, 이모지, (위도, 경도)), ...)이며 작은 마커로 표시합니다.
+    """
+    coords = [stop.coord for stop in locations]
+    min_lat, max_lat = min(c[0] for c in coords), max(c[0] for c in coords)
+    min_lon, max_lon = min(c[1] for c in coords), max(c[1] for c in coords)
+
+    m = folium.Map(location=[(min_lat + max_lat) / 2, (min_lon + max_lon) / 2], zoom_start=DEFAULT_ZOOM)
+    for number, stop in enumerate(locations, start=1):
+        folium.Marker(
+            location=stop.coord,
+            popup=f"{number}. {stop.label}" if len(locations) > 1 else stop.label,
+            icon=folium.DivIcon(
+                html=f"""
+                <div style="font-size: 24px;">{stop.icon}</div>""",
+                class_name="custom-icon"
+            )
+        ).add_to(m)
+
+    for name, emoji, coord in extras:
+        folium.Marker(
+            location=coord,
+            tooltip=name,
+            icon=folium.DivIcon(
+                html=f"""
+                <div style="font-size: 16px; opacity: 0.8;">{emoji}</div>""",
+                class_name="custom-icon"
+            )
+        ).add_to(m)
+
+    # 장소가 두 곳 이상이면 이동 경로를 그리고 모든 장소가 보이도록 범위를 맞춤
+    if len(coords) >= 2:
+        folium.PolyLine(locations=coords, color='blue', weight=5, opacity=0.7).add_to(m)
+        m.fit_bounds([[min_lat, min_lon], [max_lat, max_lon]])
+    return m
+
+
+class MapCache:
+    """(장소 목록, 추가 마커)를 키로 렌더링된 지도 HTML을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_MAPS, name="trip_map"):
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, locations, extras=()):
+        key = (locations, extras)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                instrumentation.increment("cache_hits_total", cache=self.name)
+                return html
+        instrumentation.increment("cache_misses_total", cache=self.name)
+        with instrumentation.span("trip.render.map_build"):
+            html = build_day_map(locations, extras).get_root().render()
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                instrumentation.increment("cache_evictions_total", cache=self.name)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 모든 세션이 함께 사용하는 지도 캐시
+map_cache = MapCache()
+
+
+def render_day_map(locations, extras=(), width=MAP_WIDTH, height=MAP_HEIGHT, cache=None):
+    """캐시된 지도 HTML을 화면에 표시 (장소 목록과 추가 마커가 같으면 지도를 다시 만들지 않음)"""
+    cache = cache if cache is not None else map_cache
+    html = cache.get_or_build(locations, extras)
+    with instrumentation.span("trip.render.map"):
+        st.iframe(html, width=width, height=height)
+
+
+def initial_bounds(locations, width=MAP_WIDTH, height=MAP_HEIGHT):
+    """
+    화면 범위를 받기 전의 기본 범위 ((남, 서), (북, 동)).
+    방문 장소를 모두 포함하고, 최소한 기본 확대 수준(DEFAULT_ZOOM)에서 지도 크기만큼 보이는 범위입니다.
+    """
+    coords = np.array([stop.coord for stop in locations], dtype=float)
+    south, west = coords.min(axis=0)
+    north, east = coords.max(axis=0)
+    degrees_per_pixel = 360 / (256 * 2 ** DEFAULT_ZOOM)  # 웹 메르카토르 타일 기준 (경도, 적도 부근 위도)
+    lat_pad = max(0.0, degrees_per_pixel * height - (north - south)) / 2
+    lon_pad = max(0.0, degrees_per_pixel * width - (east - west)) / 2
+    return (south - lat_pad, west - lon_pad), (north + lat_pad, east + lon_pad)
+
+
+def bounds_from_state(state):
+    """st_folium이 돌려준 값의 bounds를 ((남, 서), (북, 동))로 변환 (아직 없으면 None)"""
+    bounds = (state or {}).get("bounds") or {}
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    values = (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng"))
+    if any(value is None for value in values):
+        return None
+    return (values[0], values[1]), (values[2], values[3])
+
+
+def visible_markers(markers, bounds, padding=VIEWPORT_PADDING):
+    """extras 형식의 마커 중 화면 범위(양쪽으로 padding 비율만큼 넓힘) 안에 있는 마커"""
+    if not markers:
+        return ()
+    (south, west), (north, east) = bounds
+    lat_pad, lon_pad = (north - south) * padding, (east - west) * padding
+    coords = np.array([coord for _, _, coord in markers], dtype=float)
+    inside = (
+        (coords[:, 0] >= south - lat_pad) & (coords[:, 0] <= north + lat_pad)
+        & (coords[:, 1] >= west - lon_pad) & (coords[:, 1] <= east + lon_pad)
+    )
+    return tuple(marker for marker, keep in zip(markers, inside) if keep)
+
+
+def build_marker_layer(markers, name="주변 장소"):
+    """마커를 묶어서 표시하는 레이어 (마커별 HTML 없이 공용 콜백 사용)"""
+    layer = folium.FeatureGroup(name=name)
+    data = [[coord[0], coord[1], emoji, html.escape(label)] for label, emoji, coord in markers]
+    FastMarkerCluster(data, callback=MARKER_CALLBACK).add_to(layer)
+    return layer
+
+
+def render_clustered_map(locations, markers, key, width=MAP_WIDTH, height=MAP_HEIGHT):
+    """
+    방문 장소 지도에 markers를 묶어서 표시하되, 현재 화면 범위 안의 마커만 불러옴.
+    화면을 움직이면 st_folium이 새 범위를 st.session_state[key]에 저장하고 페이지가 다시 실행되어
+    그 범위의 마커로 바뀝니다. (불러온 마커 수, 전체 마커 수)를 반환합니다.
+    """
+    bounds = bounds_from_state(st.session_state.get(key)) or initial_bounds(locations, width, height)
+    visible = visible_markers(markers, bounds)
+    instrumentation.increment("trip_markers_loaded_total", len(visible))
+    with instrumentation.span("trip.render.clustered_map"):
+        # st_folium은 넘겨받은 지도 객체를 변경하므로 캐시하지 않고 매번 새로 만듦 (마커 레이어만 바뀌면 지도는 유지됨)
+        st_folium(
+            build_day_map(locations), key=key, width=width, height=height,
+            returned_objects=["bounds"], feature_group_to_add=build_marker_layer(visible),
+        )
+    return len(visible), len(markers)